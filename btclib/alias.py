@@ -96,3 +96,12 @@ JacPoint = Tuple[int, int, int]
 # of the INF Point
 # QJ = Q[0], Q[1], 1 if Q[1] else 0
 INFJ = 7, 0, 0
+
+# Elliptic curve point in homogeneous projective coordinates,
+# used by the complete addition formulas (see CurveGroup.add_proj).
+ProjPoint = Tuple[int, int, int]
+
+# Infinity point in projective coordinates is INF = (0, int, 0),
+# with a non-zero y coordinate.
+# It can be checked with 'INF[2] == 0'
+INFP = 0, 1, 0
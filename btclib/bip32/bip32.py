@@ -40,6 +40,7 @@ from typing import List, Optional, Tuple, Type, TypeVar, Union
 from btclib import base58
 from btclib.alias import INF, BinaryData, Octets, Point, String
 from btclib.bip32.der_path import BIP32DerPath, indexes_from_bip32_path
+from btclib.ecc import libsecp256k1
 from btclib.ecc.curve import mult, secp256k1
 from btclib.ecc.sec_point import bytes_from_point, point_from_octets
 from btclib.exceptions import BTClibValueError
@@ -357,7 +358,11 @@ def __ckd(xkey: _ExtendedBIP32KeyData, index: int) -> None:
         ).digest()
         xkey.chain_code = hmac_[32:]
         offset = int.from_bytes(hmac_[:32], byteorder="big", signed=False)
-        xkey.pub_key_point = ec.add(xkey.pub_key_point, mult(offset))
+        if libsecp256k1.is_enabled() and 0 < offset < ec.n:
+            Q = libsecp256k1.add_mult_generator(xkey.pub_key_point, offset)
+            xkey.pub_key_point = Q
+        else:
+            xkey.pub_key_point = ec.add(xkey.pub_key_point, mult(offset))
         xkey.key = bytes_from_point(xkey.pub_key_point)
         xkey.prv_key_int = 0
 
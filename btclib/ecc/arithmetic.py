@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Big-integer modular arithmetic backends.
+
+Two backends with the same interface are available:
+
+- Arithmetic: pure Python int
+- Gmpy2Arithmetic: GMP integers, through the optional gmpy2 package
+
+The default backend is gmpy2, if installed.
+The number_theory functions use the default backend,
+while CurveGroup selects the default backend at construction time:
+its field elements in Jacobian coordinates are backend integers,
+but affine points, scalars, and any other returned value
+are always Python int.
+"""
+
+from typing import Dict, Optional, Type
+
+from btclib.exceptions import BTClibValueError
+
+try:
+    import gmpy2  # type: ignore
+except ImportError:  # pragma: no cover
+    gmpy2 = None
+
+
+class Arithmetic:
+    "Pure Python modular arithmetic."
+
+    name = "python"
+
+    @staticmethod
+    def element(a: int) -> int:
+        "Return the integer in the backend representation."
+        return a
+
+    @staticmethod
+    def powmod(a: int, e: int, m: int) -> int:
+        return pow(a, e, m)
+
+    @staticmethod
+    def invert(a: int, m: int) -> int:
+        "Return the inverse of a (mod m), raise ZeroDivisionError if none."
+
+        # number_theory imports the arithmetic backends at module level
+        # pylint: disable=import-outside-toplevel
+        from btclib.ecc.number_theory import xgcd  # pylint: disable=cyclic-import
+
+        g, x, _ = xgcd(a % m, m)
+        if g != 1:
+            raise ZeroDivisionError("not invertible")
+        return x % m
+
+    @staticmethod
+    def legendre(a: int, p: int) -> int:
+        "Return the Legendre symbol a|p (p being a prime)."
+
+        ls = pow(a, p >> 1, p)
+        return -1 if ls == p - 1 else ls
+
+
+class Gmpy2Arithmetic(Arithmetic):
+    "GMP modular arithmetic through gmpy2."
+
+    name = "gmpy2"
+
+    @staticmethod
+    def element(a: int) -> int:
+        return gmpy2.mpz(a)
+
+    @staticmethod
+    def powmod(a: int, e: int, m: int) -> int:
+        return int(gmpy2.powmod(a, e, m))
+
+    @staticmethod
+    def invert(a: int, m: int) -> int:
+        return int(gmpy2.invert(a, m))
+
+    @staticmethod
+    def legendre(a: int, p: int) -> int:
+        ls = gmpy2.powmod(a, p >> 1, p)
+        return -1 if ls == p - 1 else int(ls)
+
+
+ARITHMETICS: Dict[str, Type[Arithmetic]] = {"python": Arithmetic}
+if gmpy2 is not None:
+    ARITHMETICS["gmpy2"] = Gmpy2Arithmetic
+
+_DEFAULT = "gmpy2" if "gmpy2" in ARITHMETICS else "python"
+
+
+def get_arithmetic(name: Optional[str] = None) -> Type[Arithmetic]:
+    "Return the named arithmetic backend (the default one if None)."
+
+    name = _DEFAULT if name is None else name
+    if name not in ARITHMETICS:
+        raise BTClibValueError(f"unknown arithmetic backend: {name}")
+    return ARITHMETICS[name]
+
+
+def set_default_arithmetic(name: str) -> None:
+    """Set the default arithmetic backend.
+
+    Already instantiated curves keep the backend
+    selected at their construction time.
+    """
+
+    get_arithmetic(name)
+    global _DEFAULT  # pylint: disable=global-statement
+    _DEFAULT = name
@@ -135,16 +135,17 @@ import base64
 import secrets
 from dataclasses import InitVar, dataclass
 from hashlib import sha256
-from typing import Optional, Tuple, Type, TypeVar, Union
+from typing import List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
-from btclib.alias import BinaryData, Octets, String
+from btclib.alias import BinaryData, Octets, Point, String
 from btclib.b32 import has_segwit_prefix, p2wpkh, witness_from_address
 from btclib.b58 import h160_from_address, p2pkh, p2wpkh_p2sh, wif_from_prv_key
-from btclib.ecc import dsa
+from btclib.ecc import dsa, libsecp256k1
 from btclib.ecc.curve import mult, secp256k1
+from btclib.ecc.dsa import _recovered_key_
 from btclib.ecc.sec_point import bytes_from_point
 from btclib.exceptions import BTClibValueError
-from btclib.hashes import magic_message
+from btclib.hashes import challenge_, magic_message, reduce_to_hlen
 from btclib.network import NETWORKS
 from btclib.to_prv_key import PrvKey, prv_keyinfo_from_prv_key
 from btclib.utils import bytesio_from_binarydata, hash160
@@ -313,7 +314,13 @@ def assert_as_valid(
     key_id = sig.rf - 27 & 0b11
     magic_msg = magic_message(msg)
     Q = dsa.recover_pub_key(key_id, magic_msg, sig.dsa_sig, lower_s, sha256)
-    compressed = sig.rf > 30
+    _assert_address(addr, sig.rf, Q)
+
+
+def _assert_address(addr: String, rf: int, Q: Point) -> None:
+    "Raise an error if the address does not match the recovered public key."
+
+    compressed = rf > 30
     # signature is valid only if the provided address is matched
     pub_key = bytes_from_point(Q, compressed=compressed)
 
@@ -321,8 +328,8 @@ def assert_as_valid(
         wit_ver, h160, _ = witness_from_address(addr)
         if wit_ver != 0 or len(h160) != 20:
             raise BTClibValueError(f"not a p2wpkh address: {addr!r}")
-        if not (30 < sig.rf < 35 or sig.rf > 38):
-            raise BTClibValueError(f"invalid p2wpkh address recovery flag: {sig.rf}")
+        if not (30 < rf < 35 or rf > 38):
+            raise BTClibValueError(f"invalid p2wpkh address recovery flag: {rf}")
         if hash160(pub_key) != h160:
             raise BTClibValueError(f"invalid p2wpkh address: {addr!r}")
         return
@@ -330,15 +337,15 @@ def assert_as_valid(
     script_type, h160, _ = h160_from_address(addr)
 
     if script_type == "p2pkh":
-        if sig.rf > 34:
-            raise BTClibValueError(f"invalid p2pkh address recovery flag: {sig.rf}")
+        if rf > 34:
+            raise BTClibValueError(f"invalid p2pkh address recovery flag: {rf}")
         if hash160(pub_key) != h160:
             raise BTClibValueError(f"invalid p2pkh address: {addr!r}")
         return
 
     # must be P2WPKH-P2SH
-    if not 30 < sig.rf < 39:
-        raise BTClibValueError(f"invalid p2wpkh-p2sh address recovery flag: {sig.rf}")
+    if not 30 < rf < 39:
+        raise BTClibValueError(f"invalid p2wpkh-p2sh address recovery flag: {rf}")
     script_pk = b"\x00\x14" + hash160(pub_key)
     if hash160(script_pk) != h160:
         raise BTClibValueError(f"invalid p2wpkh-p2sh address: {addr!r}")
@@ -357,3 +364,75 @@ def verify(
         return False
     else:
         return True
+
+
+def assert_batch_as_valid(
+    msgs: Sequence[Octets],
+    addrs: Sequence[String],
+    sigs: Sequence[Union[Sig, String]],
+    lower_s: bool = True,
+) -> None:
+    """Batch verification of address-based compact signatures.
+
+    Each public key is recovered from its signature
+    and checked against the address, without verifying the signature;
+    then all the signatures are verified at once
+    by dsa.assert_batch_as_valid_, the recovery flags being the key_id hints,
+    instead of a second double scalar multiplication for each signature.
+    With the libsecp256k1 backend enabled
+    the signatures are verified one at a time by libsecp256k1.
+    """
+
+    batch_size = len(addrs)
+    if len(msgs) != batch_size:
+        err_msg = f"mismatch between number of addresses ({batch_size}) "
+        err_msg += f"and number of messages ({len(msgs)})"
+        raise BTClibValueError(err_msg)
+    if len(sigs) != batch_size:
+        err_msg = f"mismatch between number of addresses ({batch_size}) "
+        err_msg += f"and number of signatures ({len(sigs)})"
+        raise BTClibValueError(err_msg)
+
+    if libsecp256k1.is_enabled():
+        for msg, addr, sig in zip(msgs, addrs, sigs):
+            assert_as_valid(msg, addr, sig, lower_s)
+        return
+
+    ec = secp256k1
+    m_hashes: List[bytes] = []
+    keys: List[Point] = []
+    dsa_sigs: List[dsa.Sig] = []
+    key_ids: List[int] = []
+    for msg, addr, sig in zip(msgs, addrs, sigs):
+        if isinstance(sig, Sig):
+            sig.assert_valid()
+        else:
+            sig = Sig.b64decode(sig)
+        key_id = sig.rf - 27 & 0b11
+        msg_hash = reduce_to_hlen(magic_message(msg), sha256)
+        c = challenge_(msg_hash, ec, sha256)
+        QJ = _recovered_key_(key_id, c, sig.dsa_sig.r, sig.dsa_sig.s, ec)
+        Q = ec.aff_from_jac(QJ)
+        _assert_address(addr, sig.rf, Q)
+        m_hashes.append(msg_hash)
+        keys.append(Q)
+        dsa_sigs.append(sig.dsa_sig)
+        key_ids.append(key_id)
+    dsa.assert_batch_as_valid_(m_hashes, keys, dsa_sigs, key_ids, lower_s, sha256)
+
+
+def batch_verify(
+    msgs: Sequence[Octets],
+    addrs: Sequence[String],
+    sigs: Sequence[Union[Sig, String]],
+    lower_s: bool = True,
+) -> bool:
+    "Batch verification of address-based compact signatures."
+
+    # all kind of Exceptions are catched because
+    # verify must always return a bool
+    try:
+        assert_batch_as_valid(msgs, addrs, sigs, lower_s)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
@@ -10,20 +10,40 @@
 
 """Elliptic curve classes and functions."""
 
+import functools
 import json
+import threading
+from collections.abc import Mapping
 from math import sqrt
 from os import path
-from typing import Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from btclib.alias import Integer, JacPoint, Point
+from btclib.alias import INF, INFJ, INFP, Integer, JacPoint, Point
+from btclib.ecc import libsecp256k1, numpy_batch
 from btclib.ecc.curve_group import (
     HEX_THRESHOLD,
     CurveGroup,
     _double_mult,
     _mult,
     _multi_mult,
+    cached_multiples_fixwind,
+    convert_number_to_base,
     jac_from_aff,
+    mult_base_3,
+    mult_fixed_window,
+    mult_fixed_window_cached,
+    mult_jac,
+    mult_mont_ladder,
 )
+from btclib.ecc.curve_group_2 import (
+    Endomorphism,
+    _multi_mult_pippenger,
+    _multi_mult_w_NAF,
+    mult_endomorphism_fixed_window,
+    w_NAF_multiples,
+)
+from btclib.ecc.table_cache import table_cache
+from btclib.ecc.tuning import Choice, get_profile
 from btclib.exceptions import BTClibValueError
 from btclib.utils import hex_string, int_from_integer
 
@@ -77,7 +97,16 @@ class Curve(CurveSubGroup):
         cofactor: int,
         weakness_check: bool = True,
         name: Optional[str] = None,
+        endomorphism: Optional[Tuple[Integer, Integer]] = None,
+        trusted: bool = False,
     ) -> None:
+        """Elliptic curve with a prime order subgroup generated by G.
+
+        Curve parameters are validated according to SEC 1 v.2 3.1.1.2.1;
+        trusted=True skips the expensive group order,
+        weakness, and endomorphism checks,
+        and it is meant for well-known (i.e. standard) parameters only.
+        """
 
         super().__init__(p, a, b, G)
         n = int_from_integer(n)
@@ -93,6 +122,26 @@ class Curve(CurveSubGroup):
         self.nlen = n.bit_length()
         self.n_size = (self.nlen + 7) // 8
 
+        self.cofactor = cofactor
+        self.name = name
+        if not trusted:
+            self._validate(weakness_check)
+
+        # optional efficiently computable endomorphism (lambda, beta):
+        # lambda*(x, y) = (beta*x, y)
+        self.endomorphism: Optional[Endomorphism] = None
+        if endomorphism is not None:
+            lam = int_from_integer(endomorphism[0]) % n
+            beta = int_from_integer(endomorphism[1]) % self.p
+            if not trusted:
+                self._validate_endomorphism(lam, beta)
+            self.endomorphism = Endomorphism(lam, beta, n)
+
+    def _validate(self, weakness_check: bool) -> None:
+        # Steps numbering follows SEC 1 v.2 3.1.1.2.1
+        n = self.n
+        cofactor = self.cofactor
+
         # 5. Check that n is prime.
         if n < 2 or n % 2 == 0 or pow(2, n - 1, n) != 1:
             err_msg = "n is not prime: "
@@ -120,10 +169,9 @@ class Curve(CurveSubGroup):
         if cofactor != exp_cofactor:
             err_msg = f"invalid cofactor: {cofactor}, expected {exp_cofactor}"
             raise BTClibValueError(err_msg)
-        self.cofactor = cofactor
 
         # 8. Check that n ≠ p
-        if n == p:
+        if n == self.p:
             raise BTClibValueError(
                 f"n=p weak curve: {hex_string(n)}"
             )  # pragma: no cover
@@ -134,7 +182,22 @@ class Curve(CurveSubGroup):
                 if pow(self.p, i, n) == 1:
                     raise UserWarning("weak curve")
 
-        self.name = name
+    def _validate_endomorphism(self, lam: int, beta: int) -> None:
+        if lam == 1 or pow(lam, 3, self.n) != 1:
+            raise BTClibValueError("lambda is not a cube root of unity mod n")
+        if beta == 1 or pow(beta, 3, self.p) != 1:
+            raise BTClibValueError("beta is not a cube root of unity mod p")
+        phi_GJ = beta * self.G[0] % self.p, self.G[1], 1
+        if not self.jac_equality(_mult(lam, self.GJ, self), phi_GJ):
+            raise BTClibValueError("lambda*G is not (beta*x_G, y_G)")
+
+    def __reduce_ex__(self, protocol: Any) -> Any:
+        # registered curves are pickled by name, so that unpickling
+        # (e.g. in multiprocessing workers) returns the registered instance,
+        # with its cached tables and libsecp256k1 support
+        if self.name is not None and _BUILT_CURVES.get(self.name) is self:
+            return _registered_curve, (self.name,)
+        return super().__reduce_ex__(protocol)
 
     def __str__(self) -> str:
         result = super().__str__()
@@ -158,73 +221,586 @@ class Curve(CurveSubGroup):
 
 datadir = path.join(path.dirname(__file__), "_data")
 
+# (lambda, beta) efficiently computable endomorphisms of Koblitz curves,
+# see D. Hankerson, 'Guide to Elliptic Curve Cryptography' chapter 3.5
+# and https://bitcointalk.org/index.php?topic=3238.msg45565#msg45565
+ENDOMORPHISMS = {
+    "secp160k1": (
+        "f3c6393c4c5c9288fe47f1dff787a6ec6d16b2be",
+        "645b7345a143464942cc46d7cf4d5d1e1e6cbb68",
+    ),
+    "secp192k1": (
+        "3d84f26c12238d7b4f3d516613c1759033b1a5800175d0b1",
+        "bb85691939b869c1d087f601554b96b80cb4f55b35f433c2",
+    ),
+    "secp224k1": (
+        "60dcd2104c4cbc0be6eeefc2bdd610739ec34e317f9b33046c9e4788",
+        "fe0e87005b4e83761908c5131d552a850b3f58b749c37cf5b84d6768",
+    ),
+    "secp256k1": (
+        "5363ad4cc05c30e0a5261c028812645a122e22ea20816678df02967c1b23bd72",
+        "7ae96a2b657c07106e64479eac3434e99cf0497512f58995c1396c28719501ee",
+    ),
+}
+
+
+@functools.lru_cache()
+def _curve_params(filename: str) -> Dict[str, list]:
+    with open(path.join(datadir, filename), "r") as file_:
+        return json.load(file_)
+
+
+# curves are shared among registries, i.e. the same Curve instance
+# is returned by CURVES, SEC2v1, and SEC2v2 for a given curve name
+_BUILT_CURVES: Dict[str, Curve] = {}
+_BUILT_CURVES_LOCK = threading.Lock()
+
+
+def _registered_curve(ec_name: str) -> Curve:
+    return CURVES[ec_name]
+
+
+class CurveRegistry(Mapping):
+    """Read-only mapping from curve names to Curve instances.
+
+    Curve parameters are loaded from the JSON data files only when needed,
+    while each Curve is built (and validated) on first access only:
+    this keeps btclib import time low.
+    """
+
+    def __init__(self, *filenames: str) -> None:
+        self._filenames = filenames
+        self._params_: Optional[Dict[str, list]] = None
+
+    def _params(self) -> Dict[str, list]:
+        if self._params_ is None:
+            params: Dict[str, list] = {}
+            for filename in self._filenames:
+                params.update(_curve_params(filename))
+            self._params_ = params
+        return self._params_
+
+    def __getitem__(self, ec_name: str) -> Curve:
+        params = self._params()[ec_name]
+        if ec_name in _BUILT_CURVES:
+            return _BUILT_CURVES[ec_name]
+        with _BUILT_CURVES_LOCK:
+            if ec_name not in _BUILT_CURVES:
+                endomorphism = ENDOMORPHISMS.get(ec_name)
+                ec = Curve(*params + [True, ec_name, endomorphism])
+                _BUILT_CURVES[ec_name] = ec
+        return _BUILT_CURVES[ec_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._params())
+
+    def __len__(self) -> int:
+        return len(self._params())
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)})"
+
+
 # Elliptic Curve Cryptography (ECC)
 # Brainpool Standard Curves and Curve Generation
 # https://tools.ietf.org/html/rfc5639
-filename = path.join(datadir, "ec_Brainpool.json")
-with open(filename, "r") as file_:
-    Brainpool_params2 = json.load(file_)
-Brainpool: Dict[str, Curve] = {}
-for ec_name in Brainpool_params2:
-    Brainpool[ec_name] = Curve(*Brainpool_params2[ec_name] + [True, ec_name])
-
+Brainpool = CurveRegistry("ec_Brainpool.json")
 
 # FIPS PUB 186-4
 # FEDERAL INFORMATION PROCESSING STANDARDS PUBLICATION
 # Digital Signature Standard (DSS)
 # https://oag.ca.gov/sites/all/files/agweb/pdfs/erds1/fips_pub_07_2013.pdf
-filename = path.join(datadir, "ec_NIST.json")
-with open(filename, "r") as file_:
-    NIST_params2 = json.load(file_)
-NIST: Dict[str, Curve] = {}
-for ec_name in NIST_params2:
-    NIST[ec_name] = Curve(*NIST_params2[ec_name] + [True, ec_name])
+NIST = CurveRegistry("ec_NIST.json")
 
+# curves included in both SEC 2 v.1 and SEC 2 v.2
+# http://www.secg.org/sec2-v2.pdf
+SEC2v2 = CurveRegistry("ec_SEC2v2.json")
 
-# SEC 2 v.1 curves, removed from SEC 2 v.2 as insecure ones
+# SEC 2 v.1 curves, including those removed from SEC 2 v.2 as insecure ones
 # http://www.secg.org/SEC2-Ver-1.0.pdf
-filename = path.join(datadir, "ec_SEC2v1_insecure.json")
-with open(filename, "r") as file_:
-    SEC2v1_params2 = json.load(file_)
-SEC2v1: Dict[str, Curve] = {}
-for ec_name in SEC2v1_params2:
-    SEC2v1[ec_name] = Curve(*SEC2v1_params2[ec_name] + [True, ec_name])
+SEC2v1 = CurveRegistry("ec_SEC2v1_insecure.json", "ec_SEC2v2.json")
 
+CURVES = CurveRegistry(
+    "ec_SEC2v1_insecure.json", "ec_SEC2v2.json", "ec_NIST.json", "ec_Brainpool.json"
+)
+
+# secp256k1 is always needed (e.g. as default argument):
+# it is built from its well-known, pre-validated, standard parameters
+secp256k1 = Curve(
+    0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEFFFFFC2F,
+    0,
+    7,
+    (
+        0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+        0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8,
+    ),
+    0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141,
+    1,
+    name="secp256k1",
+    endomorphism=ENDOMORPHISMS["secp256k1"],
+    trusted=True,
+)
+_BUILT_CURVES["secp256k1"] = secp256k1
+
+# window size of the fixed-window tables of registered public keys,
+# and of the generator table (unless otherwise tuned, see tuning.tune)
+FIXED_BASE_W = 5
+
+# fixed-base multiplication candidates (constant time ones only):
+# projective complete additions or Jacobian add_jac, table window widths
+FIXED_BASE_CANDIDATES = tuple(
+    Choice(algorithm, w)
+    for algorithm in ("fixed_window", "fixed_window_cached")
+    for w in range(3, 9)
+)
+
+
+def _mult_fixed_base(m: int, ec: CurveSubGroup, choice: Choice) -> JacPoint:
+    """Scalar multiplication of the curve generator G.
+
+    The multiples of G are precomputed once per curve and window width
+    (see cached_multiples_fixwind),
+    so that the fixed-base multiplication just needs additions.
+
+    Being used for signing, it is constant time: the 'fixed_window'
+    additions use the complete projective formulas (see add_proj),
+    without INF or doubling special cases.
+
+    The m coefficient is assumed to have been reduced mod n.
+    """
+    w = choice.w
+    if choice.algorithm == "fixed_window_cached":
+        return mult_fixed_window_cached(m, ec.GJ, ec, w)
+
+    T = cached_multiples_fixwind(ec.GJ, ec, w)
+    digits = convert_number_to_base(m, 2 ** w)
+    k = len(digits)
+    # the backend element of p (e.g. gmpy2 mpz) speeds up the reductions
+    p = ec._p  # pylint: disable=protected-access
+    R = INFP
+    for digit in digits:
+        k -= 1
+        # table points are normalized, i.e. Z is 1 (or 0 for INF):
+        # (X, Y, 1) is also projective, while (X, Y, 0) becomes INFP
+        X, Y, Z = T[k][digit]
+        R = ec.add_proj(R, (X * Z % p, (Y * Z + 1 - Z) % p, Z))
+    return ec.jac_from_proj(R)
+
+
+def _mult_generator(m: int, ec: CurveSubGroup) -> JacPoint:
+    """Scalar multiplication of the curve generator G.
+
+    The algorithm and window width are the tuned ones, if any
+    (see tuning.tune): the G table is pinned in its cache,
+    i.e. it is never evicted.
+
+    The m coefficient is assumed to have been reduced mod n.
+    """
+    choice = get_profile().choice(getattr(ec, "name", None), "fixed-base")
+    choice = choice or Choice("fixed_window", FIXED_BASE_W)
+    if not cached_multiples_fixwind.is_cached(ec.GJ, ec, choice.w):
+        cached_multiples_fixwind.pin(ec.GJ, ec, choice.w)
+    return _mult_fixed_base(m, ec, choice)
+
+
+def _mult_glv(m: int, QJ: JacPoint, ec: Curve, w: int = 4) -> JacPoint:
+    "Constant time GLV fixed window, if the curve has an endomorphism."
+
+    if ec.endomorphism is None:
+        return mult_fixed_window(m, QJ, ec, w)
+    return mult_endomorphism_fixed_window(m, QJ, ec, ec.endomorphism, w)
 
-# curves included in both SEC 2 v.1 and SEC 2 v.2
-# http://www.secg.org/sec2-v2.pdf
-filename = path.join(datadir, "ec_SEC2v2.json")
-with open(filename, "r") as file_:
-    SEC2v2_params2 = json.load(file_)
-SEC2v2: Dict[str, Curve] = {}
-for ec_name in SEC2v2_params2:
-    SEC2v2[ec_name] = Curve(*SEC2v2_params2[ec_name] + [True, ec_name])
-    SEC2v1[ec_name] = Curve(*SEC2v2_params2[ec_name] + [True, ec_name])
 
-CURVES = SEC2v1
-CURVES.update(NIST)
-CURVES.update(Brainpool)
+# variable-base multiplication algorithms, as (m, QJ, ec, w) functions:
+# being used with secret scalars (e.g. ECDH), constant time ones only,
+# i.e. no wNAF, sliding window, or variable time GLV
+# (see double_mult and multi_mult)
+VARIABLE_BASE_ALGORITHMS: Dict[str, Callable[[int, JacPoint, Curve, int], JacPoint]] = {
+    "jac": lambda m, QJ, ec, _: mult_jac(m, QJ, ec),
+    "mont_ladder": lambda m, QJ, ec, _: mult_mont_ladder(m, QJ, ec),
+    "base_3": lambda m, QJ, ec, _: mult_base_3(m, QJ, ec),
+    "fixed_window": mult_fixed_window,
+    "glv_fixed_window": _mult_glv,
+}
 
-secp256k1 = CURVES["secp256k1"]
+
+def variable_base_candidates(ec: Curve) -> List[Choice]:
+    "Return the variable-base multiplication candidates for the curve."
+
+    candidates = [Choice(a) for a in ("jac", "mont_ladder", "base_3")]
+    candidates += [Choice("fixed_window", w) for w in range(2, 7)]
+    if ec.endomorphism is not None:
+        candidates += [Choice("glv_fixed_window", w) for w in range(2, 7)]
+    return candidates
+
+
+def _mult_variable_base(
+    m: int, QJ: JacPoint, ec: Curve, choice: Optional[Choice] = None
+) -> JacPoint:
+    """Scalar multiplication of any point.
+
+    If no choice is provided, the tuned one is used (see tuning.tune),
+    else the fixed window algorithm, using the GLV method
+    if the curve has an efficiently computable endomorphism:
+    all the candidates are constant time, as m can be secret.
+
+    The input point is assumed to be on curve,
+    the m coefficient is assumed to have been reduced mod n.
+    """
+    if choice is None:
+        choice = get_profile().choice(ec.name, "variable-base")
+    # a profile could have been tuned with other candidates
+    if choice is None or choice.algorithm not in VARIABLE_BASE_ALGORITHMS:
+        return _mult_glv(m, QJ, ec)
+    return VARIABLE_BASE_ALGORITHMS[choice.algorithm](m, QJ, ec, choice.w)
 
 
 def mult(m: Integer, Q: Optional[Point] = None, ec: Curve = secp256k1) -> Point:
-    "Elliptic curve scalar multiplication."
-    if Q is None:
-        QJ = ec.GJ
+    """Elliptic curve scalar multiplication.
+
+    If Q is None (or it is the curve generator G) the
+    precomputed fixed-base multiplication is used;
+    otherwise, the tuned variable-base algorithm (see tuning.tune)
+    or, by default, the fixed window one
+    (with the GLV method, if the curve has an endomorphism).
+    Both are constant time, as m can be secret.
+    For secp256k1 the libsecp256k1 backend is used, if enabled.
+    """
+    m = int_from_integer(m) % ec.n
+    if ec == secp256k1 and libsecp256k1.is_enabled():
+        if Q is None or Q == ec.G:
+            return libsecp256k1.mult(m) if m else INF
+        ec.require_on_curve(Q)
+        return libsecp256k1.mult(m, Q) if m and Q[1] else INF
+    if Q is None or Q == ec.G:
+        R = _mult_generator(m, ec)
+    else:
+        ec.require_on_curve(Q)
+        R = _mult_variable_base(m, jac_from_aff(Q), ec)
+    return ec.aff_from_jac(R)
+
+
+def _use_numpy_batch(size: int, ec: CurveGroup) -> bool:
+    "Return True if the batch is dispatched to the numpy batch engine."
+
+    return (
+        size >= numpy_batch.NUMPY_MIN_SIZE
+        and numpy_batch.is_enabled()
+        and numpy_batch.supports(ec)
+    )
+
+
+def mult_batch(
+    scalars: Sequence[Integer], Q: Optional[Point] = None, ec: Curve = secp256k1
+) -> List[Point]:
+    """Return the scalar multiplications m*Q for all the m in scalars.
+
+    It is equivalent to [mult(m, Q, ec) for m in scalars],
+    but the conversions to affine coordinates
+    share a single modular inversion.
+    If Q is None the curve generator G is used.
+
+    The scalars are usually secret (e.g. mass key derivation):
+    batches are never dispatched to the numpy batch engine,
+    which is not constant time.
+    """
+
+    ms = [int_from_integer(m) % ec.n for m in scalars]
+    if Q is None or Q == ec.G:
+        RJs = [_mult_generator(m, ec) for m in ms]
     else:
         ec.require_on_curve(Q)
         QJ = jac_from_aff(Q)
+        RJs = [_mult_variable_base(m, QJ, ec) for m in ms]
+    return ec.aff_from_jac_batch(RJs)
+
+
+def register_pub_key(Q: Point, ec: Curve = secp256k1) -> None:
+    """Precompute and keep the fixed-window table of a public key.
+
+    Verifications involving a registered public key
+    (e.g. dsa.verify and ssa.verify) then use
+    the precomputed tables of the key and of G, i.e. just additions.
+    The table is pinned in the cached_multiples_fixwind cache
+    (about 650KB for a 256-bit curve point, see table_cache.nbytes).
+
+    For BIP340 x-only keys,
+    register the point returned by ssa.point_from_bip340pub_key.
+    """
+
+    ec.require_on_curve(Q)
+    if Q[1] == 0:
+        raise BTClibValueError("INF point cannot be registered")
+    cached_multiples_fixwind.pin(jac_from_aff(Q), ec, FIXED_BASE_W)
 
-    m = int_from_integer(m) % ec.n
-    R = _mult(m, QJ, ec)
-    return ec.aff_from_jac(R)
+
+def unregister_pub_key(Q: Point, ec: Curve = secp256k1) -> None:
+    "Unpin the public key table, making it evictable from its cache."
+
+    cached_multiples_fixwind.unpin(jac_from_aff(Q), ec, FIXED_BASE_W)
+
+
+def _has_fixed_window_table(PJ: JacPoint, ec: Curve) -> bool:
+    "Return True if PJ is G or its fixed-window table is cached."
+    return PJ == ec.GJ or cached_multiples_fixwind.is_cached(PJ, ec, FIXED_BASE_W)
+
+
+def _double_mult_fixed_base_vartime(
+    u: int, HJ: JacPoint, v: int, QJ: JacPoint, ec: Curve
+) -> JacPoint:
+    """Return u*H + v*Q using the fixed-window tables of H and Q.
+
+    Zero digits are skipped: it is not constant time.
+    """
+
+    key = ec.GJ, ec, FIXED_BASE_W
+    if not cached_multiples_fixwind.is_cached(*key):
+        cached_multiples_fixwind.pin(*key)
+
+    R = INFJ
+    for m, PJ in ((u, HJ), (v, QJ)):
+        T = cached_multiples_fixwind(PJ, ec, FIXED_BASE_W)
+        digits = convert_number_to_base(m, 2 ** FIXED_BASE_W)
+        for k, d in enumerate(reversed(digits)):
+            if d:
+                R = ec.add_jac_vartime(R, T[k][d])
+    return R
+
+
+# window size of the wNAF precomputed table of G used by _double_mult_vartime
+GENERATOR_W_NAF = 8
+# window size of the wNAF table computed on the fly for any other point
+POINT_W_NAF = 5
+
+
+@table_cache(max_entries=16)
+def _generator_w_NAF_tables(ec: Curve) -> Tuple[List[JacPoint], List[JacPoint]]:
+    """Return the wNAF tables of G and of phi(G).
+
+    The tables are precomputed once per curve
+    (phi(G) only if the curve has an efficiently computable endomorphism)
+    and pinned in their cache.
+    """
+    T = w_NAF_multiples(ec.GJ, GENERATOR_W_NAF, ec)
+    if ec.endomorphism is None:
+        return T, []
+    return T, [ec.endomorphism.map_jac(P, ec) for P in T]
+
+
+def _double_mult_vartime(
+    u: int, HJ: JacPoint, v: int, QJ: JacPoint, ec: Curve
+) -> JacPoint:
+    """Double scalar multiplication (u*H + v*Q).
+
+    This implementation uses the Strauss algorithm
+    with interleaved wNAF representations of the u and v coefficients,
+    Jacobian coordinates.
+    If one of the points is the curve generator G,
+    its wide-window table is precomputed and reused across calls.
+    If both points have a cached fixed-window table
+    (e.g. G and a registered public key, see register_pub_key),
+    the fixed-window tables are used, i.e. just additions.
+    If the curve has an efficiently computable endomorphism,
+    both coefficients are split in two halves (GLV method),
+    halving the number of doublings.
+
+    It is not constant time: it is meant for verification,
+    where all the inputs are public.
+
+    The input points are assumed to be on curve,
+    the u and v coefficients are assumed to have been reduced mod n.
+    """
+
+    if u < 0:
+        raise BTClibValueError(f"negative first coefficient: {hex(u)}")
+    if v < 0:
+        raise BTClibValueError(f"negative second coefficient: {hex(v)}")
+
+    if _has_fixed_window_table(HJ, ec) and _has_fixed_window_table(QJ, ec):
+        return _double_mult_fixed_base_vartime(u, HJ, v, QJ, ec)
+
+    choice = get_profile().choice(ec.name, "double")
+    return _double_mult_choice(
+        u, HJ, v, QJ, ec, choice or Choice("strauss", POINT_W_NAF)
+    )
+
+
+# double scalar multiplication candidates
+DOUBLE_CANDIDATES = (Choice("shamir"),) + tuple(
+    Choice("strauss", w) for w in range(3, 8)
+)
+
+
+def _double_mult_choice(
+    u: int, HJ: JacPoint, v: int, QJ: JacPoint, ec: Curve, choice: Choice
+) -> JacPoint:
+    "Return u*H + v*Q using the chosen algorithm (Strauss or Shamir)."
+
+    if choice.algorithm == "shamir":
+        return _double_mult(u, HJ, v, QJ, ec)
+    return _multi_mult_strauss((u, v), (HJ, QJ), ec, choice.w)
+
+
+def _multi_mult_strauss(
+    scalars: Sequence[int],
+    jac_points: Sequence[JacPoint],
+    ec: Curve,
+    w: int = POINT_W_NAF,
+) -> JacPoint:
+    """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
+
+    Use Strauss' algorithm with interleaved wNAF representations
+    (w being the window width of the tables computed on the fly),
+    the curve generator G precomputed table,
+    and the GLV split of the scalars if the curve has
+    an efficiently computable endomorphism.
+
+    It is not constant time.
+    """
+
+    ints: List[int] = []
+    tables: List[List[JacPoint]] = []
+    for m, PJ in zip(scalars, jac_points):
+        if PJ == ec.GJ:
+            if not _generator_w_NAF_tables.is_cached(ec):
+                _generator_w_NAF_tables.pin(ec)
+            T, T_phi = _generator_w_NAF_tables(ec)
+        else:
+            T = w_NAF_multiples(PJ, w, ec)
+            T_phi = []
+            if ec.endomorphism is not None:
+                T_phi = [ec.endomorphism.map_jac(P, ec) for P in T]
+        if ec.endomorphism is None:
+            ints.append(m)
+            tables.append(T)
+        else:
+            ints.extend(ec.endomorphism.decompose(m))
+            tables.extend((T, T_phi))
+    return _multi_mult_w_NAF(ints, tables, ec)
+
+
+# default multi scalar multiplication thresholds on the number of points:
+# Strauss up to STRAUSS_MAX_SIZE points, Pippenger from PIPPENGER_MIN_SIZE,
+# Bos-Coster in between
+STRAUSS_MAX_SIZE = 32
+PIPPENGER_MIN_SIZE = 1024
+
+# multi scalar multiplication candidates
+# (Pippenger window width 0 means it depends on the number of points)
+MULTI_CANDIDATES = (
+    tuple(Choice("strauss", w) for w in range(3, 7))
+    + (Choice("bos_coster"),)
+    + tuple(Choice("pippenger", c) for c in (0,) + tuple(range(3, 9)))
+)
+
+
+def _multi_mult_choice(
+    scalars: Sequence[int], jac_points: Sequence[JacPoint], ec: Curve, choice: Choice
+) -> JacPoint:
+    "Return u1*Q1 + ... + un*Qn using the chosen algorithm."
+
+    if choice.algorithm == "strauss":
+        return _multi_mult_strauss(scalars, jac_points, ec, choice.w)
+    if choice.algorithm == "bos_coster":
+        return _multi_mult(scalars, jac_points, ec)
+    return _multi_mult_pippenger(scalars, jac_points, ec, choice.w)
+
+
+def tuning_candidates(kind: str, ec: Curve) -> Sequence[Choice]:
+    "Return the candidate algorithms of the operation kind for the curve."
+
+    if kind == "fixed-base":
+        return FIXED_BASE_CANDIDATES
+    if kind == "variable-base":
+        return variable_base_candidates(ec)
+    if kind == "double":
+        return DOUBLE_CANDIDATES
+    if kind == "multi":
+        return MULTI_CANDIDATES
+    raise BTClibValueError(f"unknown operation kind: {kind}")
+
+
+def run_candidate(
+    kind: str,
+    choice: Choice,
+    scalars: Sequence[int],
+    jac_points: Sequence[JacPoint],
+    ec: Curve,
+) -> JacPoint:
+    """Return the operation result using the chosen algorithm.
+
+    The operation kinds (see tuning.tune) are:
+
+    - fixed-base: u1*G
+    - variable-base: u1*Q1
+    - double: u1*G + u2*Q1
+    - multi: u1*Q1 + ... + un*Qn
+
+    The input points are assumed to be on curve,
+    the scalar coefficients are assumed to have been reduced mod n.
+    """
+
+    if kind == "fixed-base":
+        return _mult_fixed_base(scalars[0], ec, choice)
+    if kind == "variable-base":
+        return _mult_variable_base(scalars[0], jac_points[0], ec, choice)
+    if kind == "double":
+        u, v = scalars[:2]
+        return _double_mult_choice(u, ec.GJ, v, jac_points[0], ec, choice)
+    if kind == "multi":
+        return _multi_mult_choice(scalars, jac_points, ec, choice)
+    raise BTClibValueError(f"unknown operation kind: {kind}")
+
+
+def _multi_mult_vartime(
+    scalars: Sequence[int], jac_points: Sequence[JacPoint], ec: Curve
+) -> JacPoint:
+    """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
+
+    The algorithm is the tuned one for the number of points
+    (see tuning.tune); by default:
+    Strauss' interleaved wNAF for few points,
+    Bos-Coster for a medium number of points,
+    and Pippenger's bucket method for large batches
+    (vectorized by the numpy batch engine, if enabled).
+
+    It is not constant time.
+
+    The input points are assumed to be on curve,
+    the scalar coefficients are assumed to have been reduced mod n.
+    """
+
+    if len(scalars) != len(jac_points):
+        err_msg = "mismatch between number of scalars and points: "
+        err_msg += f"{len(scalars)} vs {len(jac_points)}"
+        raise BTClibValueError(err_msg)
+
+    for m in scalars:
+        if m < 0:
+            raise BTClibValueError(f"negative coefficient: {hex(m)}")
+
+    size = len(scalars)
+    if _use_numpy_batch(size, ec):
+        return numpy_batch.multi_mult(scalars, jac_points, ec)
+    choice = get_profile().choice(ec.name, "multi", size)
+    if choice is None:
+        if size <= STRAUSS_MAX_SIZE:
+            choice = Choice("strauss", POINT_W_NAF)
+        elif size < PIPPENGER_MIN_SIZE:
+            choice = Choice("bos_coster")
+        else:
+            choice = Choice("pippenger")
+    return _multi_mult_choice(scalars, jac_points, ec, choice)
 
 
 def double_mult(
     u: Integer, H: Point, v: Integer, Q: Point, ec: Curve = secp256k1
 ) -> Point:
-    "Double scalar multiplication (u*H + v*Q)."
+    """Double scalar multiplication (u*H + v*Q).
+
+    It is not constant time (see _double_mult_vartime);
+    the algorithm is the tuned one, if any (see tuning.tune).
+    """
 
     ec.require_on_curve(H)
     HJ = jac_from_aff(H)
@@ -234,7 +810,7 @@ def double_mult(
 
     u = int_from_integer(u) % ec.n
     v = int_from_integer(v) % ec.n
-    R = _double_mult(u, HJ, v, QJ, ec)
+    R = _double_mult_vartime(u, HJ, v, QJ, ec)
     return ec.aff_from_jac(R)
 
 
@@ -243,7 +819,9 @@ def multi_mult(
 ) -> Point:
     """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
 
-    Use Bos-Coster's algorithm for efficient computation.
+    The algorithm (Strauss, Bos-Coster, or Pippenger)
+    is selected according to the number of points
+    (see tuning.tune).
     """
 
     if len(scalars) != len(points):
@@ -261,5 +839,5 @@ def multi_mult(
         ec.require_on_curve(Q)
         jac_points.append(jac_from_aff(Q))
 
-    R = _multi_mult(ints, jac_points, ec)
+    R = _multi_mult_vartime(ints, jac_points, ec)
     return ec.aff_from_jac(R)
@@ -16,13 +16,15 @@ the cyclic subgroup class of prime order Curve,
 see the btclib.curve module.
 """
 
-import functools
 import heapq
 from math import ceil
 from typing import List, Sequence, Tuple
 
-from btclib.alias import INF, INFJ, Integer, JacPoint, Point
-from btclib.ecc.number_theory import legendre_symbol, mod_inv, mod_sqrt
+from btclib.alias import INF, INFJ, INFP, Integer, JacPoint, Point
+from btclib.ecc.arithmetic import get_arithmetic
+from btclib.ecc.curve_group_proj import ProjectiveMixin
+from btclib.ecc.number_theory import batch_mod_inv, legendre_symbol, mod_inv, mod_sqrt
+from btclib.ecc.table_cache import table_cache
 from btclib.exceptions import BTClibTypeError, BTClibValueError
 from btclib.utils import hex_string, int_from_integer
 
@@ -37,7 +39,7 @@ def jac_from_aff(Q: Point) -> JacPoint:
     return Q[0], Q[1], 1 if Q[1] else 0
 
 
-class CurveGroup:
+class CurveGroup(ProjectiveMixin):
     """Finite group of the points of an elliptic curve over Fp.
 
     The elliptic curve is the set of points (x, y)
@@ -70,6 +72,10 @@ class CurveGroup:
         # must be true to break simmetry using quadratic residue
         self.p_is_3_mod_4 = p % 4 == 3
         self.p = p
+        # the arithmetic backend is selected at construction time:
+        # Jacobian coordinates are integers of that backend
+        self._arithmetic = get_arithmetic()
+        self._p = self._arithmetic.element(p)
 
         # 2. check that a and b are integers in the interval [0, p−1]
         if a < 0:
@@ -95,8 +101,15 @@ class CurveGroup:
         d = 4 * a * a * a + 27 * b * b
         if d % p == 0:
             raise BTClibValueError("zero discriminant")
+        self.a = a
+        self.b = b
         self._a = a
         self._b = b
+        # select the specialised doubling formulas, if possible
+        self._a_is_zero = a == 0
+        self._a_is_minus_3 = a == p - 3
+        # 3*b, used by the complete projective formulas
+        self._b3 = self._arithmetic.element(3 * b % p)
 
     def __str__(self) -> str:
         result = "Curve"
@@ -143,10 +156,10 @@ class CurveGroup:
 
         The input point is not checked to be on the curve.
         """
-        # % self.p is required to account for INF (i.e. Q[1]==0)
+        # % self._p is required to account for INF (i.e. Q[1]==0)
         # so that negate(INF) = INF
         if len(Q) == 3:
-            return Q[0], (self.p - Q[1]) % self.p, Q[2]
+            return Q[0], (self._p - Q[1]) % self._p, Q[2]
         raise BTClibTypeError("not a Jacobian point")
 
     def aff_from_jac(self, Q: JacPoint) -> Point:
@@ -157,7 +170,49 @@ class CurveGroup:
         Z2 = Q[2] * Q[2]
         x = Q[0] * mod_inv(Z2, self.p)
         y = Q[1] * mod_inv(Z2 * Q[2], self.p)
-        return x % self.p, y % self.p
+        return int(x % self._p), int(y % self._p)
+
+    def aff_from_jac_batch(self, Qs: Sequence[JacPoint]) -> List[Point]:
+        """Return the affine representation of the Jacobian points.
+
+        A single modular inversion is used for all the points.
+        """
+        # points are assumed to be on curve
+
+        Zs = [Q[2] for Q in Qs if Q[2] != 0]
+        Z_invs = iter(batch_mod_inv(Zs, self.p))
+        points: List[Point] = []
+        for Q in Qs:
+            if Q[2] == 0:  # Infinity point in Jacobian coordinates
+                points.append(INF)
+                continue
+            Z_inv = next(Z_invs)
+            Z2_inv = Z_inv * Z_inv
+            x = Q[0] * Z2_inv
+            y = Q[1] * Z2_inv * Z_inv
+            points.append((int(x % self._p), int(y % self._p)))
+        return points
+
+    def normalize_jac_batch(self, Qs: Sequence[JacPoint]) -> List[JacPoint]:
+        """Return the Jacobian points normalized to Z=1 (INFJ unchanged).
+
+        Normalized points allow for the cheaper
+        mixed Jacobian-affine addition in add_jac_vartime;
+        all the points share a single modular inversion.
+        """
+        Zs = [Q[2] for Q in Qs if Q[2] != 0]
+        Z_invs = iter(batch_mod_inv(Zs, self.p))
+        points: List[JacPoint] = []
+        for Q in Qs:
+            if Q[2] == 0:  # Infinity point in Jacobian coordinates
+                points.append(Q)
+                continue
+            Z_inv = next(Z_invs)
+            Z2_inv = Z_inv * Z_inv
+            x = Q[0] * Z2_inv
+            y = Q[1] * Z2_inv * Z_inv
+            points.append((x % self._p, y % self._p, 1))
+        return points
 
     def x_aff_from_jac(self, Q: JacPoint) -> int:
         # point is assumed to be on curve
@@ -165,7 +220,7 @@ class CurveGroup:
             raise BTClibValueError("INF has no x-coordinate")
 
         Z2 = Q[2] * Q[2]
-        return (Q[0] * mod_inv(Z2, self.p)) % self.p
+        return int(Q[0] * mod_inv(Z2, self.p) % self._p)
 
     def y_aff_from_jac(self, Q: JacPoint) -> int:
         # point is assumed to be on curve
@@ -173,7 +228,7 @@ class CurveGroup:
             raise BTClibValueError("INF has no y-coordinate")
 
         Z2 = Q[2] * Q[2]
-        return (Q[1] * mod_inv(Z2 * Q[2], self.p)) % self.p
+        return int(Q[1] * mod_inv(Z2 * Q[2], self.p) % self._p)
 
     def jac_equality(self, QJ: JacPoint, PJ: JacPoint) -> bool:
         """Return True if Jacobian points are equal in affine coordinates.
@@ -182,12 +237,12 @@ class CurveGroup:
         """
         PJ2 = PJ[2] * PJ[2]
         QJ2 = QJ[2] * QJ[2]
-        if QJ[0] * PJ2 % self.p != PJ[0] * QJ2 % self.p:
+        if QJ[0] * PJ2 % self._p != PJ[0] * QJ2 % self._p:
             return False
 
         PJ3 = PJ2 * PJ[2]
         QJ3 = QJ2 * QJ[2]
-        return QJ[1] * PJ3 % self.p == PJ[1] * QJ3 % self.p
+        return QJ[1] * PJ3 % self._p == PJ[1] * QJ3 % self._p
 
     # methods using _a, _b, p
 
@@ -211,6 +266,8 @@ class CurveGroup:
         # but it taken care of at the end,
         # after having performed all calculation, even if useless
 
+        # Z=1 (e.g. normalized table points) is not a special case either:
+        # the mixed Jacobian-affine addition is in add_jac_vartime only
         RZ2 = R[2] * R[2]
         RZ3 = RZ2 * R[2]
         QZ2 = Q[2] * Q[2]
@@ -223,15 +280,9 @@ class CurveGroup:
         U = R[1] * QZ3
 
         # FIXME: it would be better if doubling was not a special case
-        if M % self.p == N % self.p:  # same affine x
-            if T % self.p == U % self.p:  # point doubling
-                QY2 = Q[1] * Q[1]
-                W = 3 * Q[0] * Q[0] + self._a * QZ2 * QZ2
-                V = 4 * Q[0] * QY2
-                X = W * W - 2 * V
-                Y = W * (V - X) - 8 * QY2 * QY2
-                Z = 2 * Q[1] * Q[2]
-                return X % self.p, Y % self.p, Z % self.p
+        if M % self._p == N % self._p:  # same affine x
+            if T % self._p == U % self._p:  # point doubling
+                return self.double_jac(Q)
 
         W = U - T
         V = N - M
@@ -240,9 +291,9 @@ class CurveGroup:
         V3 = V2 * V
         MV2 = M * V2
 
-        X = (W * W - V3 - 2 * MV2) % self.p
-        Y = (W * (MV2 - X) - T * V3) % self.p
-        Z = (V * Q[2] * R[2]) % self.p
+        X = (W * W - V3 - 2 * MV2) % self._p
+        Y = (W * (MV2 - X) - T * V3) % self._p
+        Z = (V * Q[2] * R[2]) % self._p
 
         # Z is zero if Q or R are equal to INFJ,
         # so (X, Y, Z) is INFJ instead of being R or Q (respectively)
@@ -258,17 +309,73 @@ class CurveGroup:
         i = (Q[2] == 0) + (R[2] == 0) * 2
         return ret_values[i]
 
+    def add_jac_vartime(self, Q: JacPoint, R: JacPoint) -> JacPoint:
+        """Return Q + R, with INF as an early-out special case.
+
+        Unlike add_jac, it is not constant time:
+        use it with public data only (e.g. signature verification).
+        """
+        # points are assumed to be on curve
+
+        if Q[2] == 0:
+            return R
+        if R[2] == 0:
+            return Q
+
+        # mixed Jacobian-affine addition if Q or R have Z=1:
+        # precomputed tables are normalized to affine coordinates
+        # (see normalize_jac_batch) to take advantage of it
+        if R[2] == 1:
+            M = Q[0]
+            T = Q[1]
+        else:
+            RZ2 = R[2] * R[2]
+            M = Q[0] * RZ2
+            T = Q[1] * RZ2 * R[2]
+        if Q[2] == 1:
+            N = R[0]
+            U = R[1]
+        else:
+            QZ2 = Q[2] * Q[2]
+            N = R[0] * QZ2
+            U = R[1] * QZ2 * Q[2]
+
+        if M % self._p == N % self._p:  # same affine x
+            if T % self._p == U % self._p:  # point doubling
+                return self.double_jac(Q)
+            return INFJ  # opposite points
+
+        W = U - T
+        V = N - M
+
+        V2 = V * V
+        V3 = V2 * V
+        MV2 = M * V2
+
+        X = (W * W - V3 - 2 * MV2) % self._p
+        Y = (W * (MV2 - X) - T * V3) % self._p
+        Z = (V * Q[2] * R[2]) % self._p
+        return X, Y, Z
+
     def double_jac(self, Q: JacPoint) -> JacPoint:
         # point is assumed to be on curve
 
-        QZ2 = Q[2] * Q[2]
         QY2 = Q[1] * Q[1]
-        W = 3 * Q[0] * Q[0] + self._a * QZ2 * QZ2
+        if self._a_is_zero:
+            # e.g. secp256k1
+            W = 3 * Q[0] * Q[0]
+        elif self._a_is_minus_3:
+            # e.g. NIST curves: 3*X^2 - 3*Z^4 = 3*(X - Z^2)*(X + Z^2)
+            QZ2 = Q[2] * Q[2]
+            W = 3 * (Q[0] - QZ2) * (Q[0] + QZ2)
+        else:
+            QZ2 = Q[2] * Q[2]
+            W = 3 * Q[0] * Q[0] + self._a * QZ2 * QZ2
         V = 4 * Q[0] * QY2
         X = W * W - 2 * V
         Y = W * (V - X) - 8 * QY2 * QY2
         Z = 2 * Q[1] * Q[2]
-        return X % self.p, Y % self.p, Z % self.p
+        return X % self._p, Y % self._p, Z % self._p
 
     def add_aff(self, Q: Point, R: Point) -> Point:
         # points are assumed to be on curve
@@ -495,29 +602,34 @@ def multiples(Q: JacPoint, size: int, ec: CurveGroup) -> List[JacPoint]:
     if odd:
         T.append(ec.double_jac(T[(size - 1) // 2]))
 
-    return T
+    return ec.normalize_jac_batch(T)
 
 
 MAX_W = 5
 
 
-@functools.lru_cache()  # least recently used cache
+@table_cache(max_entries=128)
 def cached_multiples(Q: JacPoint, ec: CurveGroup) -> List[JacPoint]:
 
     T = [INFJ, Q]
     for i in range(3, 2 ** MAX_W, 2):
         T.append(ec.double_jac(T[(i - 1) // 2]))
         T.append(ec.add_jac(T[-1], Q))
-    return T
+    return ec.normalize_jac_batch(T)
 
 
-@functools.lru_cache()
+# about 650KB (see table_cache.nbytes) for the w=5 table of a 256-bit
+# curve point, e.g. G and the registered public keys: about 50 of them
+@table_cache(max_entries=128, max_bytes=32 * 2 ** 20)
 def cached_multiples_fixwind(
     Q: JacPoint, ec: CurveGroup, w: int = 4
-) -> List[List[JacPoint]]:
+) -> Sequence[Sequence[JacPoint]]:
     """Made to precompute values for mult_fixed_window_cached.
     Do not use it for other functions.
-    Made to be used for w=4, do not use w.
+
+    The table has (p_size*8)//w + 1 rows of 2^w Jacobian points:
+    w=4 is the default, while w=5 is used for the curve generator
+    (see btclib.ecc.curve._mult_generator).
     """
 
     T = []
@@ -530,7 +642,9 @@ def cached_multiples_fixwind(
         K = ec.double_jac(sublist[2 ** (w - 1)])
         T.append(sublist)
 
-    return T
+    # a single modular inversion normalizes the whole table
+    T_flat = ec.normalize_jac_batch([K for sublist in T for K in sublist])
+    return [T_flat[i : i + 2 ** w] for i in range(0, len(T_flat), 2 ** w)]
 
 
 def convert_number_to_base(i: int, base: int) -> List[int]:
@@ -549,11 +663,13 @@ def mult_mont_ladder(m: int, Q: JacPoint, ec: CurveGroup) -> JacPoint:
     This implementation uses
     'Montgomery ladder' algorithm,
     'left-to-right' binary decomposition of the m coefficient,
-    Jacobian coordinates.
+    projective coordinates with complete formulas
+    (see add_proj and double_proj).
 
     It is constant-time and resistant to the FLUSH+RELOAD attack,
     (see https://eprint.iacr.org/2014/140.pdf)
-    as it prevents branch prediction avoiding any if.
+    as it prevents branch prediction avoiding any if:
+    the complete formulas have no INF or doubling special case.
 
     The input point is assumed to be on curve and
     the m coefficient is assumed to have been reduced mod n
@@ -563,12 +679,12 @@ def mult_mont_ladder(m: int, Q: JacPoint, ec: CurveGroup) -> JacPoint:
     if m < 0:
         raise BTClibValueError(f"negative m: {hex(m)}")
 
-    # R[0] is the running resultR[1] = R[0] + Q is an ancillary variable
-    R = [INFJ, Q]
+    # R[0] is the running result, R[1] = R[0] + Q is an ancillary variable
+    R = [INFP, ec.proj_from_jac(Q)]
     for i in [int(i) for i in bin(m)[2:]]:
-        R[not i] = ec.add_jac(R[i], R[not i])
-        R[i] = ec.double_jac(R[i])
-    return R[0]
+        R[not i] = ec.add_proj(R[i], R[not i])
+        R[i] = ec.double_proj(R[i])
+    return ec.jac_from_proj(R[0])
 
 
 def mult_base_3(m: int, Q: JacPoint, ec: CurveGroup) -> JacPoint:
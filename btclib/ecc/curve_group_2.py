@@ -16,6 +16,9 @@ The implemented algorithms are:
     - Fixed window
     - Sliding window
     - w-ary non-adjacent form (wNAF)
+    - GLV method (efficiently computable endomorphism)
+    - x-only Montgomery ladder
+    - Pippenger's bucket method (multi scalar multiplication)
 
 References:
     - https://en.wikipedia.org/wiki/Elliptic_curve_point_multiplication
@@ -42,10 +45,16 @@ TODO:
 
 
 from math import ceil
-from typing import List, Tuple
-
-from btclib.alias import INFJ, JacPoint
-from btclib.ecc.curve_group import CurveGroup, _double_mult, convert_number_to_base
+from typing import List, Sequence, Tuple
+
+from btclib.alias import INFJ, INFP, JacPoint, ProjPoint
+from btclib.ecc.arithmetic import get_arithmetic
+from btclib.ecc.curve_group import (
+    CurveGroup,
+    _double_mult,
+    convert_number_to_base,
+    multiples,
+)
 from btclib.exceptions import BTClibValueError
 
 
@@ -252,3 +261,403 @@ def mult_endomorphism_secp256k1(m: int, Q: JacPoint, ec: CurveGroup) -> JacPoint
 
     # FIXME: Change double mult (?) with alghoritm 3.77
     return _double_mult(m1, Q, m2, K, ec)
+
+
+def w_NAF_multiples(Q: JacPoint, w: int, ec: CurveGroup) -> List[JacPoint]:
+    "Return the odd multiples {Q, 3Q, ..., (2^(w-1)-1)Q} used by wNAF."
+
+    if w < 2:
+        raise BTClibValueError(f"w too low: {w}")
+
+    Q2 = ec.double_jac(Q)
+    T = [Q]
+    for _ in range(1, 2 ** (w - 2)):
+        T.append(ec.add_jac(T[-1], Q2))
+    return ec.normalize_jac_batch(T)
+
+
+def _multi_mult_w_NAF(
+    scalars: Sequence[int], tables: Sequence[List[JacPoint]], ec: CurveGroup
+) -> JacPoint:
+    """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
+
+    This implementation uses the interleaved wNAF method
+    (D. Hankerson, 'Guide to Elliptic Curve Cryptography', algorithm 3.51):
+    a single 'double & add' loop where each scalar is in
+    its own wNAF representation.
+
+    Each point Qi is provided as its table of odd multiples
+    (see w_NAF_multiples), whose length implicitly defines
+    the window size for that scalar.
+    The scalars may be negative; they are not reduced mod n.
+
+    It is not constant time: use it with public data only.
+    """
+
+    if len(scalars) != len(tables):
+        err_msg = "mismatch between number of scalars and tables: "
+        err_msg += f"{len(scalars)} vs {len(tables)}"
+        raise BTClibValueError(err_msg)
+
+    nafs: List[List[int]] = []
+    for m, T in zip(scalars, tables):
+        w = len(T).bit_length() + 1
+        if m < 0:
+            nafs.append([-d for d in wNAF_of_m(-m, w)])
+        else:
+            nafs.append(wNAF_of_m(m, w))
+
+    R = INFJ
+    for i in range(max((len(naf) for naf in nafs), default=0) - 1, -1, -1):
+        if R[2] != 0:
+            R = ec.double_jac(R)
+        for naf, T in zip(nafs, tables):
+            if i < len(naf):
+                d = naf[i]
+                if d > 0:
+                    R = ec.add_jac_vartime(R, T[d >> 1])
+                elif d < 0:
+                    R = ec.add_jac_vartime(R, ec.negate_jac(T[-d >> 1]))
+    return R
+
+
+def glv_lattice_basis(lam: int, n: int) -> Tuple[int, int, int, int]:
+    """Return a short basis (a1, b1), (a2, b2) for the GLV decomposition.
+
+    The basis vectors are in the lattice {(x, y): x + y*lam = 0 mod n}
+    and are found with the extended Euclidean algorithm on (n, lam).
+
+    Based on alghoritm 3.74 of
+    D. Hankerson, 'Guide to Elliptic Curve Cryptography'.
+    """
+
+    # r_i = s_i*n + t_i*lam
+    r0, r1 = n, lam % n
+    t0, t1 = 0, 1
+    # stop at the greatest l with r_l >= sqrt(n)
+    while r1 * r1 >= n:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        t0, t1 = t1, t0 - q * t1
+    a1, b1 = r1, -t1
+
+    q = r0 // r1
+    r2, t2 = r0 - q * r1, t0 - q * t1
+    if r0 * r0 + t0 * t0 <= r2 * r2 + t2 * t2:
+        return a1, b1, r0, -t0
+    return a1, b1, r2, -t2
+
+
+class Endomorphism:
+    """Efficiently computable endomorphism of a prime order curve group.
+
+    The endomorphism phi(x, y) = (beta*x, y) is equivalent to
+    the scalar multiplication by lam, with beta and lam being
+    non-trivial cube roots of unity mod p and mod n respectively.
+
+    It allows to decompose a scalar m as m1 + m2*lam (mod n),
+    with m1 and m2 about half the size of n,
+    halving the number of doublings required
+    by the scalar multiplication (GLV method).
+
+    See D. Hankerson, 'Guide to Elliptic Curve Cryptography' chapter 3.5.
+    """
+
+    def __init__(self, lam: int, beta: int, n: int) -> None:
+        self.lam = lam
+        self.beta = beta
+        self.n = n
+        self.a1, self.b1, self.a2, self.b2 = glv_lattice_basis(lam, n)
+        # the decompose rounding errors are at most 1/2 for each basis vector:
+        # |m1| and |m2| are less than 2^nbits
+        a = max(abs(self.a1), abs(self.a2))
+        b = max(abs(self.b1), abs(self.b2))
+        self.nbits = (a + b).bit_length()
+
+    def decompose(self, m: int) -> Tuple[int, int]:
+        """Return (m1, m2) so that m = m1 + m2*lam (mod n).
+
+        m1 and m2 are signed integers, about half the size of n.
+        """
+
+        # rounded divisions by n
+        c1 = (2 * self.b2 * m + self.n) // (2 * self.n)
+        c2 = (-2 * self.b1 * m + self.n) // (2 * self.n)
+
+        m1 = m - c1 * self.a1 - c2 * self.a2
+        m2 = -c1 * self.b1 - c2 * self.b2
+        return m1, m2
+
+    def map_jac(self, Q: JacPoint, ec: CurveGroup) -> JacPoint:
+        "Return phi(Q) = lam*Q, i.e. (beta*x, y), in Jacobian coordinates."
+        return Q[0] * self.beta % ec.p, Q[1], Q[2]
+
+
+def mult_endomorphism(
+    m: int, Q: JacPoint, ec: CurveGroup, endo: Endomorphism, w: int = 5
+) -> JacPoint:
+    """Scalar multiplication using the GLV method.
+
+    This implementation decomposes the m coefficient as m1 + m2*lam,
+    then it computes m1*Q + m2*phi(Q) with interleaved wNAF,
+    Jacobian coordinates.
+    The table of multiples of phi(Q) is obtained from the one of Q
+    at the cost of a multiplication for each point.
+
+    It is not constant time.
+
+    The input point is assumed to be on curve and
+    the m coefficient is assumed to have been reduced mod n.
+    """
+
+    if m < 0:
+        raise BTClibValueError(f"negative m: {hex(m)}")
+
+    m1, m2 = endo.decompose(m)
+    T = w_NAF_multiples(Q, w, ec)
+    T_phi = [endo.map_jac(P, ec) for P in T]
+    return _multi_mult_w_NAF((m1, m2), (T, T_phi), ec)
+
+
+def _select_proj(T: Sequence[ProjPoint], i: int) -> ProjPoint:
+    "Return T[i], reading all the table points (no secret-dependent access)."
+
+    X = Y = Z = 0
+    for j, (x, y, z) in enumerate(T):
+        b = j == i
+        X += x * b
+        Y += y * b
+        Z += z * b
+    return X, Y, Z
+
+
+def _signed_window_digits(m: int, w: int, n_digits: int) -> List[int]:
+    """Return the signed base 2^w digits of m, in (-2^(w-1), 2^(w-1)].
+
+    Unlike _signed_digits, the digits are computed without branches.
+    The most significant digit comes first.
+    """
+
+    half = 2 ** (w - 1)
+    mask = 2 ** w - 1
+    digits: List[int] = []
+    for _ in range(n_digits):
+        d = m & mask
+        carry = d > half
+        digits.append(d - (carry << w))
+        m = (m >> w) + carry
+    return digits[::-1]
+
+
+def mult_endomorphism_fixed_window(
+    m: int, Q: JacPoint, ec: CurveGroup, endo: Endomorphism, w: int = 4
+) -> JacPoint:
+    """Constant time scalar multiplication using the GLV method.
+
+    This implementation decomposes the m coefficient as m1 + m2*lam,
+    then it computes m1*Q + m2*phi(Q)
+    with an interleaved 'multiple-double & add' signed fixed window,
+    i.e. half the doublings of mult_fixed_window:
+    the tables are {0, Q, ..., 2^(w-1) Q} and its phi image,
+    the signs of the digits (and of m1 and m2)
+    selecting the table points or their opposites.
+
+    Unlike mult_endomorphism, it is constant time, as m can be secret:
+    the number of windows depends on the curve only,
+    the table points are selected reading the whole tables,
+    and the complete projective formulas (see add_proj)
+    have no INF or doubling special cases.
+
+    The input point is assumed to be on curve and
+    the m coefficient is assumed to have been reduced mod n.
+    """
+
+    if m < 0:
+        raise BTClibValueError(f"negative m: {hex(m)}")
+
+    # a number cannot be written in basis 1 (ie w=0)
+    if w <= 0:
+        raise BTClibValueError(f"non positive w: {w}")
+
+    p = ec._p  # pylint: disable=protected-access
+    # normalized table points: (X, Y, 1) is also projective,
+    # while (X, Y, 0) becomes INFP
+    T1 = [
+        (X * Z % p, (Y * Z + 1 - Z) % p, Z)
+        for X, Y, Z in multiples(Q, 2 ** (w - 1) + 1, ec)
+    ]
+    T2 = [(X * endo.beta % p, Y, Z) for X, Y, Z in T1]
+
+    m1, m2 = endo.decompose(m)
+    s1, s2 = m1 < 0, m2 < 0
+    # a final carry could need an additional digit
+    n_digits = endo.nbits // w + 1
+    digits1 = _signed_window_digits(abs(m1), w, n_digits)
+    digits2 = _signed_window_digits(abs(m2), w, n_digits)
+
+    R = INFP
+    for d1, d2 in zip(digits1, digits2):
+        for _ in range(w):
+            R = ec.double_proj(R)
+        X, Y, Z = _select_proj(T1, abs(d1))
+        R = ec.add_proj(R, (X, (Y, p - Y)[(d1 < 0) ^ s1], Z))
+        X, Y, Z = _select_proj(T2, abs(d2))
+        R = ec.add_proj(R, (X, (Y, p - Y)[(d2 < 0) ^ s2], Z))
+    return ec.jac_from_proj(R)
+
+
+def mult_x_ladder(m: int, x: int, ec: CurveGroup) -> Tuple[int, int]:
+    """Return the x-only projective coordinates (X, Z) of m*Q.
+
+    This implementation uses
+    'Montgomery ladder' algorithm,
+    'left-to-right' binary decomposition of the m coefficient,
+    x-only projective coordinates with the Brier-Joye formulas
+    (see https://link.springer.com/chapter/10.1007/3-540-45664-3_24):
+    the differential addition uses the affine x of Q = R[1] - R[0].
+
+    Only the x-coordinate of Q is needed, as x(m*Q) = x(-m*Q);
+    the affine x of the result is X/Z, with Z = 0 for INF.
+
+    It is constant-time, as the ladder steps are selected
+    with an arithmetic conditional swap, i.e. without any if;
+    the formulas have no INF special case.
+
+    The x-coordinate is assumed to be of a curve point and
+    the m coefficient is assumed to have been reduced mod n
+    if appropriate (e.g. cyclic groups of order n).
+    """
+
+    if m < 0:
+        raise BTClibValueError(f"negative m: {hex(m)}")
+
+    element = get_arithmetic().element
+    p, a, b = element(ec.p), ec.a, ec.b
+    b4, b8 = 4 * b, 8 * b
+    xQ = element(x)
+    # (X0, Z0) = INF, (X1, Z1) = Q: their difference is always Q
+    X0, Z0, X1, Z1 = element(1), element(0), xQ, element(1)
+    swap = 0
+    for i in [int(i) for i in bin(m)[2:]]:
+        # bit set: R0 = R0 + R1, R1 = 2*R1; else: R1 = R0 + R1, R0 = 2*R0
+        # i.e. swap R0 and R1 if the bit is set, before and after the step
+        s = swap ^ i
+        dX = s * (X0 - X1)
+        dZ = s * (Z0 - Z1)
+        X0, X1, Z0, Z1 = X0 - dX, X1 + dX, Z0 - dZ, Z1 + dZ
+        swap = i
+        # x(R0 + R1) + x(R1 - R0) = (2*(x0+x1)*(x0*x1+a) + 4*b) / (x0-x1)^2
+        t0 = X0 * Z1
+        t1 = X1 * Z0
+        ZZ = Z0 * Z1 % p
+        XX = X0 * X1 + a * ZZ if a else X0 * X1
+        Z1 = (t0 - t1) ** 2 % p
+        X1 = (2 * (t0 + t1) * XX + b4 * ZZ * ZZ - xQ * Z1) % p
+        # R0 = 2*R0
+        XX = X0 * X0 % p
+        ZZ = Z0 * Z0 % p
+        if a:
+            X0, Z0 = (
+                ((XX - a * ZZ) ** 2 - b8 * X0 * Z0 * ZZ) % p,
+                4 * Z0 * (X0 * (XX + a * ZZ) + b * Z0 * ZZ) % p,
+            )
+        else:
+            ZZ = ZZ * Z0 % p
+            X0, Z0 = (XX * XX - b8 * X0 * ZZ) % p, 4 * Z0 * (X0 * XX + b * ZZ) % p
+    dX = swap * (X0 - X1)
+    dZ = swap * (Z0 - Z1)
+    return (X0 - dX) % p, (Z0 - dZ) % p
+
+
+def _pippenger_window(size: int, nbits: int) -> int:
+    """Return the Pippenger window size for the given number of points.
+
+    The window size c minimizes the estimated number of point additions
+    ceil((nbits+1)/c) * (size + 2^c).
+    """
+    costs = [(-(-(nbits + 1) // c) * (size + 2 ** c), c) for c in range(2, 21)]
+    return min(costs)[1]
+
+
+def _signed_digits(m: int, c: int, n_digits: int) -> List[int]:
+    "Return the signed base 2^c digits of m, in [-2^(c-1), 2^(c-1)]."
+
+    half = 2 ** (c - 1)
+    mask = 2 ** c - 1
+    digits: List[int] = []
+    for _ in range(n_digits):
+        d = m & mask
+        m >>= c
+        if d > half:
+            d -= 2 ** c
+            m += 1
+        digits.append(d)
+    return digits
+
+
+def _multi_mult_pippenger(
+    scalars: Sequence[int], jac_points: Sequence[JacPoint], ec: CurveGroup, c: int = 0
+) -> JacPoint:
+    """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
+
+    Use Pippenger's bucket method: for each c-bit window of the scalars
+    every point is added to (or subtracted from) the bucket selected by
+    its signed window digit, then the buckets are combined with a
+    running sum.
+    The window size c (if zero) is chosen according to the number of points.
+    It has sublinear cost per point and it is the method of choice
+    for large batches.
+
+    It is not constant time.
+
+    The input points are assumed to be on curve,
+    the scalar coefficients are assumed to have been reduced mod n
+    if appropriate (e.g. cyclic groups of order n).
+    """
+
+    if len(scalars) != len(jac_points):
+        err_msg = "mismatch between number of scalars and points: "
+        err_msg += f"{len(scalars)} vs {len(jac_points)}"
+        raise BTClibValueError(err_msg)
+
+    ints: List[int] = []
+    points: List[JacPoint] = []
+    for n, PJ in zip(scalars, jac_points):
+        if n < 0:
+            raise BTClibValueError(f"negative coefficient: {hex(n)}")
+        if n != 0 and PJ[2] != 0:
+            ints.append(n)
+            points.append(PJ)
+
+    if not ints:
+        return INFJ
+
+    nbits = max(ints).bit_length()
+    c = c or _pippenger_window(len(ints), nbits)
+    n_digits = nbits // c + 1
+    digits = [_signed_digits(n, c, n_digits) for n in ints]
+
+    R = INFJ
+    for j in range(n_digits - 1, -1, -1):
+        if R[2] != 0:
+            for _ in range(c):
+                R = ec.double_jac(R)
+
+        buckets: List[JacPoint] = [INFJ] * 2 ** (c - 1)
+        for n_d, PJ in zip(digits, points):
+            d = n_d[j]
+            if d > 0:
+                buckets[d - 1] = ec.add_jac_vartime(buckets[d - 1], PJ)
+            elif d < 0:
+                PJ = ec.negate_jac(PJ)
+                buckets[-d - 1] = ec.add_jac_vartime(buckets[-d - 1], PJ)
+
+        # sum_d d*buckets[d-1] as running sum of running sums
+        S = INFJ
+        T = INFJ
+        for B in reversed(buckets):
+            S = ec.add_jac_vartime(S, B)
+            T = ec.add_jac_vartime(T, S)
+        R = ec.add_jac_vartime(R, T)
+
+    return R
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Projective coordinates of elliptic curve points.
+
+ProjectiveMixin provides CurveGroup with the conversions between
+Jacobian (X/Z^2, Y/Z^3) and projective (X/Z, Y/Z) coordinates
+and with the complete Renes-Costello-Batina projective formulas,
+used by the constant-time scalar multiplication algorithms.
+"""
+
+from typing import Any
+
+from btclib.alias import INFJ, INFP, JacPoint, ProjPoint
+
+
+class ProjectiveMixin:
+    "Projective coordinates methods of CurveGroup."
+
+    # set by CurveGroup.__init__
+    _p: Any
+    _a: int
+    _b3: Any
+    _a_is_zero: bool
+
+    def proj_from_jac(self, Q: JacPoint) -> ProjPoint:
+        "Return the projective coordinates of a Jacobian point."
+
+        if Q[2] == 0:
+            return INFP
+        return Q[0] * Q[2] % self._p, Q[1], Q[2] * Q[2] * Q[2] % self._p
+
+    def jac_from_proj(self, Q: ProjPoint) -> JacPoint:
+        "Return the Jacobian coordinates of a projective point."
+
+        if Q[2] == 0:
+            return INFJ
+        X = Q[0] * Q[2] % self._p
+        Y = Q[1] * Q[2] * Q[2] % self._p
+        return X, Y, Q[2]
+
+    def add_proj(self, Q: ProjPoint, R: ProjPoint) -> ProjPoint:
+        """Return Q + R using complete projective formulas.
+
+        The Renes-Costello-Batina formulas
+        (see https://eprint.iacr.org/2015/1060.pdf, algorithms 1 and 7)
+        have no exceptional cases on curves of odd order:
+        INF and doubling are handled by the very same computation.
+        """
+        # points are assumed to be on curve
+
+        p = self._p
+        t0 = Q[0] * R[0] % p
+        t1 = Q[1] * R[1] % p
+        t2 = Q[2] * R[2] % p
+        t3 = ((Q[0] + Q[1]) * (R[0] + R[1]) - t0 - t1) % p
+        t4 = ((Q[0] + Q[2]) * (R[0] + R[2]) - t0 - t2) % p
+        t5 = ((Q[1] + Q[2]) * (R[1] + R[2]) - t1 - t2) % p
+        if self._a_is_zero:
+            # e.g. secp256k1
+            t2 = self._b3 * t2 % p
+            Z = t1 + t2
+            t1 -= t2
+            t4 = self._b3 * t4 % p
+            t0 *= 3
+            X = t3 * t1 - t5 * t4
+            Y = t1 * Z + t4 * t0
+            Z = Z * t5 + t0 * t3
+            return X % p, Y % p, Z % p
+
+        a = self._a
+        Z = (a * t4 + self._b3 * t2) % p
+        X = t1 - Z
+        Z += t1
+        Y = X * Z
+        t2 = a * t2 % p
+        t4 = (self._b3 * t4 + a * (t0 - t2)) % p
+        t1 = 3 * t0 + t2
+        Y += t1 * t4
+        X = t3 * X - t5 * t4
+        Z = t5 * Z + t3 * t1
+        return X % p, Y % p, Z % p
+
+    def double_proj(self, Q: ProjPoint) -> ProjPoint:
+        """Return 2 * Q using complete projective formulas.
+
+        See https://eprint.iacr.org/2015/1060.pdf, algorithms 3 and 9.
+        """
+        # point is assumed to be on curve
+
+        p = self._p
+        if self._a_is_zero:
+            # e.g. secp256k1
+            t0 = Q[1] * Q[1] % p
+            t2 = self._b3 * Q[2] * Q[2] % p
+            Z = 8 * t0
+            X = t2 * Z
+            Y = t0 + t2
+            Z *= Q[1] * Q[2]
+            t0 -= 3 * t2
+            Y = t0 * Y + X
+            X = 2 * t0 * Q[0] * Q[1]
+            return X % p, Y % p, Z % p
+
+        a = self._a
+        t0 = Q[0] * Q[0] % p
+        t1 = Q[1] * Q[1] % p
+        t2 = Q[2] * Q[2] % p
+        Z = 2 * Q[0] * Q[2] % p
+        Y = (a * Z + self._b3 * t2) % p
+        X = 2 * Q[0] * Q[1] * (t1 - Y) % p
+        Y = (t1 - Y) * (t1 + Y)
+        t2 = a * t2 % p
+        t3 = (a * (t0 - t2) + self._b3 * Z) % p
+        Y += (3 * t0 + t2) * t3
+        t2 = 2 * Q[1] * Q[2] % p
+        X -= t2 * t3
+        Z = 4 * t2 * t1
+        return X % p, Y % p, Z % p
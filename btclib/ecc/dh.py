@@ -20,12 +20,37 @@ function to use.
 """
 
 from hashlib import sha256
+from itertools import islice
 from math import ceil
-from typing import Optional
+from typing import Iterator, List, Optional, Sequence
 
 from btclib.alias import HashF, Point
+from btclib.ecc import libsecp256k1
 from btclib.ecc.curve import Curve, mult, secp256k1
+from btclib.ecc.curve_group_2 import mult_x_ladder
+from btclib.ecc.number_theory import batch_mod_inv
 from btclib.exceptions import BTClibRuntimeError, BTClibValueError
+from btclib.utils import int_from_integer
+
+
+def ansi_x9_63_kdf_stream(
+    z: bytes, hf: HashF, shared_info: Optional[bytes]
+) -> Iterator[bytes]:
+    """Yield the ANSI-X9.63-KDF keying data, one hash digest at a time.
+
+    The keying data is generated lazily, up to 2^32-1 digests.
+    The shared secret z is hashed only once:
+    each digest starts from a copy of that midstate.
+
+    http://www.secg.org/sec1-v2.pdf, section 3.6.1
+    """
+    h_z = hf()
+    h_z.update(z)
+    suffix = b"" if shared_info is None else shared_info
+    for counter in range(1, 2 ** 32):
+        h = h_z.copy()
+        h.update(counter.to_bytes(4, byteorder="big", signed=False) + suffix)
+        yield h.digest()
 
 
 def ansi_x9_63_kdf(
@@ -42,17 +67,28 @@ def ansi_x9_63_kdf(
     max_size = hf_size * (2 ** 32 - 1)
     if size > max_size:
         raise BTClibValueError(f"cannot derive a key larger than {max_size} bytes")
-    K_temp = []
-    for counter in range(1, ceil(size / hf_size) + 1):
-        h = hf()
-        hash_input = (
-            z
-            + counter.to_bytes(4, byteorder="big", signed=False)
-            + (b"" if shared_info is None else shared_info)
-        )
-        h.update(hash_input)
-        K_temp.append(h.digest())
-    return b"".join(K_temp)[:size]
+    digests = islice(ansi_x9_63_kdf_stream(z, hf, shared_info), ceil(size / hf_size))
+    return b"".join(digests)[:size]
+
+
+def _shared_secret_xs(dU: int, QVs: Sequence[Point], ec: Curve) -> List[int]:
+    "Return the x-coordinates of the dU*QV shared secret points."
+
+    dU = int_from_integer(dU) % ec.n
+    for QV in QVs:
+        ec.require_on_curve(QV)
+    if ec == secp256k1 and libsecp256k1.is_enabled():
+        Rs = [mult(dU, QV, ec) for QV in QVs]
+        if any(R[1] == 0 for R in Rs):
+            raise BTClibRuntimeError("invalid (INF) key")
+        return [R[0] for R in Rs]
+
+    # constant-time x-only ladder: X/Z
+    XZs = [mult_x_ladder(dU, QV[0], ec) if QV[1] else (1, 0) for QV in QVs]
+    if any(Z == 0 for _, Z in XZs):
+        raise BTClibRuntimeError("invalid (INF) key")
+    Z_invs = batch_mod_inv([Z for _, Z in XZs], ec.p)
+    return [int(X * Z_inv % ec.p) for (X, _), Z_inv in zip(XZs, Z_invs)]
 
 
 def diffie_hellman(
@@ -66,13 +102,34 @@ def diffie_hellman(
     """Diffie-Hellman elliptic curve key agreement scheme.
 
     http://www.secg.org/sec1-v2.pdf, section 6.1
+
+    Only the x-coordinate of the shared secret point is computed,
+    with the constant-time x-only Montgomery ladder.
     """
 
-    shared_secret_point = mult(dU, QV, ec)
-    # edge case that cannot be reproduced in the test suite
-    if shared_secret_point[1] == 0:
-        err_msg = "invalid (INF) key"  # pragma: no cover
-        raise BTClibRuntimeError(err_msg)  # pragma: no cover
-    shared_secret_field_element = shared_secret_point[0]
-    z = shared_secret_field_element.to_bytes(ec.p_size, byteorder="big", signed=False)
-    return ansi_x9_63_kdf(z, size, hf, shared_info)
+    return diffie_hellman_batch(dU, [QV], size, shared_info, ec, hf)[0]
+
+
+def diffie_hellman_batch(
+    dU: int,
+    QVs: Sequence[Point],
+    size: int,
+    shared_info: Optional[bytes] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+) -> List[bytes]:
+    """Return the Diffie-Hellman keying data of dU with each QV in QVs.
+
+    It is equivalent to
+    [diffie_hellman(dU, QV, size, shared_info, ec, hf) for QV in QVs],
+    but the conversions to affine x-coordinate
+    share a single modular inversion.
+    All the public keys are validated before any computation.
+    """
+
+    return [
+        ansi_x9_63_kdf(
+            x.to_bytes(ec.p_size, "big", signed=False), size, hf, shared_info
+        )
+        for x in _shared_secret_xs(dU, QVs, ec)
+    ]
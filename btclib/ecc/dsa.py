@@ -20,11 +20,17 @@
 
 import secrets
 from hashlib import sha256
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Sequence, Tuple, Union
 
 from btclib.alias import HashF, JacPoint, Octets, Point
-from btclib.ecc.curve import Curve, secp256k1
-from btclib.ecc.curve_group import _double_mult, _mult
+from btclib.ecc import libsecp256k1
+from btclib.ecc.curve import (
+    Curve,
+    _double_mult_vartime,
+    _mult_generator,
+    _multi_mult_vartime,
+    secp256k1,
+)
 from btclib.ecc.der import Sig
 from btclib.ecc.number_theory import mod_inv
 from btclib.ecc.rfc6979 import _rfc6979_
@@ -46,7 +52,7 @@ def gen_keys(
     else:
         q = int_from_prv_key(prv_key, ec)
 
-    QJ = _mult(q, ec.GJ, ec)
+    QJ = _mult_generator(q, ec)
     Q = ec.aff_from_jac(QJ)
     return q, Q
 
@@ -58,10 +64,10 @@ def _sign_(c: int, q: int, nonce: int, lower_s: bool, ec: Curve) -> Sig:
 
     # Steps numbering follows SEC 1 v.2 section 4.1.3
 
-    KJ = _mult(nonce, ec.GJ, ec)  # 1
+    KJ = _mult_generator(nonce, ec)  # 1
 
     # affine x_K-coordinate of K (field element)
-    x_K = (KJ[0] * mod_inv(KJ[2] * KJ[2], ec.p)) % ec.p
+    x_K = ec.x_aff_from_jac(KJ)
     # mod n makes it a scalar
     r = x_K % ec.n  # 2, 3
     if r == 0:  # r≠0 required as it multiplies the public key
@@ -102,6 +108,16 @@ def sign_(
     # SEC 1 v.2 section 3.2.1
     q = int_from_prv_key(prv_key, ec)
 
+    if (
+        nonce is None
+        and lower_s
+        and ec == secp256k1
+        and hf is sha256
+        and libsecp256k1.is_enabled()
+    ):
+        r, s = libsecp256k1.dsa_sign_(msg_hash, q)
+        return Sig(r, s, ec)
+
     # the challenge
     c = challenge_(msg_hash, ec, hf)  # 4, 5
 
@@ -159,7 +175,7 @@ def _assert_as_valid_(
     u = c * w % ec.n
     v = r * w % ec.n  # 4
     # Let K = u*G + v*Q.
-    KJ = _double_mult(v, QJ, u, ec.GJ, ec)  # 5
+    KJ = _double_mult_vartime(v, QJ, u, ec.GJ, ec)  # 5
 
     # Fail if infinite(K).
     # edge case that cannot be reproduced in the test suite
@@ -167,11 +183,17 @@ def _assert_as_valid_(
         err_msg = "invalid (INF) key"  # pragma: no cover
         raise BTClibRuntimeError(err_msg)  # pragma: no cover
 
-    # affine x_K-coordinate of K
-    x_K = (KJ[0] * mod_inv(KJ[2] * KJ[2], ec.p)) % ec.p
     # Fail if r ≠ x_K %n.
-    if r != x_K % ec.n:  # 6, 7, 8
-        raise BTClibRuntimeError("signature verification failed")
+    # x_K = X_K/Z_K^2 is one of r, r+n, r+2n, ... less than p:
+    # compare them with X_K without inverting Z_K^2
+    Z2 = KJ[2] * KJ[2] % ec.p
+    X = KJ[0] % ec.p
+    x_K = r
+    while x_K < ec.p:
+        if X == x_K * Z2 % ec.p:
+            return
+        x_K += ec.n
+    raise BTClibRuntimeError("signature verification failed")  # 6, 7, 8
 
 
 def assert_as_valid_(
@@ -192,6 +214,18 @@ def assert_as_valid_(
     c = challenge_(msg_hash, sig.ec, hf)  # 2, 3
 
     Q = point_from_key(key, sig.ec)
+
+    if sig.ec == secp256k1 and hf is sha256 and libsecp256k1.is_enabled():
+        if lower_s and sig.s > sig.ec.n / 2:
+            raise BTClibValueError("not a low s")
+        # libsecp256k1 only accepts low-s signatures:
+        # (r, s) is valid if and only if (r, n - s) is valid
+        s = min(sig.s, sig.ec.n - sig.s)
+        msg_hash = bytes_from_octets(msg_hash, hf().digest_size)
+        if not libsecp256k1.dsa_verify_(msg_hash, Q, sig.r, s):
+            raise BTClibRuntimeError("signature verification failed")
+        return
+
     QJ = Q[0], Q[1], 1
 
     # second part delegated to helper function
@@ -244,6 +278,157 @@ def verify(
     return verify_(msg_hash, key, sig, lower_s, hf)
 
 
+def _lift_x_(key_id: int, r: int, ec: Curve) -> Optional[JacPoint]:
+    # Private function: the ephemeral key K of the signature,
+    # if the recovery hint key_id (as in bms) is consistent with r
+    # key_id bit 0: y_K parity; bit 1: x_K = r + n
+
+    x_K = r + (key_id >> 1 & 1) * ec.n
+    if x_K >= ec.p:
+        return None
+    try:
+        y_K = ec.y_even(x_K)
+    except BTClibValueError:
+        return None
+    return x_K, ec.p - y_K if key_id & 1 else y_K, 1
+
+
+def assert_batch_as_valid_(
+    m_hashes: Sequence[Octets],
+    keys: Sequence[Key],
+    sigs: Sequence[Union[Sig, Octets]],
+    key_ids: Optional[Sequence[Optional[int]]] = None,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+) -> None:
+    """Batch verification of ECDSA signatures.
+
+    The optional recovery hints key_ids (as in bms: y_K parity in bit 0,
+    x_K = r + n in bit 1) allow to lift r to the ephemeral key K:
+    then s*K = c*G + r*Q is checked for all the signatures at once,
+    with a random linear combination and a multi scalar multiplication.
+    Signatures without hint are verified one at a time;
+    if the combined check fails (e.g. because of wrong hints),
+    the signatures are verified one at a time, to find the invalid one.
+    For secp256k1 with the libsecp256k1 backend enabled
+    all the signatures are verified one at a time by libsecp256k1.
+    """
+
+    batch_size = len(keys)
+    if batch_size == 0:
+        raise BTClibValueError("no signatures provided")
+
+    if len(m_hashes) != batch_size:
+        err_msg = f"mismatch between number of pub_keys ({batch_size}) "
+        err_msg += f"and number of messages ({len(m_hashes)})"
+        raise BTClibValueError(err_msg)
+    if len(sigs) != batch_size:
+        err_msg = f"mismatch between number of pub_keys ({batch_size}) "
+        err_msg += f"and number of signatures ({len(sigs)})"
+        raise BTClibValueError(err_msg)
+    if key_ids is None:
+        key_ids = [None] * batch_size
+    elif len(key_ids) != batch_size:
+        err_msg = f"mismatch between number of pub_keys ({batch_size}) "
+        err_msg += f"and number of key_ids ({len(key_ids)})"
+        raise BTClibValueError(err_msg)
+
+    parsed_sigs: List[Sig] = []
+    for sig in sigs:
+        if isinstance(sig, Sig):
+            sig.assert_valid()
+        else:
+            sig = Sig.parse(sig)
+        parsed_sigs.append(sig)
+    ec = parsed_sigs[0].ec
+    if any(sig.ec != ec for sig in parsed_sigs):
+        raise BTClibValueError("not the same curve for all signatures")
+
+    if ec == secp256k1 and hf is sha256 and libsecp256k1.is_enabled():
+        for msg_hash, key, sig in zip(m_hashes, keys, parsed_sigs):
+            assert_as_valid_(msg_hash, key, sig, lower_s, hf)
+        return
+
+    t = 0
+    scalars: List[int] = []
+    points: List[JacPoint] = []
+    batched: List[Tuple[int, JacPoint, Sig]] = []
+    for msg_hash, key, sig, key_id in zip(m_hashes, keys, parsed_sigs, key_ids):
+        c = challenge_(msg_hash, ec, hf)
+        Q = point_from_key(key, ec)
+        QJ = Q[0], Q[1], 1
+        KJ = None if key_id is None else _lift_x_(key_id, sig.r, ec)
+        if KJ is None:
+            _assert_as_valid_(c, QJ, sig.r, sig.s, lower_s, ec)
+            continue
+        if lower_s and sig.s > ec.n / 2:
+            raise BTClibValueError("not a low s")
+        # s*K - r*Q = c*G
+        rand = 1 if not batched else 1 + secrets.randbelow(ec.n - 1)
+        scalars.append(rand * sig.s % ec.n)
+        points.append(KJ)
+        scalars.append(-rand * sig.r % ec.n)
+        points.append(QJ)
+        t += rand * c
+        batched.append((c, QJ, sig))
+
+    if not batched:
+        return
+    TJ = _mult_generator(t % ec.n, ec)
+    RHSJ = _multi_mult_vartime(scalars, points, ec)
+    if ec.jac_equality(TJ, RHSJ):
+        return
+    for c, QJ, sig in batched:
+        _assert_as_valid_(c, QJ, sig.r, sig.s, lower_s, ec)
+
+
+def assert_batch_as_valid(
+    ms: Sequence[Octets],
+    keys: Sequence[Key],
+    sigs: Sequence[Union[Sig, Octets]],
+    key_ids: Optional[Sequence[Optional[int]]] = None,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+) -> None:
+
+    m_hashes = [reduce_to_hlen(msg, hf) for msg in ms]
+    assert_batch_as_valid_(m_hashes, keys, sigs, key_ids, lower_s, hf)
+
+
+def batch_verify_(
+    m_hashes: Sequence[Octets],
+    keys: Sequence[Key],
+    sigs: Sequence[Union[Sig, Octets]],
+    key_ids: Optional[Sequence[Optional[int]]] = None,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+) -> bool:
+    "Batch verification of ECDSA signatures."
+
+    # all kind of Exceptions are catched because
+    # verify must always return a bool
+    try:
+        assert_batch_as_valid_(m_hashes, keys, sigs, key_ids, lower_s, hf)
+    except Exception:  # pylint: disable=broad-except
+        return False
+
+    return True
+
+
+def batch_verify(
+    ms: Sequence[Octets],
+    keys: Sequence[Key],
+    sigs: Sequence[Union[Sig, Octets]],
+    key_ids: Optional[Sequence[Optional[int]]] = None,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+) -> bool:
+    "Batch verification of ECDSA signatures."
+
+    m_hashes = [reduce_to_hlen(msg, hf) for msg in ms]
+    return batch_verify_(m_hashes, keys, sigs, key_ids, lower_s, hf)
+
+
 # TODO: use _recover_pub_key_ to avoid code duplication
 def _recover_pub_keys_(
     c: int, r: int, s: int, lower_s: bool, ec: Curve
@@ -267,7 +452,7 @@ def _recover_pub_keys_(
             yodd = ec.y_even(x_K)
             KJ = x_K, yodd, 1  # 1.2, 1.3, and 1.4
             # 1.5 has been performed in the recover_pub_keys calling function
-            QJ = _double_mult(r1s, KJ, r1e, ec.GJ, ec)  # 1.6.1
+            QJ = _double_mult_vartime(r1s, KJ, r1e, ec.GJ, ec)  # 1.6.1
             try:
                 _assert_as_valid_(c, QJ, r, s, lower_s, ec)  # 1.6.2
             except (BTClibValueError, BTClibRuntimeError):
@@ -275,7 +460,7 @@ def _recover_pub_keys_(
             else:
                 keys.append(QJ)  # 1.6.2
             KJ = x_K, ec.p - yodd, 1  # 1.6.3
-            QJ = _double_mult(r1s, KJ, r1e, ec.GJ, ec)
+            QJ = _double_mult_vartime(r1s, KJ, r1e, ec.GJ, ec)
             try:
                 _assert_as_valid_(c, QJ, r, s, lower_s, ec)  # 1.6.2
             except (BTClibValueError, BTClibRuntimeError):
@@ -324,10 +509,9 @@ def recover_pub_keys(
     return recover_pub_keys_(msg_hash, sig, lower_s, hf)
 
 
-def _recover_pub_key_(
-    key_id: int, c: int, r: int, s: int, lower_s: bool, ec: Curve
-) -> JacPoint:
-    # Private function provided for testing purposes only.
+def _recovered_key_(key_id: int, c: int, r: int, s: int, ec: Curve) -> JacPoint:
+    # Private function: the public key recovered from the signature
+    # without its final verification (1.6.2), e.g. for batch verification
 
     # precomputations
     r_1 = mod_inv(r, ec.n)
@@ -345,7 +529,15 @@ def _recover_pub_key_(
     y_K = ec.p - y_even if i else y_even
     KJ = x_K, y_K, 1  # 1.2, 1.3, and 1.4
     # 1.5 has been performed in the recover_pub_keys calling function
-    QJ = _double_mult(r1s, KJ, r1e, ec.GJ, ec)  # 1.6.1
+    return _double_mult_vartime(r1s, KJ, r1e, ec.GJ, ec)  # 1.6.1
+
+
+def _recover_pub_key_(
+    key_id: int, c: int, r: int, s: int, lower_s: bool, ec: Curve
+) -> JacPoint:
+    # Private function provided for testing purposes only.
+
+    QJ = _recovered_key_(key_id, c, r, s, ec)  # 1.6.1
     _assert_as_valid_(c, QJ, r, s, lower_s, ec)  # 1.6.2
     return QJ
 
@@ -372,6 +564,19 @@ def recover_pub_key_(
     hf_len = hf().digest_size
     msg_hash = bytes_from_octets(msg_hash, hf_len)
 
+    # libsecp256k1 recovery id: the y_K parity, with x_K = r
+    if (
+        key_id in (0, 1)
+        and sig.ec == secp256k1
+        and hf is sha256
+        and libsecp256k1.is_enabled()
+        and not (lower_s and sig.s > sig.ec.n / 2)
+    ):
+        Q = libsecp256k1.dsa_recover_pub_key_(key_id, msg_hash, sig.r, sig.s)
+        # if recovery failed, the pure Python implementation raises the error
+        if Q is not None:
+            return Q
+
     c = challenge_(msg_hash, sig.ec, hf)  # 1.5
 
     QJ = _recover_pub_key_(key_id, c, sig.r, sig.s, lower_s, sig.ec)
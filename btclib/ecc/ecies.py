@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Elliptic Curve Integrated Encryption Scheme (ECIES).
+
+ECIES encryption with the XOR encryption scheme, HMAC, and ANSI-X9.63-KDF
+(the primitives of http://www.secg.org/sec1-v2.pdf, section 5.1).
+
+The ciphertext is the compressed SEC encoding of the ephemeral public key,
+followed by the XOR-encrypted message and by the HMAC tag
+of the encrypted message.
+
+This is a btclib-specific format, not interoperable with SEC 1:
+SEC 1 takes the XOR keystream first and the HMAC key after it,
+while here the HMAC key is derived first, followed by the XOR keystream,
+so that the message length does not need to be known in advance and
+file-like objects are processed in chunks.
+"""
+
+import hmac
+from hashlib import sha256
+from io import SEEK_END, BytesIO
+from itertools import islice
+from math import ceil
+from tempfile import SpooledTemporaryFile
+from typing import IO, BinaryIO, Iterator, Optional
+
+from btclib.alias import HashF, Octets
+from btclib.ecc.curve import Curve, secp256k1
+from btclib.ecc.dh import _shared_secret_xs, ansi_x9_63_kdf_stream
+from btclib.ecc.dsa import gen_keys
+from btclib.ecc.sec_point import bytes_from_point, point_from_octets
+from btclib.exceptions import BTClibValueError
+from btclib.to_prv_key import PrvKey, int_from_prv_key
+from btclib.to_pub_key import Key, point_from_key
+from btclib.utils import bytes_from_octets
+
+CHUNK_SIZE = 2 ** 16
+# in-memory limit for the encrypted message of a non-seekable stream
+SPOOL_MAX_SIZE = 2 ** 20
+
+
+class _KeyStream:
+    "XOR keystream and HMAC key from the ANSI-X9.63-KDF keying data."
+
+    def __init__(self, z: bytes, shared_info: Optional[bytes], hf: HashF) -> None:
+        self.hf_size = hf().digest_size
+        self.digests: Iterator[bytes] = ansi_x9_63_kdf_stream(z, hf, shared_info)
+        self.buffer = b""
+        self.mac = hmac.new(self.read(self.hf_size), digestmod=hf)
+
+    def read(self, size: int) -> bytes:
+        missing = size - len(self.buffer)
+        if missing > 0:
+            n_digests = ceil(missing / self.hf_size)
+            self.buffer += b"".join(islice(self.digests, n_digests))
+            if len(self.buffer) < size:
+                # more than 2^32-1 digests of keying data
+                raise BTClibValueError("message too long")  # pragma: no cover
+        result, self.buffer = self.buffer[:size], self.buffer[size:]
+        return result
+
+    def xor(self, data: bytes) -> bytes:
+        key = int.from_bytes(self.read(len(data)), byteorder="big")
+        result = int.from_bytes(data, byteorder="big") ^ key
+        return result.to_bytes(len(data), byteorder="big")
+
+
+def encrypt_stream(
+    pub_key: Key,
+    src: BinaryIO,
+    dst: BinaryIO,
+    shared_info: Optional[bytes] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    "Encrypt the src stream to the public key, writing to the dst stream."
+
+    Q = point_from_key(pub_key, ec)
+    r, R = gen_keys(ec=ec)
+    x = _shared_secret_xs(r, [Q], ec)[0]
+    key_stream = _KeyStream(x.to_bytes(ec.p_size, byteorder="big"), shared_info, hf)
+    dst.write(bytes_from_point(R, ec))
+    chunk = src.read(chunk_size)
+    while chunk:
+        encrypted = key_stream.xor(chunk)
+        key_stream.mac.update(encrypted)
+        dst.write(encrypted)
+        chunk = src.read(chunk_size)
+    dst.write(key_stream.mac.digest())
+
+
+def decrypt_stream(
+    prv_key: PrvKey,
+    src: BinaryIO,
+    dst: BinaryIO,
+    shared_info: Optional[bytes] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """Decrypt the src stream with the private key, writing to the dst stream.
+
+    The HMAC tag is at the end of the src stream and
+    nothing is written to dst before it has been verified:
+    a seekable src is read twice (first authenticated, then decrypted),
+    otherwise the encrypted message is first spooled to a temporary file
+    (kept in memory up to SPOOL_MAX_SIZE bytes).
+    """
+
+    q = int_from_prv_key(prv_key, ec)
+    R = point_from_octets(src.read(ec.p_size + 1), ec)
+    x = _shared_secret_xs(q, [R], ec)[0]
+    key_stream = _KeyStream(x.to_bytes(ec.p_size, byteorder="big"), shared_info, hf)
+    tag_size = key_stream.hf_size
+
+    if src.seekable():
+        start = src.tell()
+        size = src.seek(0, SEEK_END) - start - tag_size
+        if size < 0:
+            raise BTClibValueError("ciphertext too short")
+        src.seek(start + size)
+        tag = src.read(tag_size)
+        src.seek(start)
+        for encrypted in _read_chunks(src, size, chunk_size):
+            key_stream.mac.update(encrypted)
+        if not hmac.compare_digest(key_stream.mac.digest(), tag):
+            raise BTClibValueError("invalid HMAC tag")
+        src.seek(start)
+        for encrypted in _read_chunks(src, size, chunk_size):
+            dst.write(key_stream.xor(encrypted))
+        return
+
+    with SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+        # the last tag_size bytes read are withheld, as they could be the tag
+        buffer = b""
+        chunk = src.read(chunk_size)
+        while chunk:
+            buffer += chunk
+            encrypted, buffer = buffer[:-tag_size], buffer[-tag_size:]
+            key_stream.mac.update(encrypted)
+            spool.write(encrypted)
+            chunk = src.read(chunk_size)
+        if len(buffer) != tag_size:
+            raise BTClibValueError("ciphertext too short")
+        if not hmac.compare_digest(key_stream.mac.digest(), buffer):
+            raise BTClibValueError("invalid HMAC tag")
+        size = spool.tell()
+        spool.seek(0)
+        for encrypted in _read_chunks(spool, size, chunk_size):
+            dst.write(key_stream.xor(encrypted))
+
+
+def _read_chunks(src: IO[bytes], size: int, chunk_size: int) -> Iterator[bytes]:
+    "Yield the next size bytes of src, in chunks of at most chunk_size bytes."
+
+    while size > 0:
+        chunk = src.read(min(chunk_size, size))
+        if not chunk:
+            raise BTClibValueError("ciphertext too short")  # pragma: no cover
+        size -= len(chunk)
+        yield chunk
+
+
+def encrypt(
+    pub_key: Key,
+    msg: Octets,
+    shared_info: Optional[bytes] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+) -> bytes:
+    "Return the encryption of the message to the public key."
+
+    dst = BytesIO()
+    encrypt_stream(pub_key, BytesIO(bytes_from_octets(msg)), dst, shared_info, ec, hf)
+    return dst.getvalue()
+
+
+def decrypt(
+    prv_key: PrvKey,
+    ciphertext: Octets,
+    shared_info: Optional[bytes] = None,
+    ec: Curve = secp256k1,
+    hf: HashF = sha256,
+) -> bytes:
+    "Return the message decrypted with the private key."
+
+    dst = BytesIO()
+    src = BytesIO(bytes_from_octets(ciphertext))
+    decrypt_stream(prv_key, src, dst, shared_info, ec, hf)
+    return dst.getvalue()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Optional libsecp256k1 backend (through the coincurve package).
+
+If coincurve is installed, secp256k1 operations using
+the default sha256 hash function are transparently dispatched
+to the libsecp256k1 C library by
+curve.mult, dsa.sign_, dsa.verify_, dsa.recover_pub_key_,
+ssa.sign_, ssa.verify_, and BIP32 public derivation;
+the pure Python implementation is used for any other curve or
+hash function, or if the backend is not available.
+
+The backend can be switched off and on
+with disable() and enable(), e.g. to force
+the pure Python path for testing purposes.
+
+The functions in this module assume that inputs
+have already been validated by the calling btclib function.
+"""
+
+from importlib.util import find_spec
+from typing import Any, Optional, Tuple
+
+from btclib.alias import Point
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
+
+# coincurve is imported only when first needed, to keep import time low
+_AVAILABLE = find_spec("coincurve") is not None
+
+_ENABLED = _AVAILABLE
+
+
+def is_available() -> bool:
+    "Return True if the libsecp256k1 backend is installed."
+    return _AVAILABLE
+
+
+def is_enabled() -> bool:
+    "Return True if secp256k1 operations are dispatched to libsecp256k1."
+    return _ENABLED
+
+
+def enable() -> None:
+    "Dispatch secp256k1 operations to libsecp256k1."
+
+    if not _AVAILABLE:
+        err_msg = "libsecp256k1 backend not available"  # pragma: no cover
+        raise BTClibRuntimeError(err_msg)  # pragma: no cover
+    global _ENABLED  # pylint: disable=global-statement
+    _ENABLED = True
+
+
+def disable() -> None:
+    "Use the pure Python implementation for secp256k1 operations."
+
+    global _ENABLED  # pylint: disable=global-statement
+    _ENABLED = False
+
+
+def _coincurve() -> Any:
+    import coincurve  # pylint: disable=import-outside-toplevel
+
+    return coincurve
+
+
+def _bytes_from_point(Q: Point) -> bytes:
+    # uncompressed SEC encoding: no square root needed to parse it
+    return b"\x04" + Q[0].to_bytes(32, "big") + Q[1].to_bytes(32, "big")
+
+
+def _point_from_pub_key(pub_key: Any) -> Point:
+    Q = pub_key.format(compressed=False)
+    return int.from_bytes(Q[1:33], "big"), int.from_bytes(Q[33:], "big")
+
+
+def mult(m: int, Q: Optional[Point] = None) -> Point:
+    """Return m*Q (m*G if Q is None).
+
+    m must be in [1, n-1] and Q must be a valid point, not INF.
+    """
+
+    coincurve = _coincurve()
+    m_bytes = m.to_bytes(32, "big")
+    if Q is None:
+        pub_key = coincurve.PublicKey.from_valid_secret(m_bytes)
+    else:
+        pub_key = coincurve.PublicKey(_bytes_from_point(Q)).multiply(m_bytes)
+    return _point_from_pub_key(pub_key)
+
+
+def add_mult_generator(Q: Point, m: int) -> Point:
+    """Return Q + m*G.
+
+    m must be in [1, n-1] and Q must be a valid point, not INF.
+    """
+
+    pub_key = _coincurve().PublicKey(_bytes_from_point(Q))
+    try:
+        pub_key = pub_key.add(m.to_bytes(32, "big"))
+    except ValueError as e:
+        raise BTClibValueError("invalid (INF) key") from e
+    return _point_from_pub_key(pub_key)
+
+
+def dsa_sign_(msg_hash: bytes, q: int) -> Tuple[int, int]:
+    """Return the (r, s) ECDSA signature of the 32 bytes msg_hash.
+
+    The RFC6979 deterministic nonce and
+    the low-s canonical form are used.
+    """
+
+    prv_key = _coincurve().PrivateKey(q.to_bytes(32, "big"))
+    sig = prv_key.sign_recoverable(msg_hash, hasher=None)
+    return int.from_bytes(sig[:32], "big"), int.from_bytes(sig[32:64], "big")
+
+
+def dsa_verify_(msg_hash: bytes, Q: Point, r: int, s: int) -> bool:
+    """Return True if (r, s) is a valid ECDSA signature for msg_hash.
+
+    s must be in its low-s canonical form.
+    """
+
+    # minimal DER encoding of the (r, s) signature
+    r_bytes = r.to_bytes(r.bit_length() // 8 + 1, "big")
+    s_bytes = s.to_bytes(s.bit_length() // 8 + 1, "big")
+    der_sig = b"\x02" + len(r_bytes).to_bytes(1, "big") + r_bytes
+    der_sig += b"\x02" + len(s_bytes).to_bytes(1, "big") + s_bytes
+    der_sig = b"\x30" + len(der_sig).to_bytes(1, "big") + der_sig
+    pub_key = _coincurve().PublicKey(_bytes_from_point(Q))
+    return pub_key.verify(der_sig, msg_hash, hasher=None)
+
+
+def dsa_recover_pub_key_(
+    key_id: int, msg_hash: bytes, r: int, s: int
+) -> Optional[Point]:
+    """Return the public key recovered from the ECDSA signature.
+
+    key_id must be in [0, 3]; None is returned if recovery fails.
+    """
+
+    PublicKey = _coincurve().PublicKey
+    sig = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([key_id])
+    try:
+        pub_key = PublicKey.from_signature_and_message(sig, msg_hash, hasher=None)
+    except Exception:  # pylint: disable=broad-except
+        return None
+    return _point_from_pub_key(pub_key)
+
+
+def ssa_sign_(msg_hash: bytes, q: int, aux: bytes) -> Tuple[int, int]:
+    "Return the (r, s) BIP340 signature of the 32 bytes msg_hash."
+
+    prv_key = _coincurve().PrivateKey(q.to_bytes(32, "big"))
+    sig = prv_key.sign_schnorr(msg_hash, aux)
+    return int.from_bytes(sig[:32], "big"), int.from_bytes(sig[32:], "big")
+
+
+def ssa_verify_(msg_hash: bytes, x_Q: int, r: int, s: int) -> bool:
+    "Return True if (r, s) is a valid BIP340 signature for msg_hash."
+
+    pub_key = _coincurve().PublicKeyXOnly(x_Q.to_bytes(32, "big"))
+    sig = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+    return pub_key.verify(sig, msg_hash)
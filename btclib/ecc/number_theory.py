@@ -19,10 +19,14 @@ with the following modifications:
 * type annotated python3
 * minor improvements
 * added extensive unit test
+
+Modular inversions and exponentiations use
+the default arithmetic backend (see btclib.ecc.arithmetic).
 """
 
-from typing import Tuple
+from typing import List, Sequence, Tuple
 
+from btclib.ecc.arithmetic import get_arithmetic
 from btclib.exceptions import BTClibValueError
 from btclib.utils import hex_string
 
@@ -45,14 +49,16 @@ def xgcd(a: int, b: int) -> Tuple[int, int, int]:
 def mod_inv(a: int, m: int) -> int:
     """Return the inverse of a (mod m). m does not have to be a prime.
 
-    Based on Extended Euclidean Algorithm, see:
+    Based on Extended Euclidean Algorithm
+    (GMP mpz_invert for the gmpy2 arithmetic backend), see:
     https://en.wikibooks.org/wiki/Algorithm_Implementation/Mathematics/Extended_Euclidean_algorithm
     """
 
-    a %= m
-    g, x, _ = xgcd(a, m)
-    if g == 1:
-        return x % m
+    a = int(a % m)
+    try:
+        return get_arithmetic().invert(a, m)
+    except ZeroDivisionError:
+        pass
     err_msg = "No inverse for "
     err_msg += f"{hex_string(a)}" if a > 0xFFFFFFFF else f"{a}"
     err_msg += " mod "
@@ -60,6 +66,38 @@ def mod_inv(a: int, m: int) -> int:
     raise BTClibValueError(err_msg)
 
 
+def batch_mod_inv(a: Sequence[int], m: int) -> List[int]:
+    """Return the inverses (mod m) of all the elements of a.
+
+    It uses Montgomery's trick: a single modular inversion
+    (of the product of all the elements) plus 3*(len(a)-1)
+    modular multiplications.
+    """
+
+    if not a:
+        return []
+
+    # prefix products: prod[i] = a[0] * ... * a[i] (mod m)
+    prod = [a[0] % m]
+    for x in a[1:]:
+        prod.append(prod[-1] * x % m)
+
+    try:
+        inv = mod_inv(prod[-1], m)
+    except BTClibValueError:
+        # raise the error for the first element without inverse
+        for x in a:
+            mod_inv(x, m)
+        raise  # pragma: no cover
+
+    result = [0] * len(a)
+    for i in range(len(a) - 1, 0, -1):
+        result[i] = inv * prod[i - 1] % m
+        inv = inv * a[i] % m
+    result[0] = inv
+    return result
+
+
 def legendre_symbol(a: int, p: int) -> int:
     """Compute the Legendre symbol a|p using Euler's criterion.
 
@@ -70,8 +108,7 @@ def legendre_symbol(a: int, p: int) -> int:
     https://codereview.stackexchange.com/questions/43210/tonelli-shanks-algorithm-implementation-of-prime-modular-square-root/43267
     """
 
-    ls = pow(a, p >> 1, p)
-    return -1 if ls == p - 1 else ls
+    return get_arithmetic().legendre(a, p)
 
 
 def mod_sqrt(a: int, p: int) -> int:
@@ -89,17 +126,18 @@ def mod_sqrt(a: int, p: int) -> int:
     """
 
     a %= p
+    powmod = get_arithmetic().powmod
 
     if p % 4 == 3:  # secp256k1 case
         # inverse candidate is pow(a, (p + 1) // 4, p)
-        r = pow(a, (p >> 2) + 1, p)
+        r = powmod(a, (p >> 2) + 1, p)
     elif p % 8 == 5:
         # inverse candidate is pow(a, (p + 3) // 8, p)
-        r = pow(a, (p >> 3) + 1, p)
+        r = powmod(a, (p >> 3) + 1, p)
         if r * r % p == a:
             return r
         # another inverse candidate
-        r = r * pow(2, p >> 2, p) % p
+        r = r * powmod(2, p >> 2, p) % p
     else:
         return tonelli(a, p)
 
@@ -123,6 +161,7 @@ def tonelli(a: int, p: int) -> int:
     a %= p
     if a == 0 or p == 2:
         return a
+    powmod = get_arithmetic().powmod
 
     # Check solution existence for an odd prime p
     if legendre_symbol(a, p) != 1:
@@ -138,15 +177,15 @@ def tonelli(a: int, p: int) -> int:
         s += 1
         q >>= 1
     if s == 1:
-        return pow(a, (p + 1) // 4, p)
+        return powmod(a, (p + 1) // 4, p)
 
     # Select a z which is a quadratic non residue modulo p
     z = 1
     while legendre_symbol(z, p) != -1:
         z += 1
-    c = pow(z, q, p)
-    r = pow(a, (q + 1) // 2, p)
-    t = pow(a, q, p)
+    c = powmod(z, q, p)
+    r = powmod(a, (q + 1) // 2, p)
+    t = powmod(a, q, p)
     while t != 1:
         # Find the lowest i such that t^(2^i) = 1
         t2i = t
@@ -154,7 +193,7 @@ def tonelli(a: int, p: int) -> int:
             t2i = t2i * t2i % p
             if t2i == 1:
                 # Update next value to iterate
-                b = pow(c, 1 << (s - i - 1), p)
+                b = powmod(c, 1 << (s - i - 1), p)
                 r = (r * b) % p
                 c = (b * b) % p
                 t = (t * c) % p
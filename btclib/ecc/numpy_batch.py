@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Experimental NumPy batched arithmetic for secp256k1.
+
+Bulk jobs (e.g. the multi scalar multiplications of batch verification)
+perform the same field operations on thousands of independent points:
+here a batch of N field elements is a NumPy uint64 array
+with shape (10, N), i.e. ten 26-bit limbs for each element,
+and each field operation is vectorized over the batch,
+amortizing the interpreter overhead.
+
+Limbs are kept weakly normalized (less than 2^27, value not reduced):
+limb products and their sums fit into uint64 without overflow,
+while the secp256k1 prime p = 2^256 - 2^32 - 977
+allows for a cheap reduction (2^260 = 2^36 + 15632 mod p).
+
+A batch of Jacobian points is a (X, Y, Z) tuple of field batches;
+add_jac and double_jac are their vectorized group operations.
+The batch engine is used by the variable time curve.multi_mult
+for secp256k1 batches of at least NUMPY_MIN_SIZE elements,
+if the optional numpy package is installed and the engine is enabled.
+
+The batch engine is not constant time
+(e.g. add_jac checks for doublings in the batch):
+it must be used with public data only.
+In particular, it is not used by curve.mult_batch,
+whose scalars are usually private keys.
+"""
+
+from importlib.util import find_spec
+from typing import Any, Dict, List, Sequence, Tuple
+
+from btclib.alias import INFJ, JacPoint
+from btclib.ecc.curve_group import CurveGroup, cached_multiples_fixwind
+from btclib.ecc.curve_group_2 import _signed_digits
+from btclib.ecc.table_cache import table_cache
+from btclib.exceptions import BTClibRuntimeError
+
+# numpy is imported only when first needed, to keep import time low
+_AVAILABLE = find_spec("numpy") is not None
+
+# the batch engine is experimental: it is not enabled by default
+_ENABLED = False
+
+# minimum batch size for curve.multi_mult
+NUMPY_MIN_SIZE = 256
+
+Array = Any  # numpy.ndarray with shape (10, N) and uint64 dtype
+JacBatch = Tuple[Array, Array, Array]
+
+P = 2 ** 256 - 2 ** 32 - 977
+LIMBS = 10
+LIMB_BITS = 26
+
+
+def is_available() -> bool:
+    "Return True if the numpy package is installed."
+    return _AVAILABLE
+
+
+def is_enabled() -> bool:
+    "Return True if secp256k1 batches are dispatched to the numpy engine."
+    return _ENABLED
+
+
+def enable() -> None:
+    "Dispatch large secp256k1 batches to the numpy engine."
+
+    if not _AVAILABLE:
+        err_msg = "numpy batch engine not available"  # pragma: no cover
+        raise BTClibRuntimeError(err_msg)  # pragma: no cover
+    global _ENABLED  # pylint: disable=global-statement
+    _ENABLED = True
+
+
+def disable() -> None:
+    "Use the Python int implementation for secp256k1 batches."
+
+    global _ENABLED  # pylint: disable=global-statement
+    _ENABLED = False
+
+
+def supports(ec: CurveGroup) -> bool:
+    "Return True if the numpy engine supports the curve group."
+    return ec.p == P and ec.a == 0
+
+
+_CONSTANTS: Dict[str, Any] = {}
+
+
+def _np() -> Any:
+    "Return the numpy module, initializing the engine constants."
+
+    if not _CONSTANTS:
+        import numpy  # pylint: disable=import-outside-toplevel
+
+        u64 = numpy.uint64
+        # the top limb is reduced to 22 bits, as 2^256 = 2^32 + 977 mod p
+        shifts = [LIMB_BITS] * (LIMBS - 1) + [22]
+        _CONSTANTS["shifts"] = numpy.array(shifts, u64).reshape(LIMBS, 1)
+        masks = [(1 << s) - 1 for s in shifts]
+        _CONSTANTS["masks"] = numpy.array(masks, u64).reshape(LIMBS, 1)
+        # a multiple of p with all limbs in [2^27, 2^30):
+        # adding it before subtracting a weakly normalized element
+        # prevents any limb underflow
+        value = 128 * P
+        limbs = [value >> (LIMB_BITS * i) & (1 << LIMB_BITS) - 1 for i in range(9)]
+        limbs.append(value >> (LIMB_BITS * 9))
+        for i in range(LIMBS - 1):
+            limbs[i] += 1 << 28
+            limbs[i + 1] -= 1 << 2
+        assert all(1 << 27 <= limb < 1 << 30 for limb in limbs)
+        _CONSTANTS["neg"] = numpy.array(limbs, u64).reshape(LIMBS, 1)
+        p_limbs = [P >> (LIMB_BITS * i) & (1 << s) - 1 for i, s in enumerate(shifts)]
+        _CONSTANTS["p"] = numpy.array(p_limbs, u64).reshape(LIMBS, 1)
+        _CONSTANTS["numpy"] = numpy
+    return _CONSTANTS["numpy"]
+
+
+def from_ints(ints: Sequence[int]) -> Array:
+    "Return the field batch of the integers."
+
+    np = _np()
+    values = np.array([int(i) % P for i in ints], dtype=object)
+    mask = (1 << LIMB_BITS) - 1
+    limbs = [(values >> (LIMB_BITS * i)) & mask for i in range(LIMBS)]
+    return np.array(limbs, dtype=np.uint64).reshape(LIMBS, len(ints))
+
+
+def to_ints(a: Array) -> List[int]:
+    "Return the field batch as list of integers in [0, p)."
+
+    np = _np()
+    values = np.zeros(a.shape[1], dtype=object)
+    for i in range(LIMBS - 1, -1, -1):
+        values = (values << LIMB_BITS) + a[i].astype(object)
+    return [int(v) % P for v in values]
+
+
+def _carry(x: Array) -> Array:
+    "Propagate (in place) the limb carries in parallel, once."
+
+    c = x >> _CONSTANTS["shifts"]
+    x &= _CONSTANTS["masks"]
+    x[1:] += c[:-1]
+    x[0] += c[-1] * 977
+    x[1] += c[-1] << 6
+    return x
+
+
+def add(a: Array, b: Array) -> Array:
+    "Return the field batch a + b."
+    return _carry(a + b)
+
+
+def sub(a: Array, b: Array) -> Array:
+    "Return the field batch a - b."
+    return _carry(a + _CONSTANTS["neg"] - b)
+
+
+def mul_small(a: Array, k: int) -> Array:
+    "Return the field batch multiplied by a small (less than 16) integer."
+    return _carry(a * _CONSTANTS["numpy"].uint64(k))
+
+
+def _reduce(t: Array) -> Array:
+    "Return the weakly normalized field batch of a 19-limb product."
+
+    # limbs are less than 2^58: two parallel carry rounds (without folding)
+    # make them less than 2^27, except for the top one
+    for _ in range(2):
+        c = t[:-1] >> LIMB_BITS
+        t[:-1] &= (1 << LIMB_BITS) - 1
+        t[1:] += c
+    # fold the limbs above 2^260, as 2^260 = 2^36 + 15632 mod p
+    hi = t[LIMBS:]
+    lo = t[:LIMBS] + hi * 15632
+    lo[1:] += hi[:-1] << 10
+    top = hi[-1] << 10
+    lo[0] += top * 15632
+    lo[1] += top << 10
+    return _carry(_carry(lo))
+
+
+def mul(a: Array, b: Array) -> Array:
+    "Return the field batch a * b."
+
+    np = _CONSTANTS["numpy"]
+    t = np.zeros((2 * LIMBS, a.shape[1]), dtype=np.uint64)
+    for i in range(LIMBS):
+        t[i : i + LIMBS] += a[i] * b
+    return _reduce(t)
+
+
+def sqr(a: Array) -> Array:
+    "Return the field batch a * a, exploiting the symmetric limb products."
+
+    np = _CONSTANTS["numpy"]
+    t = np.zeros((2 * LIMBS, a.shape[1]), dtype=np.uint64)
+    a2 = a << 1
+    for i in range(LIMBS):
+        t[2 * i] += a[i] * a[i]
+        t[2 * i + 1 : i + LIMBS] += a[i] * a2[i + 1 :]
+    return _reduce(t)
+
+
+def is_zero(a: Array) -> Array:
+    "Return the boolean array of the elements equal to zero (mod p)."
+
+    x = _carry(_carry(a.copy()))
+    # two sequential carry passes (with folding above 2^256)
+    # make the value fully normalized, i.e. in [0, 2^256)
+    for _ in range(2):
+        for i in range(LIMBS - 1):
+            x[i + 1] += x[i] >> LIMB_BITS
+            x[i] &= (1 << LIMB_BITS) - 1
+        top = x[-1] >> 22
+        x[-1] &= (1 << 22) - 1
+        x[0] += top * 977
+        x[1] += top << 6
+    for i in range(LIMBS - 1):
+        x[i + 1] += x[i] >> LIMB_BITS
+        x[i] &= (1 << LIMB_BITS) - 1
+    # as 2^256 < 2p, the only multiples of p are 0 and p
+    return ~x.any(axis=0) | (x == _CONSTANTS["p"]).all(axis=0)
+
+
+def select(mask: Array, a: JacBatch, b: JacBatch) -> JacBatch:
+    "Return the points of a where mask is True, the points of b elsewhere."
+
+    where = _CONSTANTS["numpy"].where
+    return where(mask, a[0], b[0]), where(mask, a[1], b[1]), where(mask, a[2], b[2])
+
+
+def batch_from_jac(points: Sequence[JacPoint]) -> JacBatch:
+    "Return the batch of Jacobian points."
+
+    X = from_ints([Q[0] for Q in points])
+    Y = from_ints([Q[1] for Q in points])
+    Z = from_ints([Q[2] for Q in points])
+    return X, Y, Z
+
+
+def jac_from_batch(QB: JacBatch) -> List[JacPoint]:
+    "Return the list of Jacobian points (with INFJ as infinity point)."
+
+    points = zip(to_ints(QB[0]), to_ints(QB[1]), to_ints(QB[2]))
+    return [INFJ if Z == 0 else (X, Y, Z) for X, Y, Z in points]
+
+
+def double_jac(Q: JacBatch) -> JacBatch:
+    "Return the doubled points of the batch (secp256k1, i.e. a=0)."
+
+    X, Y, Z = Q
+    YY = sqr(Y)
+    W = mul_small(sqr(X), 3)
+    V = mul_small(mul(X, YY), 4)
+    X3 = sub(sqr(W), add(V, V))
+    Y3 = sub(mul(W, sub(V, X3)), mul_small(sqr(YY), 8))
+    Z3 = mul_small(mul(Y, Z), 2)
+    return X3, Y3, Z3
+
+
+def add_jac(Q: JacBatch, R: JacBatch) -> JacBatch:
+    "Return the pairwise sums of the points of the two batches."
+
+    np = _CONSTANTS["numpy"]
+    X1, Y1, Z1 = Q
+    X2, Y2, Z2 = R
+    Z1Z1 = sqr(Z1)
+    Z2Z2 = sqr(Z2)
+    U1 = mul(X1, Z2Z2)
+    S1 = mul(Y1, mul(Z2, Z2Z2))
+    H = sub(mul(X2, Z1Z1), U1)
+    r = sub(mul(Y2, mul(Z1, Z1Z1)), S1)
+    HH = sqr(H)
+    HHH = mul(H, HH)
+    V = mul(U1, HH)
+    X3 = sub(sub(sqr(r), HHH), add(V, V))
+    Y3 = sub(mul(r, sub(V, X3)), mul(S1, HHH))
+    Z3 = mul(H, mul(Z1, Z2))
+    R3 = X3, Y3, Z3
+
+    # exceptional cases: a single zero test for all the elements
+    n = Z1.shape[1]
+    zero = is_zero(np.concatenate((Z1, Z2, H, r), axis=1))
+    inf1, inf2 = zero[:n], zero[n : 2 * n]
+    doubling = zero[2 * n : 3 * n] & zero[3 * n :] & ~inf1 & ~inf2
+    if doubling.any():
+        R3 = select(doubling, double_jac(Q), R3)
+    return select(inf1, R, select(inf2, Q, R3))
+
+
+def _sum_tree(QB: JacBatch) -> JacBatch:
+    """Return the sums of the points along the last batch axis.
+
+    The batch coordinates have shape (10, G, K):
+    the K points of each of the G groups are summed pairwise,
+    halving K at each round.
+    """
+
+    np = _CONSTANTS["numpy"]
+    while QB[0].shape[-1] > 1:
+        if QB[0].shape[-1] % 2:
+            # zero coordinates, i.e. INF
+            pad = [(0, 0), (0, 0), (0, 1)]
+            QB = np.pad(QB[0], pad), np.pad(QB[1], pad), np.pad(QB[2], pad)
+        shape = QB[0].shape[0], QB[0].shape[1], QB[0].shape[2] // 2
+        Q = tuple(C[:, :, 0::2].reshape(LIMBS, -1) for C in QB)
+        R = tuple(C[:, :, 1::2].reshape(LIMBS, -1) for C in QB)
+        S = add_jac(Q, R)  # type: ignore
+        QB = S[0].reshape(shape), S[1].reshape(shape), S[2].reshape(shape)
+    return QB[0][:, :, 0], QB[1][:, :, 0], QB[2][:, :, 0]
+
+
+def _window(size: int, nbits: int) -> int:
+    """Return the Pippenger window size for the numpy engine.
+
+    Besides the ceil((nbits+1)/c) * size bucket additions,
+    the c-bit double-and-add of the 2^(c-1) buckets of each window
+    is taken into account.
+    """
+    costs = [
+        (-(-(nbits + 1) // c) * (size + c * 2 ** (c - 1)), c) for c in range(2, 17)
+    ]
+    return min(costs)[1]
+
+
+@table_cache(max_entries=4)
+def _batch_table(Q: JacPoint, ec: CurveGroup, w: int) -> List[JacBatch]:
+    "Return the cached_multiples_fixwind table rows as batches."
+
+    return [batch_from_jac(row) for row in cached_multiples_fixwind(Q, ec, w)]
+
+
+def mult_batch(ms: Sequence[int], Q: JacPoint, ec: CurveGroup, w: int) -> JacBatch:
+    """Return the batch of the m*Q fixed-window multiplications.
+
+    The rows of the cached_multiples_fixwind table of Q
+    are added at once to the whole batch of partial results.
+
+    The m coefficients are assumed to have been reduced mod n.
+    It is not constant time: the m coefficients must not be secret.
+    """
+
+    np = _np()
+    mask = 2 ** w - 1
+    R = batch_from_jac([INFJ] * len(ms))
+    for k, (X, Y, Z) in enumerate(_batch_table(Q, ec, w)):
+        idx = np.array([m >> (w * k) & mask for m in ms])
+        if idx.any():
+            R = add_jac(R, (X[:, idx], Y[:, idx], Z[:, idx]))
+    return R
+
+
+def multi_mult(
+    scalars: Sequence[int], jac_points: Sequence[JacPoint], ec: CurveGroup
+) -> JacPoint:
+    """Return the multi scalar multiplication u1*Q1 + ... + un*Qn.
+
+    Pippenger's bucket method, with signed c-bit digits:
+    the buckets of all the windows are accumulated in parallel,
+    adding (at most) a point to each bucket at every round;
+    then each bucket is multiplied by its digit (double-and-add)
+    and the buckets of each window are summed pairwise.
+    Only the final combination of the windows
+    is performed with Python int arithmetic.
+
+    To balance the rounds, crowded buckets are split in more lanes,
+    i.e. partial buckets with the same digit.
+
+    The input points are assumed to be on curve,
+    the scalar coefficients are assumed to have been reduced mod n.
+    """
+
+    np = _np()
+    n = len(jac_points)
+    nbits = max(scalars, default=0).bit_length()
+    if nbits == 0:
+        return INFJ
+    c = _window(n, nbits)
+    n_digits = nbits // c + 1
+    n_buckets = 2 ** (c - 1)
+
+    # bucket k*n_buckets + |d|-1 gets the points whose k-th digit is d:
+    # indexes of the points, of the negated points (plus n),
+    # and of the INF point (2n)
+    buckets: List[List[int]] = [[] for _ in range(n_digits * n_buckets)]
+    for i, m in enumerate(scalars):
+        for k, d in enumerate(_signed_digits(m, c, n_digits)):
+            if d > 0:
+                buckets[k * n_buckets + d - 1].append(i)
+            elif d < 0:
+                buckets[k * n_buckets - d - 1].append(i + n)
+    X, Y, Z = batch_from_jac(list(jac_points) + [INFJ])
+    negY = sub(np.zeros_like(Y[:, :n]), Y[:, :n])
+    X = np.concatenate((X[:, :n], X), axis=1)
+    Y = np.concatenate((Y[:, :n], negY, Y[:, n:]), axis=1)
+    Z = np.concatenate((Z[:, :n], Z), axis=1)
+
+    # lanes of at most 'rounds' points, the same number for each window
+    rounds = -(-n // n_buckets)
+    lanes: List[List[Tuple[int, List[int]]]] = [[] for _ in range(n_digits)]
+    for j, bucket in enumerate(buckets):
+        k, d = divmod(j, n_buckets)
+        for start in range(0, len(bucket), rounds):
+            lanes[k].append((d + 1, bucket[start : start + rounds]))
+    width = max(len(window_lanes) for window_lanes in lanes)
+    flat = [lane for w in lanes for lane in w + [(1, [])] * (width - len(w))]
+
+    B = batch_from_jac([INFJ] * len(flat))
+    for r in range(rounds):
+        idx = np.array([pts[r] if r < len(pts) else 2 * n for _, pts in flat])
+        B = add_jac(B, (X[:, idx], Y[:, idx], Z[:, idx]))
+
+    # lane digits, by double-and-add
+    digits = np.array([d for d, _ in flat])
+    W = batch_from_jac([INFJ] * len(flat))
+    for bit in range(c - 1, -1, -1):
+        W = double_jac(W)
+        W = select((digits >> bit) & 1 == 1, add_jac(W, B), W)
+
+    WB = tuple(C.reshape(LIMBS, n_digits, width) for C in W)
+    windows = jac_from_batch(_sum_tree(WB))  # type: ignore
+
+    R = INFJ
+    for S in reversed(windows):
+        if R[2] != 0:
+            for _ in range(c):
+                R = ec.double_jac(R)
+        R = ec.add_jac_vartime(R, S)
+    return R
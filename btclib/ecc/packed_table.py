@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Compact packed fixed-window tables, storable in memory-mapped files.
+
+The fixed-window tables of cached_multiples_fixwind
+(used for the curve generator G and for registered public keys)
+are lists of rows of Jacobian points, i.e. tuples of Python int:
+a 256-bit curve table takes hundreds of KB
+and it must be rebuilt by every process.
+
+A PackedTable stores the same (affine-normalized) points
+as fixed-width little-endian coordinates in a single buffer,
+about 64 bytes per point for a 256-bit curve;
+the INF point is encoded with x_Q = p, an invalid field element.
+
+save_table writes the packed table of a point to file,
+while load_table memory-maps it (read-only) and
+pins it in the cached_multiples_fixwind cache:
+many processes loading the same file share the same memory pages.
+"""
+
+import mmap
+from hashlib import sha256
+from typing import Any, Iterator, List, Optional, Sequence, Union, overload
+
+from btclib.alias import INFJ, JacPoint, Point
+from btclib.ecc.curve import FIXED_BASE_W, Curve, secp256k1
+from btclib.ecc.curve_group import cached_multiples_fixwind, jac_from_aff
+from btclib.exceptions import BTClibValueError
+
+_MAGIC = b"BTCLIBPT"
+# magic, 1-byte w, 2-byte coordinate size, 4-byte rows,
+# 32-byte table id, 32-byte table content digest
+_HEADER_SIZE = len(_MAGIC) + 1 + 2 + 4 + 32 + 32
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+class PackedRow(Sequence[JacPoint]):
+    "A row of a PackedTable: its points are unpacked on access."
+
+    __slots__ = ("_buffer", "_offset", "_p", "_p_size", "_size", "_element")
+
+    def __init__(self, buffer: Buffer, offset: int, size: int, ec: Curve) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._size = size
+        self._p = ec.p
+        self._p_size = ec.p_size
+        # points are unpacked as the curve backend integers
+        self._element = ec._arithmetic.element
+
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, i: int) -> JacPoint:
+        ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[JacPoint]:
+        ...
+
+    def __getitem__(self, i: Union[int, slice]) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(f"invalid point index: {i}")
+        p_size = self._p_size
+        start = self._offset + 2 * p_size * i
+        x = int.from_bytes(self._buffer[start : start + p_size], "little")
+        if x == self._p:
+            return INFJ
+        start += p_size
+        y = int.from_bytes(self._buffer[start : start + p_size], "little")
+        return self._element(x), self._element(y), 1
+
+    def __iter__(self) -> Iterator[JacPoint]:
+        return (self[i] for i in range(self._size))
+
+
+class PackedTable(Sequence[PackedRow]):
+    """Packed fixed-window table of Jacobian points.
+
+    It can be indexed as the list of lists of points
+    returned by cached_multiples_fixwind, i.e. T[row][column].
+    """
+
+    def __init__(self, buffer: Buffer, ec: Curve, w: int) -> None:
+
+        self.w = w
+        self.p_size = ec.p_size
+        row_size = 2 * ec.p_size * 2 ** w
+        if len(buffer) % row_size:
+            err_msg = f"invalid packed table size: {len(buffer)}"
+            raise BTClibValueError(err_msg)
+        self._buffer = buffer
+        self._p = ec.p
+        self._row_size = row_size
+        self._rows = [
+            PackedRow(buffer, i, 2 ** w, ec) for i in range(0, len(buffer), row_size)
+        ]
+
+    @classmethod
+    def from_table(
+        cls, table: Sequence[Sequence[JacPoint]], ec: Curve, w: int
+    ) -> "PackedTable":
+        "Return the packed table of affine-normalized Jacobian points."
+
+        p_size = ec.p_size
+        inf = ec.p.to_bytes(p_size, "little") + b"\x00" * p_size
+        points: List[JacPoint] = [P for row in table for P in row]
+        buffer = bytearray()
+        for P in ec.normalize_jac_batch(points):
+            if P[2] == 0:
+                buffer += inf
+            else:
+                buffer += int(P[0]).to_bytes(p_size, "little")
+                buffer += int(P[1]).to_bytes(p_size, "little")
+        return cls(bytes(buffer), ec, w)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @overload
+    def __getitem__(self, k: int) -> PackedRow:
+        ...
+
+    @overload
+    def __getitem__(self, k: slice) -> List[PackedRow]:
+        ...
+
+    def __getitem__(self, k: Union[int, slice]) -> Any:
+        return self._rows[k]
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + len(self._buffer)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self._buffer)
+
+
+def _table_id(Q: Point, ec: Curve, w: int) -> bytes:
+    "Return the hash identifying the curve, the point, and the window size."
+
+    ints = [ec.p, ec.a, ec.b, ec.G[0], ec.G[1], ec.n, Q[0], Q[1], w]
+    return sha256(" ".join(hex(int(i)) for i in ints).encode()).digest()
+
+
+def packed_table(Q: Point, ec: Curve = secp256k1) -> PackedTable:
+    "Return the packed fixed-window table of Q."
+
+    ec.require_on_curve(Q)
+    if Q[1] == 0:
+        raise BTClibValueError("INF point has no table")
+    w = FIXED_BASE_W
+    T = cached_multiples_fixwind(jac_from_aff(Q), ec, w)
+    return T if isinstance(T, PackedTable) else PackedTable.from_table(T, ec, w)
+
+
+def save_table(filename: str, Q: Optional[Point] = None, ec: Curve = secp256k1) -> None:
+    "Save to file the packed fixed-window table of Q (G if None)."
+
+    Q = ec.G if Q is None else Q
+    packed = packed_table(Q, ec)
+    w = FIXED_BASE_W
+    with open(filename, "wb") as file_:
+        file_.write(_MAGIC)
+        file_.write(w.to_bytes(1, "little"))
+        file_.write(ec.p_size.to_bytes(2, "little"))
+        file_.write(len(packed).to_bytes(4, "little"))
+        file_.write(_table_id(Q, ec, w))
+        content = packed.to_bytes()
+        file_.write(sha256(content).digest())
+        file_.write(content)
+
+
+def load_table(
+    filename: str, Q: Optional[Point] = None, ec: Curve = secp256k1
+) -> PackedTable:
+    """Load the memory-mapped packed table of Q (G if None).
+
+    The table is pinned in the cached_multiples_fixwind cache,
+    i.e. it is used by mult, the verification functions, etc.:
+    its size and content digest are checked,
+    as a corrupted table would silently give wrong results.
+    """
+
+    Q = ec.G if Q is None else Q
+    w = FIXED_BASE_W
+    with open(filename, "rb") as file_:
+        buffer: Any = mmap.mmap(file_.fileno(), 0, access=mmap.ACCESS_READ)
+
+    header = buffer[:_HEADER_SIZE]
+    if header[: len(_MAGIC)] != _MAGIC:
+        raise BTClibValueError(f"not a packed table file: {filename}")
+    start = len(_MAGIC) + 7
+    if header[start : start + 32] != _table_id(Q, ec, w):
+        raise BTClibValueError("packed table of another point, curve, or window")
+    rows = int.from_bytes(header[len(_MAGIC) + 3 : start], "little")
+    if rows != (ec.p_size * 8) // w + 1:
+        raise BTClibValueError(f"invalid number of rows: {rows}")
+    size = _HEADER_SIZE + rows * 2 * ec.p_size * 2 ** w
+    if len(buffer) != size:
+        raise BTClibValueError(f"invalid packed table size: {len(buffer)}")
+    content = memoryview(buffer)[_HEADER_SIZE:]
+    if sha256(content).digest() != header[start + 32 :]:
+        raise BTClibValueError("corrupted packed table")
+
+    table = PackedTable(content, ec, w)
+    cached_multiples_fixwind.put(table, jac_from_aff(Q), ec, w, pin=True)
+    return table
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Signature verification in a pool of worker processes.
+
+verify_jobs takes an iterable of (msg_hash, key, sig) jobs
+(msg, address, sig for bms), splits it in chunks of chunk_size jobs,
+and verifies the chunks in a concurrent.futures ProcessPoolExecutor,
+yielding a bool for each job, in the same order as the jobs.
+
+The jobs are consumed lazily:
+at most two chunks per worker are in flight at the same time.
+BIP340 (ssa) chunks are verified in a single batch
+(see ssa.batch_invalid_indices_), as bms chunks are,
+their recovery flags being the key_id hints of dsa.batch_verify_
+(see bms.batch_verify); a failing bms batch is verified one at a time.
+ECDSA (dsa) signatures are verified one at a time:
+the dsa jobs carry no recovery hints, without which
+dsa.batch_verify_ would verify them one at a time anyway.
+
+Precomputed tables can be shared with the workers
+using the btclib.ecc.shared_tables initializer:
+
+    with SharedTables(pub_keys) as tables:
+        results = verify_jobs("dsa", jobs, initializer=attach_tables,
+                              initargs=tables.initargs)
+        for result in results:
+            ...
+
+BatchVerifier serves individual verification requests from asyncio tasks:
+the requests are queued and coalesced in batches
+(at most max_batch_size jobs, waiting at most max_wait seconds
+since the first one), verified in an executor without blocking
+the event loop; each request future is resolved with its own result:
+
+    async with BatchVerifier("ssa") as verifier:
+        valid = await verifier.verify(msg_hash, x_Q, sig)
+"""
+
+import asyncio
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from functools import partial
+from hashlib import sha256
+from itertools import islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+from btclib.alias import HashF
+from btclib.ecc import bms, dsa, ssa
+from btclib.exceptions import BTClibValueError
+
+# (msg_hash, key, sig) or, for bms, (msg, address, sig)
+Job = Tuple[Any, Any, Any]
+
+SCHEMES = ("dsa", "ssa", "bms")
+
+CHUNK_SIZE = 256
+
+
+def verify_chunk(
+    scheme: str, jobs: List[Job], lower_s: bool = True, hf: HashF = sha256
+) -> List[bool]:
+    """Return the verification result of each job (in the current process).
+
+    ssa and bms jobs are batch verified;
+    dsa jobs are not, as they have no recovery hints
+    (see dsa.batch_verify_): they are verified one at a time.
+    """
+
+    if scheme == "ssa":
+        m_hashes, keys, sigs = zip(*jobs) if jobs else ((), (), ())
+        try:
+            invalid = set(ssa.batch_invalid_indices_(m_hashes, keys, sigs, hf))
+        except Exception:  # pylint: disable=broad-except
+            # e.g. signatures on different curves
+            return [ssa.verify_(m, key, sig, hf) for m, key, sig in jobs]
+        return [i not in invalid for i in range(len(jobs))]
+    if scheme == "dsa":
+        return [dsa.verify_(m, key, sig, lower_s, hf) for m, key, sig in jobs]
+    if scheme == "bms":
+        msgs, addrs, bms_sigs = zip(*jobs) if jobs else ((), (), ())
+        if jobs and bms.batch_verify(msgs, addrs, bms_sigs, lower_s):
+            return [True] * len(jobs)
+        return [bms.verify(msg, addr, sig, lower_s) for msg, addr, sig in jobs]
+    raise BTClibValueError(f"unknown signature scheme: {scheme}")
+
+
+def verify_jobs(
+    scheme: str,
+    jobs: Iterable[Job],
+    chunk_size: int = CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    lower_s: bool = True,
+    hf: HashF = sha256,
+    mp_context: Any = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple[Any, ...] = (),
+) -> Iterator[bool]:
+    """Return an iterator over the verification results of the jobs, in order.
+
+    max_workers defaults to the number of processors;
+    mp_context, initializer, and initargs are passed to
+    the ProcessPoolExecutor.
+    """
+
+    if scheme not in SCHEMES:
+        raise BTClibValueError(f"unknown signature scheme: {scheme}")
+    if chunk_size < 1:
+        raise BTClibValueError(f"invalid chunk size: {chunk_size}")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers < 1:
+        raise BTClibValueError(f"invalid number of workers: {max_workers}")
+
+    verify = partial(verify_chunk, scheme, lower_s=lower_s, hf=hf)
+    pool = ProcessPoolExecutor(max_workers, mp_context, initializer, initargs)
+    return _results(pool, verify, iter(jobs), chunk_size, 2 * max_workers)
+
+
+def _results(
+    pool: ProcessPoolExecutor,
+    verify: Callable[[List[Job]], List[bool]],
+    jobs: Iterator[Job],
+    chunk_size: int,
+    max_pending: int,
+) -> Iterator[bool]:
+
+    with pool:
+        pending: Deque["Future[List[bool]]"] = deque()
+        while True:
+            while len(pending) < max_pending:
+                chunk = list(islice(jobs, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(verify, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+class BatchVerifier:
+    """Asyncio micro-batching signature verifier.
+
+    The batches are verified with verify_chunk in the executor,
+    by default the event loop one (a thread pool);
+    a ProcessPoolExecutor makes use of more processors.
+    """
+
+    def __init__(
+        self,
+        scheme: str,
+        max_batch_size: int = CHUNK_SIZE,
+        max_wait: float = 0.005,
+        executor: Optional[Executor] = None,
+        lower_s: bool = True,
+        hf: HashF = sha256,
+    ) -> None:
+
+        if scheme not in SCHEMES:
+            raise BTClibValueError(f"unknown signature scheme: {scheme}")
+        if max_batch_size < 1:
+            raise BTClibValueError(f"invalid max batch size: {max_batch_size}")
+        if max_wait < 0:
+            raise BTClibValueError(f"invalid max wait: {max_wait}")
+
+        self.scheme = scheme
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.executor = executor
+        self.lower_s = lower_s
+        self.hf = hf
+
+        self._jobs: List[Job] = []
+        self._futures: List["asyncio.Future[bool]"] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set["asyncio.Future[None]"] = set()
+
+    async def verify(self, msg_hash: Any, key: Any, sig: Any) -> bool:
+        "Return the verification result of the job, as part of a batch."
+
+        # the running loop (asyncio.get_running_loop requires Python 3.7)
+        loop = asyncio.get_event_loop()
+        future: "asyncio.Future[bool]" = loop.create_future()
+        self._jobs.append((msg_hash, key, sig))
+        self._futures.append(future)
+        if len(self._jobs) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        "Start the verification of the queued jobs, without waiting."
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._jobs:
+            return
+        jobs, futures = self._jobs, self._futures
+        self._jobs, self._futures = [], []
+        batch = asyncio.ensure_future(self._verify(jobs, futures))
+        self._batches.add(batch)
+        batch.add_done_callback(partial(self._batch_done, futures))
+
+    def _batch_done(
+        self, futures: List["asyncio.Future[bool]"], batch: "asyncio.Future[None]"
+    ) -> None:
+
+        self._batches.discard(batch)
+        # a batch cancelled before starting has not resolved its requests
+        for future in futures:
+            future.cancel()
+
+    async def _verify(
+        self, jobs: List[Job], futures: List["asyncio.Future[bool]"]
+    ) -> None:
+
+        loop = asyncio.get_event_loop()
+        verify = partial(verify_chunk, self.scheme, lower_s=self.lower_s, hf=self.hf)
+        try:
+            results = await loop.run_in_executor(self.executor, verify, jobs)
+        except Exception as e:  # pylint: disable=broad-except
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # e.g. asyncio.CancelledError (not an Exception since Python 3.8):
+            # the requests are cancelled instead of waiting forever
+            for future in futures:
+                future.cancel()
+            raise
+        for future, result in zip(futures, results):
+            # the caller could have cancelled its request
+            if not future.done():
+                future.set_result(result)
+
+    async def aclose(self) -> None:
+        "Verify the queued jobs and wait for all the batches."
+
+        self.flush()
+        while self._batches:
+            await asyncio.gather(*self._batches)
+
+    async def __aenter__(self) -> "BatchVerifier":
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
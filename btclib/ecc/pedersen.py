@@ -30,6 +30,7 @@ It is crucial for H to be Nothing-Up-My-Sleeve (NUMS), i.e.
 the discrete logarithm of H with respect to G must be unknown.
 """
 
+import functools
 from hashlib import sha256
 
 from btclib.alias import HashF, Point
@@ -39,6 +40,7 @@ from btclib.exceptions import BTClibRuntimeError, BTClibValueError
 from btclib.utils import int_from_bits
 
 
+@functools.lru_cache()
 def second_generator(ec: Curve = secp256k1, hf: HashF = sha256) -> Point:
     """Second (with respect to G) elliptic curve generator.
 
@@ -48,6 +50,7 @@ def second_generator(ec: Curve = secp256k1, hf: HashF = sha256) -> Point:
     The hash of G is coerced it to a point (x_H, y_H).
     If the resulting point is not on the curve, keep on
     incrementing x_H until a valid curve point (x_H, y_H) is obtained.
+    The result is cached.
 
     idea:
     https://crypto.stackexchange.com/questions/25581/second-generator-for-secp256k1-curve
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Precomputed tables shared among multiprocessing pool workers.
+
+SharedTables builds in the parent process
+the packed fixed-window tables (see btclib.ecc.packed_table)
+of the curve generator G and of any other point
+(e.g. frequently used public keys, the Pedersen second generator)
+and publishes them in a single multiprocessing.shared_memory block.
+
+Pool workers attach to it zero-copy with the attach_tables initializer:
+the tables are pinned in their cached_multiples_fixwind cache,
+without being recomputed, and a single copy is shared by all workers.
+The curve is identified by name (see CURVES):
+each worker builds (and validates) it only once, when attaching the tables:
+
+    with SharedTables([Q]) as tables, tables.pool(8) as pool:
+        results = pool.map(verify_function, signatures)
+
+It requires Python 3.8 or later (multiprocessing.shared_memory).
+"""
+
+import multiprocessing
+from multiprocessing.pool import Pool
+from typing import Any, List, Optional, Sequence, Tuple, cast
+
+from btclib.alias import Point
+from btclib.ecc.curve import CURVES, FIXED_BASE_W
+from btclib.ecc.curve_group import cached_multiples_fixwind, jac_from_aff
+from btclib.ecc.packed_table import PackedTable, packed_table
+from btclib.exceptions import BTClibRuntimeError
+
+try:
+    from multiprocessing import shared_memory  # pylint: disable=ungrouped-imports
+except ImportError:  # pragma: no cover
+    shared_memory = None  # type: ignore  # Python < 3.8
+
+# point, offset, and size of each table in the shared memory block
+TableIndex = List[Tuple[Point, int, int]]
+
+# shared memory blocks attached by this (worker) process:
+# they must stay open as long as their tables are used
+_ATTACHED: List["shared_memory.SharedMemory"] = []
+
+
+def _require_shared_memory() -> None:
+    if shared_memory is None:
+        err_msg = "shared tables require Python 3.8 or later"  # pragma: no cover
+        raise BTClibRuntimeError(err_msg)  # pragma: no cover
+
+
+class SharedTables:
+    """Fixed-window tables published in shared memory.
+
+    The G table is always included.
+    The shared memory block is released by close()
+    (or at the end of the with statement).
+    """
+
+    def __init__(self, points: Sequence[Point] = (), ec_name: str = "secp256k1"):
+
+        _require_shared_memory()
+        ec = CURVES[ec_name]
+        keys = [ec.G] + [Q for Q in points if Q != ec.G]
+        tables = [packed_table(Q, ec).to_bytes() for Q in keys]
+
+        self.ec_name = ec_name
+        self._shm = shared_memory.SharedMemory(
+            create=True, size=sum(len(t) for t in tables)
+        )
+        buf = cast(memoryview, self._shm.buf)
+        self.index: TableIndex = []
+        offset = 0
+        for Q, table in zip(keys, tables):
+            buf[offset : offset + len(table)] = table
+            self.index.append((Q, offset, len(table)))
+            offset += len(table)
+
+    @property
+    def name(self) -> str:
+        "Return the name of the shared memory block."
+        return self._shm.name
+
+    @property
+    def initargs(self) -> Tuple[str, str, TableIndex]:
+        "Return the attach_tables arguments."
+        return self._shm.name, self.ec_name, self.index
+
+    def pool(self, processes: Optional[int] = None, context: Any = None) -> Pool:
+        "Return a multiprocessing Pool whose workers attach the tables."
+
+        ctx = multiprocessing if context is None else context
+        return ctx.Pool(processes, attach_tables, self.initargs)
+
+    def close(self) -> None:
+        "Release the shared memory block."
+
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedTables":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+
+def attach_tables(name: str, ec_name: str, index: TableIndex) -> None:
+    "Pool worker initializer: attach the SharedTables tables (zero-copy)."
+
+    _require_shared_memory()
+    shm = shared_memory.SharedMemory(name=name)
+    _ATTACHED.append(shm)
+    buf = cast(memoryview, shm.buf)
+    ec = CURVES[ec_name]
+    for Q, offset, size in index:
+        table = PackedTable(buf[offset : offset + size], ec, FIXED_BASE_W)
+        cached_multiples_fixwind.put(table, jac_from_aff(Q), ec, FIXED_BASE_W, pin=True)
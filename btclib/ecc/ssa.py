@@ -52,12 +52,18 @@ For sepcp256k1 the resulting signature size is 64 bytes.
 import secrets
 from dataclasses import InitVar, dataclass
 from hashlib import sha256
-from typing import List, Optional, Sequence, Tuple, Type, TypeVar, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
 from btclib.alias import BinaryData, HashF, Integer, JacPoint, Octets, Point
 from btclib.bip32.bip32 import BIP32Key
-from btclib.ecc.curve import Curve, secp256k1
-from btclib.ecc.curve_group import _double_mult, _mult, _multi_mult
+from btclib.ecc import libsecp256k1
+from btclib.ecc.curve import (
+    Curve,
+    _double_mult_vartime,
+    _mult_generator,
+    _multi_mult_vartime,
+    secp256k1,
+)
 from btclib.ecc.number_theory import mod_inv
 from btclib.exceptions import BTClibRuntimeError, BTClibTypeError, BTClibValueError
 from btclib.hashes import reduce_to_hlen, tagged_hash
@@ -171,7 +177,7 @@ def gen_keys_(
     else:
         q = int_from_prv_key(prv_key, ec)
 
-    QJ = _mult(q, ec.GJ, ec)
+    QJ = _mult_generator(q, ec)
     x_Q, y_Q = ec.aff_from_jac(QJ)
     if y_Q % 2:
         q = ec.n - q
@@ -205,7 +211,7 @@ def _det_nonce_(
     # the unbiased implementation is provided here,
     # which works also for very-low-cardinality test curves
 
-    randomizer = tagged_hash("BIP0340/aux".encode(), aux, hf)
+    randomizer = tagged_hash(b"BIP0340/aux", aux, hf)
     xor = q ^ int.from_bytes(randomizer, "big", signed=False)
     max_len = max(ec.n_size, hf().digest_size)
     t = b"".join(
@@ -216,9 +222,8 @@ def _det_nonce_(
         ]
     )
 
-    nonce_tag = "BIP0340/nonce".encode()
     while True:
-        t = tagged_hash(nonce_tag, t, hf)
+        t = tagged_hash(b"BIP0340/nonce", t, hf)
         # The following lines would introduce a bias
         # nonce = int.from_bytes(t, 'big') % ec.n
         # nonce = int_from_bits(t, ec.nlen) % ec.n
@@ -267,7 +272,7 @@ def challenge_(msg_hash: Octets, x_Q: int, x_K: int, ec: Curve, hf: HashF) -> in
             msg_hash,
         ]
     )
-    t = tagged_hash("BIP0340/challenge".encode(), t, hf)
+    t = tagged_hash(b"BIP0340/challenge", t, hf)
 
     c = int_from_bits(t, ec.nlen) % ec.n
     if c == 0:
@@ -306,6 +311,11 @@ def sign_(
     hf_len = hf().digest_size
     msg_hash = bytes_from_octets(msg_hash, hf_len)
 
+    if nonce is None and ec == secp256k1 and hf is sha256 and libsecp256k1.is_enabled():
+        q = int_from_prv_key(prv_key, ec)
+        r, s = libsecp256k1.ssa_sign_(msg_hash, q, secrets.token_bytes(hf_len))
+        return Sig(r, s, ec)
+
     # private and public keys
     q, x_Q = gen_keys(prv_key, ec)
 
@@ -355,7 +365,7 @@ def _assert_as_valid_(c: int, QJ: JacPoint, r: int, s: int, ec: Curve) -> None:
 
     # Let K = sG - eQ.
     # in Jacobian coordinates
-    KJ = _double_mult(ec.n - c, QJ, s, ec.GJ, ec)
+    KJ = _double_mult_vartime(ec.n - c, QJ, s, ec.GJ, ec)
 
     # Fail if infinite(KJ).
     # Fail if y_K is odd.
@@ -380,6 +390,12 @@ def assert_as_valid_(
 
     x_Q, y_Q = point_from_bip340pub_key(Q, sig.ec)
 
+    if sig.ec == secp256k1 and hf is sha256 and libsecp256k1.is_enabled():
+        msg_hash = bytes_from_octets(msg_hash, hf().digest_size)
+        if not libsecp256k1.ssa_verify_(msg_hash, x_Q, sig.r, sig.s):
+            raise BTClibRuntimeError("signature verification failed")
+        return
+
     # Let c = int(hf(bytes(r) || bytes(Q) || msg_hash)) mod n.
     c = challenge_(msg_hash, x_Q, sig.r, sig.ec, hf)
 
@@ -427,7 +443,7 @@ def _recover_pub_key_(c: int, r: int, s: int, ec: Curve) -> int:
     KJ = r, ec.y_even(r), 1
 
     e1 = mod_inv(c, ec.n)
-    QJ = _double_mult(ec.n - e1, KJ, e1 * s, ec.GJ, ec)
+    QJ = _double_mult_vartime(ec.n - e1, KJ, e1 * s % ec.n, ec.GJ, ec)
     # edge case that cannot be reproduced in the test suite
     if QJ[2] == 0:
         err_msg = "invalid (INF) key"  # pragma: no cover
@@ -488,17 +504,15 @@ def crack_prv_key(
     return crack_prv_key_(msg_hash1, sig1, msg_hash2, sig2, Q, hf)
 
 
-def assert_batch_as_valid_(
-    m_hashes: Sequence[Octets],
-    Qs: Sequence[BIP340PubKey],
-    sigs: Sequence[Sig],
-    hf: HashF = sha256,
+# lifted ephemeral key K, public key Q, challenge c, and s of a signature
+_BatchTerm = Tuple[JacPoint, JacPoint, int, int]
+
+
+def _assert_batch_sizes(
+    m_hashes: Sequence[Octets], Qs: Sequence[BIP340PubKey], sigs: Sequence[Any]
 ) -> None:
 
     batch_size = len(Qs)
-    if batch_size == 0:
-        raise BTClibValueError("no signatures provided")
-
     if len(m_hashes) != batch_size:
         err_msg = f"mismatch between number of pub_keys ({batch_size}) "
         err_msg += f"and number of messages ({len(m_hashes)})"
@@ -508,47 +522,106 @@ def assert_batch_as_valid_(
         err_msg += f"and number of signatures ({len(sigs)})"
         raise BTClibValueError(err_msg)
 
-    if batch_size == 1:
-        assert_as_valid_(m_hashes[0], Qs[0], sigs[0], hf)
-        return None
 
-    ec = sigs[0].ec
-    if any(sig.ec != ec for sig in sigs):
-        raise BTClibValueError("not the same curve for all signatures")
+def _batch_term_(
+    msg_hash: Octets,
+    Q: BIP340PubKey,
+    sig: Sig,
+    ec: Curve,
+    hf: HashF,
+    lifted: Dict[Any, JacPoint],
+) -> _BatchTerm:
+    # Private function: lifted public keys are cached in the lifted dict,
+    # as batches often include many signatures from the same few keys
+
+    KJ = sig.r, ec.y_even(sig.r), 1
+
+    hashable = isinstance(Q, (int, bytes, str, tuple))
+    QJ = lifted.get(Q) if hashable else None
+    if QJ is None:
+        x_Q, y_Q = point_from_bip340pub_key(Q, ec)
+        QJ = x_Q, y_Q, 1
+        if hashable:
+            lifted[Q] = QJ
+
+    c = challenge_(msg_hash, QJ[0], sig.r, ec, hf)
+    return KJ, QJ, c, sig.s
+
+
+def _batch_randomizers_(terms: Sequence[_BatchTerm], ec: Curve, hf: HashF) -> List[int]:
+
+    # rand in [1, n-1]
+    # deterministically generated using a CSPRNG seeded by a
+    # cryptographic hash (e.g., SHA256) of all inputs of the
+    # algorithm, or randomly generated independently for each
+    # run of the batch verification algorithm
+    # Here the seed commits to (r, x_Q, c, s) of all the signatures,
+    # i.e. to everything the verification equation depends on,
+    # and the CSPRNG is the tagged hash of seed || counter
+    h = hf()
+    for KJ, QJ, c, s in terms:
+        h.update(KJ[0].to_bytes(ec.p_size, byteorder="big", signed=False))
+        h.update(QJ[0].to_bytes(ec.p_size, byteorder="big", signed=False))
+        h.update(c.to_bytes(ec.n_size, byteorder="big", signed=False))
+        h.update(s.to_bytes(ec.n_size, byteorder="big", signed=False))
+    seed = h.digest()
+
+    rands = [1]
+    for i in range(1, len(terms)):
+        t = tagged_hash(b"BIP0340/batch", seed + i.to_bytes(4, byteorder="big"), hf)
+        rands.append(1 + int_from_bits(t, ec.nlen) % (ec.n - 1))
+    return rands
+
+
+def _batch_residual_(
+    terms: Sequence[_BatchTerm], rands: Sequence[int], ec: Curve
+) -> JacPoint:
+    "Return the sum of rand*(s*G - K - c*Q): INF if all the signatures are valid."
+
+    # the scalars of repeated public keys are merged
+    Q_scalars: Dict[JacPoint, int] = {}
     t = 0
     scalars: List[int] = []
     points: List[JacPoint] = []
-    for i, (msg_hash, Q, sig) in enumerate(zip(m_hashes, Qs, sigs)):
-        msg_hash = bytes_from_octets(msg_hash, hf().digest_size)
+    for rand, (KJ, QJ, c, s) in zip(rands, terms):
+        scalars.append(rand)
+        points.append(KJ)
+        Q_scalars[QJ] = Q_scalars.get(QJ, 0) + rand * c
+        t += rand * s
+    for QJ, scalar in Q_scalars.items():
+        scalars.append(scalar % ec.n)
+        points.append(QJ)
 
-        KJ = sig.r, ec.y_even(sig.r), 1
+    TJ = _mult_generator(t % ec.n, ec)
+    RHSJ = _multi_mult_vartime(scalars, points, ec)
+    return ec.add_jac_vartime(TJ, ec.negate_jac(RHSJ))
 
-        x_Q, y_Q = point_from_bip340pub_key(Q, ec)
-        QJ = x_Q, y_Q, 1
 
-        c = challenge_(msg_hash, x_Q, sig.r, ec, hf)
+def assert_batch_as_valid_(
+    m_hashes: Sequence[Octets],
+    Qs: Sequence[BIP340PubKey],
+    sigs: Sequence[Sig],
+    hf: HashF = sha256,
+) -> None:
 
-        # rand in [1, n-1]
-        # deterministically generated using a CSPRNG seeded by a
-        # cryptographic hash (e.g., SHA256) of all inputs of the
-        # algorithm, or randomly generated independently for each
-        # run of the batch verification algorithm
-        rand = 1 if i == 0 else 1 + secrets.randbelow(ec.n - 1)
-        scalars.append(rand)
-        points.append(KJ)
-        scalars.append(rand * c % ec.n)
-        points.append(QJ)
-        t += rand * sig.s
+    batch_size = len(Qs)
+    if batch_size == 0:
+        raise BTClibValueError("no signatures provided")
+    _assert_batch_sizes(m_hashes, Qs, sigs)
 
-    TJ = _mult(t, ec.GJ, ec)
-    RHSJ = _multi_mult(scalars, points, ec)
+    if batch_size == 1:
+        assert_as_valid_(m_hashes[0], Qs[0], sigs[0], hf)
+        return None
 
-    # return T == RHS, checked in Jacobian coordinates
-    RHSZ2 = RHSJ[2] * RHSJ[2]
-    TZ2 = TJ[2] * TJ[2]
-    if (TJ[0] * RHSZ2 % ec.p != RHSJ[0] * TZ2 % ec.p) or (
-        TJ[1] * RHSZ2 * RHSJ[2] % ec.p != RHSJ[1] * TZ2 * TJ[2] % ec.p
-    ):
+    ec = sigs[0].ec
+    if any(sig.ec != ec for sig in sigs):
+        raise BTClibValueError("not the same curve for all signatures")
+    lifted: Dict[Any, JacPoint] = {}
+    terms = [
+        _batch_term_(m, Q, sig, ec, hf, lifted) for m, Q, sig in zip(m_hashes, Qs, sigs)
+    ]
+    rands = _batch_randomizers_(terms, ec, hf)
+    if _batch_residual_(terms, rands, ec)[2] != 0:
         raise BTClibRuntimeError("signature verification failed")
     return None
 
@@ -591,3 +664,95 @@ def batch_verify(
 
     m_hashes = [reduce_to_hlen(msg, hf) for msg in ms]
     return batch_verify_(m_hashes, Qs, sigs, hf)
+
+
+def _invalid_indices_(
+    indices: Sequence[int],
+    terms: Sequence[_BatchTerm],
+    rands: Sequence[int],
+    residual: JacPoint,
+    ec: Curve,
+) -> List[int]:
+    # Private function: recursive bisection of a failing batch;
+    # as the randomizers are the same, the residual of the second half
+    # is the batch residual minus the residual of the first half
+
+    if residual[2] == 0:
+        return []
+    if len(terms) == 1:
+        return list(indices)
+    mid = len(terms) // 2
+    residual_1 = _batch_residual_(terms[:mid], rands[:mid], ec)
+    residual_2 = ec.add_jac_vartime(residual, ec.negate_jac(residual_1))
+    invalid = _invalid_indices_(indices[:mid], terms[:mid], rands[:mid], residual_1, ec)
+    invalid += _invalid_indices_(
+        indices[mid:], terms[mid:], rands[mid:], residual_2, ec
+    )
+    return invalid
+
+
+def batch_invalid_indices_(
+    m_hashes: Sequence[Octets],
+    Qs: Sequence[BIP340PubKey],
+    sigs: Sequence[Union[Sig, Octets]],
+    hf: HashF = sha256,
+) -> List[int]:
+    """Return the indices of the invalid BIP340 signatures.
+
+    Malformed signatures and public keys are invalid;
+    all the others are verified in a single batch:
+    if it fails, it is recursively bisected,
+    reusing the lifted points, challenges, and randomizers.
+    Only the first half of each failing batch is computed,
+    the second half being the difference:
+    a single invalid signature costs about one more batch.
+    """
+
+    _assert_batch_sizes(m_hashes, Qs, sigs)
+
+    invalid: List[int] = []
+    parsed: List[Tuple[int, Sig]] = []
+    for i, sig in enumerate(sigs):
+        try:
+            if isinstance(sig, Sig):
+                sig.assert_valid()
+            else:
+                sig = Sig.parse(sig)
+        except Exception:  # pylint: disable=broad-except
+            invalid.append(i)
+        else:
+            parsed.append((i, sig))
+    if not parsed:
+        return invalid
+
+    ec = parsed[0][1].ec
+    if any(sig.ec != ec for _, sig in parsed):
+        raise BTClibValueError("not the same curve for all signatures")
+    lifted: Dict[Any, JacPoint] = {}
+    indices: List[int] = []
+    terms: List[_BatchTerm] = []
+    for i, sig in parsed:
+        try:
+            terms.append(_batch_term_(m_hashes[i], Qs[i], sig, ec, hf, lifted))
+        except Exception:  # pylint: disable=broad-except
+            invalid.append(i)
+        else:
+            indices.append(i)
+
+    if terms:
+        rands = _batch_randomizers_(terms, ec, hf)
+        residual = _batch_residual_(terms, rands, ec)
+        invalid += _invalid_indices_(indices, terms, rands, residual, ec)
+    return sorted(invalid)
+
+
+def batch_invalid_indices(
+    ms: Sequence[Octets],
+    Qs: Sequence[BIP340PubKey],
+    sigs: Sequence[Union[Sig, Octets]],
+    hf: HashF = sha256,
+) -> List[int]:
+    "Return the indices of the invalid BIP340 signatures."
+
+    m_hashes = [reduce_to_hlen(msg, hf) for msg in ms]
+    return batch_invalid_indices_(m_hashes, Qs, sigs, hf)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Bounded caches for precomputed point tables.
+
+Scalar multiplication algorithms precompute tables of
+multiples of the input point, e.g. cached_multiples_fixwind;
+the tables of frequently used points (e.g. the curve generator G)
+are kept in a TableCache, instead of an unbounded functools.lru_cache.
+
+A TableCache has:
+
+- entry and (estimated) byte budgets, enforced evicting
+  the least recently used tables
+- hit/miss/eviction statistics
+- pinned tables, never evicted
+- thread-safe access
+
+All the table caches are available in TABLE_CACHES,
+keyed by the name of the cached function,
+e.g. TABLE_CACHES["cached_multiples_fixwind"].stats().
+"""
+
+import functools
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Optional, Set, Tuple, TypeVar
+
+from btclib.exceptions import BTClibValueError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    "Statistics of a TableCache."
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    pinned: int
+    max_entries: Optional[int]
+    max_bytes: Optional[int]
+
+
+def nbytes(table: Any) -> int:
+    "Return the estimated memory size of a (nested) table of points."
+
+    if isinstance(table, (list, tuple)):
+        return sys.getsizeof(table) + sum(nbytes(x) for x in table)
+    return sys.getsizeof(table)
+
+
+def _check_budget(budget: Optional[int], name: str) -> None:
+    if budget is not None and budget < 0:
+        raise BTClibValueError(f"negative {name}: {budget}")
+
+
+class TableCache(Generic[T]):
+    """Bounded, thread-safe cache of the tables returned by a function.
+
+    Tables are keyed by the (positional) function arguments.
+    None as max_entries or max_bytes means no limit.
+    Pinned tables count against the budgets, but they are never evicted.
+    """
+
+    # set by functools.update_wrapper, as the other func attributes
+    __name__: str
+
+    def __init__(
+        self,
+        func: Callable[..., T],
+        max_entries: Optional[int] = 128,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+
+        _check_budget(max_entries, "max_entries")
+        _check_budget(max_bytes, "max_bytes")
+        self.func = func
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._tables: "OrderedDict[Tuple[Any, ...], Tuple[T, int]]" = OrderedDict()
+        self._pinned: Set[Tuple[Any, ...]] = set()
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args: Any) -> T:
+        "Return the (cached) func(*args) table."
+
+        with self._lock:
+            entry = self._tables.get(args)
+            if entry is not None:
+                self._hits += 1
+                self._tables.move_to_end(args)
+                return entry[0]
+            self._misses += 1
+
+        # computed outside the lock: other tables are available meanwhile
+        table = self.func(*args)
+        size = nbytes(table)
+
+        with self._lock:
+            # another thread might have computed the same table meanwhile
+            entry = self._tables.get(args)
+            if entry is not None:
+                return entry[0]
+            if self._too_large(args, size):
+                return table
+            self._tables[args] = table, size
+            self._nbytes += size
+            self._evict()
+        return table
+
+    def put(self, table: T, *args: Any, pin: bool = False) -> None:
+        "Store table as the func(*args) table, e.g. one loaded from file."
+
+        size = nbytes(table)
+        with self._lock:
+            if pin:
+                self._pinned.add(args)
+            entry = self._tables.pop(args, None)
+            if entry is not None:
+                self._nbytes -= entry[1]
+            if self._too_large(args, size):
+                return
+            self._tables[args] = table, size
+            self._nbytes += size
+            self._evict()
+
+    def _too_large(self, args: Tuple[Any, ...], size: int) -> bool:
+        "Return True if the unpinned table alone exceeds the byte budget."
+
+        # caching it would just evict all the other unpinned tables, then itself
+        if args in self._pinned or self.max_bytes is None:
+            return False
+        return size > self.max_bytes
+
+    def _evict(self) -> None:
+        "Evict the least recently used unpinned tables exceeding the budgets."
+
+        for key in list(self._tables):
+            if self._within_budgets():
+                return
+            if key not in self._pinned:
+                _, size = self._tables.pop(key)
+                self._nbytes -= size
+                self._evictions += 1
+
+    def _within_budgets(self) -> bool:
+        if self.max_entries is not None and len(self._tables) > self.max_entries:
+            return False
+        return self.max_bytes is None or self._nbytes <= self.max_bytes
+
+    def pin(self, *args: Any) -> T:
+        "Return the func(*args) table, pinning it in the cache."
+
+        with self._lock:
+            self._pinned.add(args)
+        return self(*args)
+
+    def unpin(self, *args: Any) -> None:
+        "Make the func(*args) table evictable again."
+
+        with self._lock:
+            self._pinned.discard(args)
+            self._evict()
+
+    def configure(
+        self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> None:
+        "Set the cache budgets (None means no limit), evicting if needed."
+
+        _check_budget(max_entries, "max_entries")
+        _check_budget(max_bytes, "max_bytes")
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        "Remove all the unpinned tables and reset the statistics."
+
+        with self._lock:
+            for key in list(self._tables):
+                if key not in self._pinned:
+                    _, size = self._tables.pop(key)
+                    self._nbytes -= size
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        "Return the cache statistics."
+
+        with self._lock:
+            return CacheStats(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._tables),
+                self._nbytes,
+                len(self._pinned.intersection(self._tables)),
+                self.max_entries,
+                self.max_bytes,
+            )
+
+    def is_cached(self, *args: Any) -> bool:
+        "Return True if the func(*args) table is in the cache."
+
+        with self._lock:
+            return args in self._tables
+
+    def __contains__(self, args: Any) -> bool:
+        "Return True if the func(*args) table is in the cache."
+
+        return self.is_cached(*args)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tables)
+
+
+TABLE_CACHES: Dict[str, TableCache] = {}
+
+
+def table_cache(
+    max_entries: Optional[int] = 128, max_bytes: Optional[int] = None
+) -> Callable[[Callable[..., T]], TableCache[T]]:
+    "Decorator caching the function tables in a TableCache."
+
+    def decorator(func: Callable[..., T]) -> TableCache[T]:
+        cache = TableCache(func, max_entries, max_bytes)
+        TABLE_CACHES[func.__name__] = cache
+        return cache
+
+    return decorator
+
+
+def clear_table_caches() -> None:
+    "Clear all the table caches (pinned tables are kept)."
+
+    for cache in TABLE_CACHES.values():
+        cache.clear()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"""Auto-tuned selection of the scalar multiplication algorithms.
+
+The fastest algorithm (and window width) depends on the curve
+and on the interpreter (e.g. CPython 3.8, CPython 3.11, PyPy):
+tune benchmarks the candidate algorithms on the running interpreter
+and records the fastest ones in a TuningProfile,
+for each (curve, operation kind):
+
+- fixed-base: multiplication of the curve generator G,
+  e.g. key generation and signing (constant time candidates only)
+- variable-base: multiplication of any other point
+- double: double scalar multiplication, e.g. signature verification
+- multi: multi scalar multiplication, for each MULTI_SIZES class
+
+curve.mult, double_mult, multi_mult (and the functions using them)
+dispatch through the active profile;
+untuned curves and kinds use the default choices.
+
+A profile is persisted with save_profile and activated with load_profile.
+It records the interpreter it was tuned on:
+a profile tuned on another interpreter cannot be loaded,
+i.e. each interpreter needs its own profile file.
+"""
+
+import json
+import platform
+import secrets
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
+
+KINDS = ("fixed-base", "variable-base", "double", "multi")
+
+# multi scalar multiplication size classes: the choice tuned for a class
+# is used up to its size (and beyond, for the largest class)
+MULTI_SIZES = (8, 64, 512)
+
+
+@dataclass(frozen=True)
+class Choice:
+    "Algorithm name and window width (0 if not applicable)."
+
+    algorithm: str
+    w: int = 0
+
+
+def current_interpreter() -> str:
+    "Return the interpreter implementation and version, e.g. cpython-3.8."
+
+    major, minor, _ = platform.python_version_tuple()
+    return f"{platform.python_implementation().lower()}-{major}.{minor}"
+
+
+def _kind_key(kind: str, size: int) -> str:
+    "Return the profile key of the operation kind (and size class)."
+
+    if kind not in KINDS:
+        raise BTClibValueError(f"unknown operation kind: {kind}")
+    if kind != "multi":
+        return kind
+    for max_size in MULTI_SIZES:
+        if size <= max_size:
+            return f"multi-{max_size}"
+    return f"multi-{MULTI_SIZES[-1]}"
+
+
+class TuningProfile:
+    "The tuned choices, keyed by curve name and operation kind."
+
+    def __init__(self, interpreter: Optional[str] = None) -> None:
+
+        self.interpreter = interpreter or current_interpreter()
+        self.choices: Dict[str, Dict[str, Choice]] = {}
+
+    def choice(
+        self, ec_name: Optional[str], kind: str, size: int = 1
+    ) -> Optional[Choice]:
+        "Return the tuned choice, None if the curve and kind are not tuned."
+
+        key = _kind_key(kind, size)
+        return self.choices.get(ec_name or "", {}).get(key)
+
+    def set_choice(
+        self, ec_name: str, kind: str, choice: Choice, size: int = 1
+    ) -> None:
+        self.choices.setdefault(ec_name, {})[_kind_key(kind, size)] = choice
+
+    def to_dict(self) -> Dict[str, Any]:
+        choices = {
+            ec_name: {key: [c.algorithm, c.w] for key, c in kinds.items()}
+            for ec_name, kinds in self.choices.items()
+        }
+        return {"interpreter": self.interpreter, "choices": choices}
+
+    @classmethod
+    def from_dict(cls, dict_: Dict[str, Any]) -> "TuningProfile":
+        profile = cls(dict_["interpreter"])
+        for ec_name, kinds in dict_["choices"].items():
+            profile.choices[ec_name] = {
+                key: Choice(algorithm, w) for key, (algorithm, w) in kinds.items()
+            }
+        return profile
+
+
+_PROFILE = TuningProfile()
+
+
+def get_profile() -> TuningProfile:
+    "Return the active profile."
+    return _PROFILE
+
+
+def set_profile(profile: Optional[TuningProfile] = None) -> None:
+    "Activate the profile (an empty one, i.e. the default choices, if None)."
+
+    profile = TuningProfile() if profile is None else profile
+    if profile.interpreter != current_interpreter():
+        err_msg = f"profile tuned on another interpreter: {profile.interpreter}"
+        raise BTClibValueError(err_msg)
+    global _PROFILE  # pylint: disable=global-statement
+    _PROFILE = profile
+
+
+def save_profile(filename: str, profile: Optional[TuningProfile] = None) -> None:
+    "Save the profile (the active one if None) to a JSON file."
+
+    profile = _PROFILE if profile is None else profile
+    with open(filename, "w", encoding="ascii") as file_:
+        json.dump(profile.to_dict(), file_, indent=4)
+
+
+def load_profile(filename: str) -> TuningProfile:
+    "Load and activate the profile saved in a JSON file."
+
+    with open(filename, "r", encoding="ascii") as file_:
+        profile = TuningProfile.from_dict(json.load(file_))
+    set_profile(profile)
+    return profile
+
+
+def _best(
+    candidates: Sequence[Choice],
+    run: Callable[[Choice], Any],
+    repeat: int,
+) -> Choice:
+    "Return the fastest candidate, checking that all results are the same."
+
+    results: List[Tuple[float, int, Choice]] = []
+    expected = None
+    for i, choice in enumerate(candidates):
+        # untimed run: it builds any precomputed table
+        result = run(choice)
+        if expected is None:
+            expected = result
+        elif result != expected:
+            err_msg = f"inconsistent {choice.algorithm} result"  # pragma: no cover
+            raise BTClibRuntimeError(err_msg)  # pragma: no cover
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(choice)
+            timings.append(time.perf_counter() - start)
+        results.append((min(timings), i, choice))
+    return min(results)[2]
+
+
+def tune(
+    ec: Any = None,
+    kinds: Sequence[str] = KINDS,
+    multi_sizes: Sequence[int] = MULTI_SIZES,
+    repeat: int = 3,
+    filename: Optional[str] = None,
+) -> TuningProfile:
+    """Benchmark the candidate algorithms and activate the fastest ones.
+
+    The curve (secp256k1 if None) choices are added to the active profile,
+    which is also saved to file, if a filename is provided.
+    Each candidate is timed on the same random scalars and points
+    (the best of repeat runs).
+    """
+
+    # curve imports the tuned choices at module level:
+    # tune is the only reverse dependency, hence the lazy import
+    # pylint: disable=import-outside-toplevel
+    from btclib.ecc import curve  # pylint: disable=cyclic-import
+
+    ec = curve.secp256k1 if ec is None else ec
+    if not ec.name:
+        raise BTClibValueError("unnamed curves cannot be tuned")
+    for kind in kinds:
+        _kind_key(kind, 1)
+    for size in multi_sizes:
+        if size not in MULTI_SIZES:
+            raise BTClibValueError(f"not a multi size class: {size}")
+
+    def random_points(size: int) -> Tuple[List[int], List[Any]]:
+        ms = [1 + secrets.randbelow(ec.n - 1) for _ in range(size)]
+        points = [curve.mult(m, ec.G, ec) for m in ms]
+        return ms, [(x, y, 1) for x, y in points]
+
+    ms, points = random_points(4)
+    profile = TuningProfile()
+    profile.choices = {k: dict(v) for k, v in _PROFILE.choices.items()}
+
+    def run(kind: str, scalars: List[int], jac_points: List[Any], c: Choice) -> Any:
+        return ec.aff_from_jac(curve.run_candidate(kind, c, scalars, jac_points, ec))
+
+    def run_all(kind: str, c: Choice) -> List[Any]:
+        return [run(kind, [u, v], [P], c) for u, v, P in zip(ms, reversed(ms), points)]
+
+    for kind in ("fixed-base", "variable-base", "double"):
+        if kind in kinds:
+            candidates = curve.tuning_candidates(kind, ec)
+            best = _best(candidates, partial(run_all, kind), repeat)
+            profile.set_choice(ec.name, kind, best)
+    if "multi" in kinds:
+        candidates = curve.tuning_candidates("multi", ec)
+        for size in multi_sizes:
+            scalars, jac_points = random_points(size)
+            best = _best(candidates, partial(run, "multi", scalars, jac_points), repeat)
+            profile.set_choice(ec.name, "multi", best, size)
+
+    set_profile(profile)
+    if filename is not None:
+        save_profile(filename, profile)
+    return profile
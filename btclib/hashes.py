@@ -12,8 +12,9 @@
 
 """
 
+import functools
 import hashlib
-from typing import Optional, Tuple
+from typing import Any, Optional, Tuple
 
 from btclib.alias import HashF, Octets
 from btclib.ecc.curve import Curve, secp256k1
@@ -79,7 +80,9 @@ def challenge_(
     return c
 
 
-def tagged_hash(tag: bytes, m: bytes, hf: HashF = hashlib.sha256) -> bytes:
+@functools.lru_cache(maxsize=256)
+def _tagged_hash_midstate(tag: bytes, hf: HashF) -> Any:
+    "Return the hash object initialized with the doubled tag hash prefix."
 
     h1 = hf()
     h1.update(tag)
@@ -87,8 +90,17 @@ def tagged_hash(tag: bytes, m: bytes, hf: HashF = hashlib.sha256) -> bytes:
 
     h2 = hf()
     h2.update(tag_hash + tag_hash)
+    return h2
+
+
+def tagged_hash(tag: bytes, m: bytes, hf: HashF = hashlib.sha256) -> bytes:
+    """Return the BIP340 tagged hash of the message.
 
-    # it could be sped up by storing the above midstate
+    The midstate after the doubled tag hash prefix
+    is cached for each (tag, hf) and then copied.
+    """
 
-    h2.update(m)
-    return h2.digest()
+    # the cache key must be hashable, e.g. not a bytearray
+    h = _tagged_hash_midstate(bytes(tag), hf).copy()
+    h.update(m)
+    return h.digest()
@@ -30,6 +30,9 @@ from btclib.bip32.bip32 import (
 from btclib.bip32.der_path import _indexes_from_bip32_path_str
 from btclib.exceptions import BTClibValueError
 
+# run with the libsecp256k1 backend both disabled and enabled
+pytestmark = pytest.mark.usefixtures("libsecp256k1_backend")
+
 
 def test_exceptions() -> None:
 
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Shared pytest fixtures."
+
+from typing import Iterator
+
+import pytest
+
+from btclib.ecc import libsecp256k1
+
+# the pure Python implementation is always tested,
+# the libsecp256k1 backend only if available
+_BACKENDS = [False, True] if libsecp256k1.is_available() else [False]
+
+
+@pytest.fixture(
+    params=_BACKENDS, ids=lambda enabled: "libsecp256k1" if enabled else "python"
+)
+def libsecp256k1_backend(request: pytest.FixtureRequest) -> Iterator[bool]:
+    "Run the test with the libsecp256k1 backend disabled and enabled."
+
+    enabled = libsecp256k1.is_enabled()
+    if request.param:
+        libsecp256k1.enable()
+    else:
+        libsecp256k1.disable()
+    try:
+        yield request.param
+    finally:
+        if enabled:
+            libsecp256k1.enable()
+        else:
+            libsecp256k1.disable()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.arithmetic` module."
+
+import secrets
+
+import pytest
+
+from btclib.ecc.arithmetic import (
+    ARITHMETICS,
+    Arithmetic,
+    get_arithmetic,
+    set_default_arithmetic,
+)
+from btclib.ecc.curve import CURVES, Curve, mult
+from btclib.ecc.curve_group import _mult
+from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
+
+
+def test_get_arithmetic() -> None:
+    assert get_arithmetic("python") is Arithmetic
+    assert (
+        get_arithmetic() is ARITHMETICS["gmpy2" if "gmpy2" in ARITHMETICS else "python"]
+    )
+
+    with pytest.raises(BTClibValueError, match="unknown arithmetic backend: "):
+        get_arithmetic("unknown")
+    with pytest.raises(BTClibValueError, match="unknown arithmetic backend: "):
+        set_default_arithmetic("unknown")
+
+
+def test_backends() -> None:
+    p = CURVES["secp256k1"].p
+    for arithmetic in ARITHMETICS.values():
+        for m in (3, 5, 7, 11, 12, 15, 97, 1024, p):
+            for a in list(range(m)) if m < 100 else [secrets.randbelow(m)]:
+                b = secrets.randbelow(m)
+                assert arithmetic.element(a) == a
+                assert arithmetic.powmod(a, b, m) == pow(a, b, m)
+                try:
+                    inv = arithmetic.invert(a, m)
+                except ZeroDivisionError:
+                    assert all(a * i % m != 1 for i in range(min(m, 100)))
+                else:
+                    assert a * inv % m == 1
+                    assert arithmetic.invert(a + m, m) == inv
+                    assert arithmetic.invert(a - m, m) == inv
+                if m in (3, 5, 7, 11, 97, p):
+                    ls = arithmetic.legendre(a, m)
+                    assert ls == (
+                        0 if a == 0 else (1 if pow(a, m >> 1, m) == 1 else -1)
+                    )
+
+
+def test_curve_backend() -> None:
+    "Test that curves are consistent whatever their backend."
+
+    default = get_arithmetic().name
+    ec_params = [CURVES["secp256k1"], CURVES["secp256r1"], CURVES["bpp256r1"]]
+    ec_params += list(low_card_curves.values())
+    for name in ARITHMETICS:
+        set_default_arithmetic(name)
+        try:
+            for ec0 in ec_params:
+                ec = Curve(ec0.p, ec0._a, ec0._b, ec0.G, ec0.n, ec0.cofactor, False)
+                assert ec._arithmetic is get_arithmetic(name)
+                m = secrets.randbelow(ec.n)
+                Q = mult(m, ec0.G, ec0)
+                QJ = _mult(m, ec.GJ, ec)
+                assert ec.aff_from_jac(QJ) == Q
+                assert all(type(x) is int for x in ec.aff_from_jac(QJ))
+                if Q[1] != 0:
+                    assert type(ec.x_aff_from_jac(QJ)) is int
+                    assert type(ec.y_aff_from_jac(QJ)) is int
+                assert mult(m, ec.G, ec) == Q
+        finally:
+            set_default_arithmetic(default)
@@ -11,13 +11,14 @@
 "Tests for the `btclib.bms` module."
 
 import json
+import secrets
 from os import path
 
 import pytest
 
 from btclib import b32, b58
 from btclib.bip32 import bip32
-from btclib.ecc import bms, dsa
+from btclib.ecc import bms, dsa, libsecp256k1
 from btclib.ecc.curve import CURVES, secp256k1
 from btclib.exceptions import BTClibValueError
 from btclib.hashes import magic_message
@@ -156,6 +157,56 @@ def test_exceptions() -> None:
         bms.assert_as_valid(msg, b32_p2wpkh, bms_sig)
 
 
+def test_batch_verify() -> None:
+
+    msgs, addrs, sigs = [], [], []
+    for compressed in (True, False):
+        wif, addr = bms.gen_keys(compressed=compressed)
+        addresses = [addr]
+        if compressed:
+            addresses += [b58.p2wpkh_p2sh(wif), b32.p2wpkh(wif)]
+        for address in addresses:
+            msg = secrets.token_bytes(20)
+            msgs.append(msg)
+            addrs.append(address)
+            sigs.append(bms.sign(msg, wif, address))
+
+    enabled = libsecp256k1.is_enabled()
+    try:
+        for enable in (False, True):
+            if enable:
+                libsecp256k1.enable()
+            else:
+                libsecp256k1.disable()
+            assert bms.batch_verify(msgs, addrs, sigs)
+            encoded = [sig.b64encode() for sig in sigs]
+            assert bms.batch_verify(msgs, addrs, encoded)
+            # the address of another key
+            assert not bms.batch_verify(msgs, addrs[1:] + addrs[:1], sigs)
+            # another message: the recovered key does not match the address
+            assert not bms.batch_verify(msgs[1:] + msgs[:1], addrs, sigs)
+            # high s
+            sig = sigs[0]
+            dsa_sig = dsa.Sig(sig.dsa_sig.r, ec.n - sig.dsa_sig.s)
+            malleated = bms.Sig(sig.rf + (1 if sig.rf % 2 else -1), dsa_sig)
+            high_s_sigs = [malleated] + sigs[1:]
+            assert bms.verify(msgs[0], addrs[0], malleated, lower_s=False)
+            assert bms.batch_verify(msgs, addrs, high_s_sigs, lower_s=False)
+            with pytest.raises(BTClibValueError, match="not a low s"):
+                bms.assert_batch_as_valid(msgs, addrs, high_s_sigs)
+
+            err_msg = "mismatch between number of addresses "
+            with pytest.raises(BTClibValueError, match=err_msg):
+                bms.assert_batch_as_valid(msgs[1:], addrs, sigs)
+            with pytest.raises(BTClibValueError, match=err_msg):
+                bms.assert_batch_as_valid(msgs, addrs, sigs[1:])
+    finally:
+        if enabled:
+            libsecp256k1.enable()
+        else:
+            libsecp256k1.disable()
+
+
 @pytest.mark.sixth
 def test_one_prv_key_multiple_addresses() -> None:
 
@@ -10,14 +10,39 @@
 
 "Tests for the `btclib.curve` module."
 
+import pickle
 import secrets
 from typing import Dict
 
 import pytest
 
-from btclib.alias import INF, INFJ
-from btclib.ecc.curve import CURVES, Curve, double_mult, mult, multi_mult, secp256k1
-from btclib.ecc.curve_group import jac_from_aff
+from btclib.alias import INF, INFJ, INFP
+from btclib.ecc.curve import (
+    CURVES,
+    ENDOMORPHISMS,
+    FIXED_BASE_W,
+    NIST,
+    Brainpool,
+    Curve,
+    SEC2v1,
+    SEC2v2,
+    _double_mult_vartime,
+    _mult_generator,
+    _multi_mult_vartime,
+    double_mult,
+    mult,
+    mult_batch,
+    multi_mult,
+    register_pub_key,
+    secp256k1,
+    unregister_pub_key,
+)
+from btclib.ecc.curve_group import (
+    _double_mult,
+    _mult,
+    cached_multiples_fixwind,
+    jac_from_aff,
+)
 from btclib.ecc.number_theory import mod_sqrt
 from btclib.ecc.pedersen import second_generator
 from btclib.exceptions import BTClibTypeError, BTClibValueError
@@ -98,6 +123,22 @@ def test_exceptions() -> None:
     with pytest.raises(UserWarning, match="weak curve"):
         Curve(11, 2, 7, (6, 9), 7, 2, True)
 
+    # good curve with endomorphism
+    ec = Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(7, 9))
+    assert ec.endomorphism is not None
+
+    err_msg = "lambda is not a cube root of unity mod n"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(8, 9))
+
+    err_msg = "beta is not a cube root of unity mod p"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(7, 1))
+
+    err_msg = "lambda\\*G is not \\(beta\\*x_G, y_G\\)"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(7, 3))
+
 
 def test_aff_jac_conversions() -> None:
     for ec in all_curves.values():
@@ -121,6 +162,16 @@ def test_aff_jac_conversions() -> None:
             ec.y_aff_from_jac(INFJ)
 
 
+def test_aff_from_jac_batch() -> None:
+    for ec in all_curves.values():
+        assert ec.aff_from_jac_batch([]) == []
+        QJs = [_mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec) for _ in range(8)]
+        QJs.insert(3, INFJ)
+        QJs.append(ec.GJ)
+        assert ec.aff_from_jac_batch(QJs) == [ec.aff_from_jac(QJ) for QJ in QJs]
+        assert ec.aff_from_jac_batch([INFJ, INFJ]) == [INF, INF]
+
+
 def test_add_double_aff() -> None:
     "Test self-consistency of add and double in affine coordinates."
     for ec in all_curves.values():
@@ -167,6 +218,85 @@ def test_add_double_jac() -> None:
         assert ec.jac_equality(ec.add_jac(INFJ, ec.negate_jac(INFJ)), INFJ)
 
 
+def test_add_jac_vartime() -> None:
+    for ec in low_card_curves.values():
+        points = [INFJ] + [_mult(m, ec.GJ, ec) for m in range(1, ec.n)]
+        # not normalized Jacobian coordinates
+        points += [(P[0] * 4 % ec.p, P[1] * 8 % ec.p, P[2] * 2 % ec.p) for P in points]
+        for P in points:
+            for Q in points:
+                R = ec.add_jac_vartime(P, Q)
+                assert ec.jac_equality(R, ec.add_jac(P, Q))
+                assert R[2] != 0 or R == INFJ or R in (P, Q)
+    ec = secp256k1
+    assert ec.add_jac_vartime(ec.GJ, ec.negate_jac(ec.GJ)) == INFJ
+
+
+def test_add_double_proj() -> None:
+    "Test the complete projective formulas, without exceptional cases."
+
+    for ec in low_card_curves.values():
+        points = [INFJ] + [_mult(m, ec.GJ, ec) for m in range(1, ec.n)]
+        # not normalized Jacobian coordinates
+        points += [(P[0] * 4 % ec.p, P[1] * 8 % ec.p, P[2] * 2 % ec.p) for P in points]
+        for P in points:
+            PP = ec.proj_from_jac(P)
+            assert ec.jac_equality(ec.jac_from_proj(PP), P)
+            R = ec.jac_from_proj(ec.double_proj(PP))
+            assert ec.jac_equality(R, ec.double_jac(P))
+            for Q in points:
+                R = ec.jac_from_proj(ec.add_proj(PP, ec.proj_from_jac(Q)))
+                assert ec.jac_equality(R, ec.add_jac(P, Q))
+    assert ec.proj_from_jac(INFJ) == INFP
+    assert ec.jac_from_proj(INFP) == INFJ
+
+    for ec in all_curves.values():
+        A = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+        B = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+        QP = ec.proj_from_jac(jac_from_aff(A))
+        RP = ec.proj_from_jac(jac_from_aff(B))
+        S = ec.aff_from_jac(ec.jac_from_proj(ec.add_proj(QP, RP)))
+        assert S == ec.add_aff(A, B)
+        S = ec.aff_from_jac(ec.jac_from_proj(ec.add_proj(QP, QP)))
+        assert S == ec.double_aff(A)
+        S = ec.aff_from_jac(ec.jac_from_proj(ec.double_proj(QP)))
+        assert S == ec.double_aff(A)
+        minus_QP = QP[0], ec.p - QP[1], QP[2]
+        assert ec.jac_from_proj(ec.add_proj(QP, minus_QP)) == INFJ
+
+
+def test_mixed_add_and_specialised_double_jac() -> None:
+    "Test mixed Jacobian-affine addition and a=0 / a=-3 doubling."
+
+    assert secp256k1._a_is_zero
+    for ec_name in ("secp256r1", "secp384r1", "secp521r1"):
+        assert CURVES[ec_name]._a_is_minus_3
+    assert not CURVES["bpp256r1"]._a_is_zero
+    assert not CURVES["bpp256r1"]._a_is_minus_3
+
+    for ec in all_curves.values():
+        # random points, not INF, with Z != 1
+        QJ = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+        RJ = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+        Q, R = ec.aff_from_jac_batch([QJ, RJ])
+        QJ_norm, RJ_norm, INFJ_norm = ec.normalize_jac_batch([QJ, RJ, INFJ])
+        assert QJ_norm == jac_from_aff(Q)
+        assert RJ_norm == jac_from_aff(R)
+        assert INFJ_norm == INFJ
+
+        S = ec.add_aff(Q, R)
+        for add in (ec.add_jac, ec.add_jac_vartime):
+            for Q1 in (QJ, QJ_norm):
+                for R1 in (RJ, RJ_norm):
+                    assert S == ec.aff_from_jac(add(Q1, R1))
+                assert ec.double_aff(Q) == ec.aff_from_jac(add(Q1, QJ_norm))
+                assert ec.double_aff(Q) == ec.aff_from_jac(add(QJ, Q1))
+                assert ec.double_aff(Q) == ec.aff_from_jac(ec.double_jac(Q1))
+                assert INF == ec.aff_from_jac(add(Q1, ec.negate_jac(QJ_norm)))
+                assert Q == ec.aff_from_jac(add(Q1, INFJ))
+                assert Q == ec.aff_from_jac(add(INFJ, Q1))
+
+
 def test_add_double_aff_jac() -> None:
     "Test consistency between affine and Jacobian add/double methods."
     for ec in all_curves.values():
@@ -189,6 +319,59 @@ def test_add_double_aff_jac() -> None:
         assert ec.jac_equality(RJ, ec.add_jac(QJ, QJ))
 
 
+def test_curve_registries() -> None:
+    assert CURVES["secp256k1"] is secp256k1
+    assert SEC2v1["secp256k1"] is secp256k1
+    assert SEC2v2["secp256k1"] is secp256k1
+    assert SEC2v1["secp256r1"] is CURVES["secp256r1"]
+
+    assert len(CURVES) == len(SEC2v1) + len(NIST) + len(Brainpool)
+    assert set(SEC2v2) < set(SEC2v1)
+    assert "secp112r1" not in SEC2v2
+    assert "nistp256" in CURVES
+    assert "nistp256" not in SEC2v1
+    assert "bpp256r1" in Brainpool
+    assert list(CURVES)[0] == "secp112r1"
+    assert "secp256k1" in repr(SEC2v2)
+
+    with pytest.raises(KeyError):
+        CURVES["secp256k2"]
+
+    # registered curves are pickled by name
+    for ec in (secp256k1, CURVES["secp256r1"], Brainpool["bpp160r1"]):
+        assert pickle.loads(pickle.dumps(ec)) is ec
+    ec = low_card_curves["ec13_11"]
+    ec2 = pickle.loads(pickle.dumps(ec))
+    assert ec2 is not ec and repr(ec2) == repr(ec)
+
+
+def test_trusted_curve() -> None:
+    "Test that the pre-validated secp256k1 matches the validated one."
+
+    ec = Curve(
+        secp256k1.p,
+        0,
+        7,
+        secp256k1.G,
+        secp256k1.n,
+        1,
+        name="secp256k1",
+        endomorphism=ENDOMORPHISMS["secp256k1"],
+    )
+    assert repr(ec) == repr(secp256k1)
+    assert ec.endomorphism is not None and secp256k1.endomorphism is not None
+    assert vars(ec.endomorphism) == vars(secp256k1.endomorphism)
+
+    # trusted curves skip the group order check
+    with pytest.raises(BTClibValueError, match="n is not the group order: "):
+        Curve(13, 0, 2, (1, 9), 17, 1, False)
+    Curve(13, 0, 2, (1, 9), 17, 1, False, trusted=True)
+    # and the endomorphism checks
+    with pytest.raises(BTClibValueError, match="lambda is not a cube root"):
+        Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(2, 3))
+    Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(2, 3), trusted=True)
+
+
 def test_ec_repr() -> None:
     for ec in all_curves.values():
         ec_repr = repr(ec)
@@ -310,6 +493,44 @@ def test_symmetry() -> None:
         secp256k1.y_quadratic_residue(INF[0])
 
 
+def test_mult_generator() -> None:
+    for ec in all_curves.values():
+        assert ec.jac_equality(_mult_generator(0, ec), INFJ)
+        assert ec.jac_equality(_mult_generator(1, ec), ec.GJ)
+        assert ec.jac_equality(_mult_generator(ec.n - 1, ec), ec.negate_jac(ec.GJ))
+        for _ in range(4):
+            q = secrets.randbelow(ec.n)
+            QJ = _mult_generator(q, ec)
+            assert ec.jac_equality(QJ, _mult(q, ec.GJ, ec))
+            Q = ec.aff_from_jac(QJ)
+            assert Q == mult(q, ec=ec)
+            assert Q == mult(q, ec.G, ec)
+            assert Q == mult(q + ec.n, ec.G, ec)
+
+    ec = ec23_31
+    for q in range(ec.n):
+        assert ec.jac_equality(_mult_generator(q, ec), _mult(q, ec.GJ, ec))
+
+
+def test_mult_batch() -> None:
+    for ec in all_curves.values():
+        assert mult_batch([], ec=ec) == []
+        scalars = [secrets.randbelow(ec.n) for _ in range(6)]
+        scalars += [0, 1, ec.n, ec.n - 1, 2 * ec.n + 1]
+        Q = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+        for P in (ec.G, Q):
+            assert mult_batch(scalars, P, ec) == [mult(m, P, ec) for m in scalars]
+        assert mult_batch(scalars, ec=ec) == mult_batch(scalars, ec.G, ec)
+
+    ec = ec23_31
+    scalars = list(range(ec.n))
+    assert mult_batch(scalars, ec=ec) == [mult(m, ec.G, ec) for m in scalars]
+
+    err_msg = "point not on curve"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        mult_batch([1, 2], (1, 1), ec)
+
+
 @pytest.mark.fifth
 def test_assorted_mult() -> None:
     ec = ec23_31
@@ -361,6 +582,92 @@ def test_assorted_mult() -> None:
                 multi_mult([k1, k2, k3, k4], [ec.G, H, ec.G], ec)
 
 
+def test_double_mult_vartime() -> None:
+    for ec in all_curves.values():
+        HJ = second_generator(ec) + (1,)
+        u = secrets.randbelow(ec.n)
+        v = secrets.randbelow(ec.n)
+        uGJ = _mult(u, ec.GJ, ec)
+        vGJ = _mult(v, ec.GJ, ec)
+        vHJ = _mult(v, HJ, ec)
+        QJ = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+        exp = ec.add_jac(_mult(u, QJ, ec), vGJ)
+        assert ec.jac_equality(_double_mult_vartime(u, QJ, v, ec.GJ, ec), exp)
+        exp = ec.add_jac(uGJ, vHJ)
+        assert ec.jac_equality(_double_mult_vartime(u, ec.GJ, v, HJ, ec), exp)
+        exp = ec.add_jac(uGJ, vGJ)
+        assert ec.jac_equality(_double_mult_vartime(u, ec.GJ, v, ec.GJ, ec), exp)
+        R = _double_mult_vartime(u, INFJ, v, ec.GJ, ec)
+        assert ec.jac_equality(R, vGJ)
+        R = _double_mult_vartime(u, ec.GJ, v, INFJ, ec)
+        assert ec.jac_equality(R, uGJ)
+
+        with pytest.raises(BTClibValueError, match="negative first coefficient: "):
+            _double_mult_vartime(-1, HJ, 1, ec.GJ, ec)
+        with pytest.raises(BTClibValueError, match="negative second coefficient: "):
+            _double_mult_vartime(1, HJ, -1, ec.GJ, ec)
+
+    ec = ec23_31
+    HJ = second_generator(ec) + (1,)
+    for u in range(ec.n):
+        for v in range(ec.n):
+            exp = _double_mult(u, HJ, v, ec.GJ, ec)
+            assert ec.jac_equality(_double_mult_vartime(u, HJ, v, ec.GJ, ec), exp)
+
+
+def test_register_pub_key() -> None:
+    for ec in (secp256k1, CURVES["secp256r1"], ec23_31):
+        H = second_generator(ec)
+        Q = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+        QJ = jac_from_aff(Q)
+        u = secrets.randbelow(ec.n)
+        v = secrets.randbelow(ec.n)
+        exp = _double_mult(u, QJ, v, ec.GJ, ec)
+        assert ec.jac_equality(_double_mult_vartime(u, QJ, v, ec.GJ, ec), exp)
+
+        register_pub_key(Q, ec)
+        register_pub_key(H, ec)
+        assert cached_multiples_fixwind.is_cached(QJ, ec, FIXED_BASE_W)
+        hits = cached_multiples_fixwind.stats().hits
+        assert ec.jac_equality(_double_mult_vartime(u, QJ, v, ec.GJ, ec), exp)
+        assert cached_multiples_fixwind.stats().hits == hits + 2
+        assert ec.jac_equality(_double_mult_vartime(v, ec.GJ, u, QJ, ec), exp)
+        exp = _double_mult(u, QJ, v, H + (1,), ec)
+        assert ec.jac_equality(_double_mult_vartime(u, QJ, v, H + (1,), ec), exp)
+
+        unregister_pub_key(Q, ec)
+        unregister_pub_key(H, ec)
+        cached_multiples_fixwind.clear()
+        assert not cached_multiples_fixwind.is_cached(QJ, ec, FIXED_BASE_W)
+
+    with pytest.raises(BTClibValueError, match="point not on curve"):
+        register_pub_key((1, 1))
+    with pytest.raises(BTClibValueError, match="INF point cannot be registered"):
+        register_pub_key(INF)
+
+
+def test_multi_mult_vartime() -> None:
+    # Strauss, Bos-Coster, and Pippenger
+    for ec, sizes in ((secp256k1, (1, 8, 100)), (ec23_31, (1, 8, 100, 1100))):
+        HJ = second_generator(ec) + (1,)
+        for size in sizes:
+            points = [ec.GJ, HJ] * size
+            scalars = [secrets.randbelow(ec.n) for _ in points]
+            R = _multi_mult_vartime(scalars, points, ec)
+            u = sum(scalars[::2])
+            v = sum(scalars[1::2])
+            assert ec.jac_equality(R, _double_mult(u % ec.n, ec.GJ, v % ec.n, HJ, ec))
+
+        assert ec.jac_equality(INFJ, _multi_mult_vartime([], [], ec))
+
+        err_msg = "mismatch between number of scalars and points: "
+        with pytest.raises(BTClibValueError, match=err_msg):
+            _multi_mult_vartime([1, 2, 3], [ec.GJ, HJ], ec)
+
+        with pytest.raises(BTClibValueError, match="negative coefficient: "):
+            _multi_mult_vartime([1, -2], [ec.GJ, HJ], ec)
+
+
 def test_double_mult() -> None:
     H = second_generator(secp256k1)
     G = secp256k1.G
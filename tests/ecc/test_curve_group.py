@@ -236,47 +236,47 @@ def test_multiples() -> None:
     T = [INFJ, ec.GJ]
     M = multiples(ec.GJ, 2, ec)
     assert len(M) == 2
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.double_jac(ec.GJ))
     M = multiples(ec.GJ, 3, ec)
     assert len(M) == 3
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.add_jac(T[-1], ec.GJ))
     M = multiples(ec.GJ, 4, ec)
     assert len(M) == 4
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.double_jac(T[2]))
     M = multiples(ec.GJ, 5, ec)
     assert len(M) == 5
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.add_jac(T[-1], ec.GJ))
     M = multiples(ec.GJ, 6, ec)
     assert len(M) == 6
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.double_jac(T[3]))
     M = multiples(ec.GJ, 7, ec)
     assert len(M) == 7
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.add_jac(T[-1], ec.GJ))
     M = multiples(ec.GJ, 8, ec)
     assert len(M) == 8
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.double_jac(T[4]))
     M = multiples(ec.GJ, 9, ec)
     assert len(M) == 9
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
     T.append(ec.add_jac(T[-1], ec.GJ))
     M = multiples(ec.GJ, 10, ec)
     assert len(M) == 10
-    assert M == T
+    assert M == ec.normalize_jac_batch(T)
 
 
 def test_mult_fixed_window() -> None:
@@ -9,21 +9,42 @@
 
 "Tests for the `btclib.curve_group_2` module."
 
+import secrets
+
 import pytest
 
 from btclib.alias import INFJ
-from btclib.ecc.curve import secp256k1
-from btclib.ecc.curve_group import _mult
+from btclib.ecc.curve import CURVES, Curve, secp256k1
+from btclib.ecc.curve_group import _mult, _multi_mult, jac_from_aff
 from btclib.ecc.curve_group_2 import (
+    Endomorphism,
+    _multi_mult_pippenger,
+    _multi_mult_w_NAF,
+    _pippenger_window,
+    _signed_digits,
+    glv_lattice_basis,
+    mult_endomorphism,
+    mult_endomorphism_fixed_window,
     mult_endomorphism_secp256k1,
     mult_sliding_window,
     mult_w_NAF,
+    mult_x_ladder,
+    w_NAF_multiples,
 )
+from btclib.ecc.number_theory import mod_inv
+from btclib.ecc.pedersen import second_generator
 from btclib.exceptions import BTClibValueError
-from tests.ecc.test_curve import low_card_curves
+from tests.ecc.test_curve import all_curves, low_card_curves
 
 ec23_31 = low_card_curves["ec23_31"]
 
+# curves with efficiently computable endomorphism
+glv_curves = [
+    Curve(13, 0, 2, (1, 9), 19, 1, False, endomorphism=(7, 9)),
+    Curve(19, 0, 2, (4, 16), 13, 2, False, endomorphism=(3, 11)),
+]
+glv_curves += [ec for ec in CURVES.values() if ec.endomorphism]
+
 
 def test_mult_sliding_window() -> None:
     for w in range(1, 6):
@@ -109,3 +130,180 @@ def test_mult_endomorphism_secp256k1() -> None:
 
     with pytest.raises(ValueError, match="negative m: "):
         mult_endomorphism_secp256k1(-1, ec.GJ, ec)
+
+
+def test_multi_mult_w_NAF() -> None:
+    for w in range(2, 7):
+        for ec in low_card_curves.values():
+            T = w_NAF_multiples(ec.GJ, w, ec)
+            assert len(T) == 2 ** (w - 2)
+            for i, PJ in enumerate(T):
+                assert ec.jac_equality(PJ, _mult(2 * i + 1, ec.GJ, ec))
+
+            H = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+            TH = w_NAF_multiples(H, 8 - w, ec)
+            for k1 in range(-ec.n, ec.n):
+                k2 = secrets.randbelow(ec.n)
+                exp = ec.add_jac(_mult(k1 % ec.n, ec.GJ, ec), _mult(k2, H, ec))
+                R = _multi_mult_w_NAF([k1, k2], [T, TH], ec)
+                assert ec.jac_equality(R, exp)
+
+    ec = secp256k1
+    T = w_NAF_multiples(ec.GJ, 5, ec)
+    assert ec.jac_equality(_multi_mult_w_NAF([], [], ec), INFJ)
+    assert ec.jac_equality(_multi_mult_w_NAF([0], [T], ec), INFJ)
+    assert ec.jac_equality(_multi_mult_w_NAF([ec.n], [T], ec), INFJ)
+
+    with pytest.raises(BTClibValueError, match="w too low: "):
+        w_NAF_multiples(ec.GJ, 1, ec)
+
+    err_msg = "mismatch between number of scalars and tables: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        _multi_mult_w_NAF([1, 2], [T], ec)
+
+
+def test_glv_decomposition() -> None:
+    # secp256k1 basis, as in D. Hankerson,
+    # 'Guide to Elliptic Curve Cryptography', example 3.73
+    ec = secp256k1
+    assert ec.endomorphism is not None
+    a1, b1, a2, b2 = glv_lattice_basis(ec.endomorphism.lam, ec.n)
+    assert a1 == 0x3086D221A7D46BCDE86C90E49284EB15
+    assert b1 == -0xE4437ED6010E88286F547FA90ABFE4C3
+    assert a2 == 0x114CA50F7A8E2F3F657C1108D9D44CFD8
+    assert b2 == 0x3086D221A7D46BCDE86C90E49284EB15
+
+    for ec in glv_curves:
+        endo = ec.endomorphism
+        assert isinstance(endo, Endomorphism)
+        assert (endo.a1 + endo.b1 * endo.lam) % ec.n == 0
+        assert (endo.a2 + endo.b2 * endo.lam) % ec.n == 0
+        phi_GJ = endo.map_jac(ec.GJ, ec)
+        assert ec.jac_equality(phi_GJ, _mult(endo.lam, ec.GJ, ec))
+        for _ in range(10):
+            m = secrets.randbelow(ec.n)
+            m1, m2 = endo.decompose(m)
+            assert (m1 + m2 * endo.lam - m) % ec.n == 0
+            assert abs(m1).bit_length() <= ec.nlen // 2 + 2
+            assert abs(m2).bit_length() <= ec.nlen // 2 + 2
+            assert abs(m1).bit_length() <= endo.nbits
+            assert abs(m2).bit_length() <= endo.nbits
+
+
+def test_mult_endomorphism() -> None:
+    for ec in glv_curves:
+        endo = ec.endomorphism
+        assert endo is not None
+        assert ec.jac_equality(mult_endomorphism(0, ec.GJ, ec, endo), INFJ)
+        assert ec.jac_equality(mult_endomorphism(0, INFJ, ec, endo), INFJ)
+        assert ec.jac_equality(mult_endomorphism(1, INFJ, ec, endo), INFJ)
+        assert ec.jac_equality(mult_endomorphism(1, ec.GJ, ec, endo), ec.GJ)
+
+        PJ = mult_endomorphism(ec.n - 1, ec.GJ, ec, endo)
+        assert ec.jac_equality(ec.negate_jac(ec.GJ), PJ)
+        assert ec.jac_equality(mult_endomorphism(ec.n, ec.GJ, ec, endo), INFJ)
+
+        QJ = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+        for w in range(2, 7):
+            m = secrets.randbelow(ec.n)
+            PJ = mult_endomorphism(m, QJ, ec, endo, w)
+            assert ec.jac_equality(PJ, _mult(m, QJ, ec))
+
+        with pytest.raises(BTClibValueError, match="negative m: "):
+            mult_endomorphism(-1, ec.GJ, ec, endo)
+
+    for ec in glv_curves[:2]:
+        endo = ec.endomorphism
+        assert endo is not None
+        for m in range(ec.n):
+            PJ = mult_endomorphism(m, ec.GJ, ec, endo)
+            assert ec.jac_equality(PJ, _mult(m, ec.GJ, ec))
+
+
+def test_mult_endomorphism_fixed_window() -> None:
+    for ec in glv_curves:
+        endo = ec.endomorphism
+        assert endo is not None
+        for m in (0, 1, ec.n - 1, ec.n):
+            PJ = mult_endomorphism_fixed_window(m, ec.GJ, ec, endo)
+            assert ec.jac_equality(PJ, _mult(m, ec.GJ, ec))
+        assert ec.jac_equality(mult_endomorphism_fixed_window(1, INFJ, ec, endo), INFJ)
+
+        QJ = _mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec)
+        for w in range(1, 7):
+            m = secrets.randbelow(ec.n)
+            PJ = mult_endomorphism_fixed_window(m, QJ, ec, endo, w)
+            assert ec.jac_equality(PJ, _mult(m, QJ, ec))
+
+        with pytest.raises(BTClibValueError, match="negative m: "):
+            mult_endomorphism_fixed_window(-1, ec.GJ, ec, endo)
+        with pytest.raises(BTClibValueError, match="non positive w: "):
+            mult_endomorphism_fixed_window(1, ec.GJ, ec, endo, 0)
+
+    for ec in glv_curves[:2]:
+        endo = ec.endomorphism
+        assert endo is not None
+        for m in range(ec.n):
+            PJ = mult_endomorphism_fixed_window(m, ec.GJ, ec, endo)
+            assert ec.jac_equality(PJ, _mult(m, ec.GJ, ec))
+
+
+def test_x_ladder() -> None:
+    for ec in low_card_curves.values():
+        x = ec.G[0]
+        assert mult_x_ladder(0, x, ec)[1] == 0
+        assert mult_x_ladder(ec.n, x, ec)[1] == 0
+        # INF as intermediate ladder step, too
+        for k in range(1, 2 * ec.n + 1):
+            X, Z = mult_x_ladder(k, x, ec)
+            if k % ec.n == 0:
+                assert Z == 0
+                continue
+            assert X * mod_inv(Z, ec.p) % ec.p == ec.x_aff_from_jac(_mult(k, ec.GJ, ec))
+
+        with pytest.raises(BTClibValueError, match="negative m: "):
+            mult_x_ladder(-1, x, ec)
+
+    for ec in all_curves.values():
+        m = 1 + secrets.randbelow(ec.n - 1)
+        Q = ec.aff_from_jac(_mult(m, ec.GJ, ec))
+        k = 1 + secrets.randbelow(ec.n - 1)
+        X, Z = mult_x_ladder(k, Q[0], ec)
+        assert X * mod_inv(Z, ec.p) % ec.p == ec.x_aff_from_jac(_mult(k * m, ec.GJ, ec))
+
+
+def test_multi_mult_pippenger() -> None:
+    assert _pippenger_window(1, 256) == 2
+    assert _pippenger_window(1000, 256) < _pippenger_window(100000, 256)
+
+    for c in range(2, 9):
+        for m in (0, 1, 2 ** c - 1, 2 ** c, secrets.randbits(256)):
+            n_digits = m.bit_length() // c + 1
+            digits = _signed_digits(m, c, n_digits)
+            assert all(-(2 ** (c - 1)) <= d <= 2 ** (c - 1) for d in digits)
+            assert m == sum(d * 2 ** (c * i) for i, d in enumerate(digits))
+
+    ec = ec23_31
+    HJ = jac_from_aff(second_generator(ec))
+    for size in (1, 2, 5, 40, 300):
+        points = [ec.GJ, HJ, INFJ] * size
+        scalars = [secrets.randbelow(ec.n) for _ in points]
+        exp = _multi_mult(scalars, points, ec)
+        assert ec.jac_equality(exp, _multi_mult_pippenger(scalars, points, ec))
+
+    for ec in (secp256k1, ec23_31):
+        assert ec.jac_equality(INFJ, _multi_mult_pippenger([], [], ec))
+        points = [ec.GJ, ec.negate_jac(ec.GJ)]
+        assert ec.jac_equality(INFJ, _multi_mult_pippenger([1, 1], points, ec))
+        assert ec.jac_equality(INFJ, _multi_mult_pippenger([0, 0], points, ec))
+        points = [_mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec) for _ in range(20)]
+        scalars = [secrets.randbelow(ec.n) for _ in points]
+        exp = _multi_mult(scalars, points, ec)
+        assert ec.jac_equality(exp, _multi_mult_pippenger(scalars, points, ec))
+
+    err_msg = "mismatch between number of scalars and points: "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        _multi_mult_pippenger([1, 2, 3], [ec.GJ, HJ], ec)
+
+    with pytest.raises(BTClibValueError, match="negative coefficient: "):
+        _multi_mult_pippenger([1, -2], [ec.GJ, HJ], ec)
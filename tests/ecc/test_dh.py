@@ -10,15 +10,22 @@
 
 "Tests for the `btclib.dh` module."
 
+import secrets
 from hashlib import sha1, sha224, sha256, sha384, sha512
 
 import pytest
 
-from btclib.ecc import dsa
+from btclib.alias import INF
+from btclib.ecc import dsa, libsecp256k1
 from btclib.ecc.curve import CURVES, mult
-from btclib.ecc.dh import ansi_x9_63_kdf, diffie_hellman
+from btclib.ecc.dh import (
+    ansi_x9_63_kdf,
+    ansi_x9_63_kdf_stream,
+    diffie_hellman,
+    diffie_hellman_batch,
+)
 from btclib.ecc.sec_point import bytes_from_point
-from btclib.exceptions import BTClibValueError
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
 
 
 def test_ecdh() -> None:
@@ -60,6 +67,46 @@ def test_ecdh() -> None:
         ansi_x9_63_kdf(z, size, hf, None)
 
 
+def test_ecdh_batch() -> None:
+    size = 32
+    shared_info = b"deadbeef"
+    enabled = libsecp256k1.is_enabled()
+    libsecp256k1.disable()
+    try:
+        # with and without efficiently computable endomorphism
+        for ec in (CURVES["secp256k1"], CURVES["secp256r1"], CURVES["secp160r1"]):
+            a, A = dsa.gen_keys(ec=ec)
+            keys = [dsa.gen_keys(ec=ec) for _ in range(4)]
+            QVs = [Q for _, Q in keys]
+            shared_keys = diffie_hellman_batch(a, QVs, size, shared_info, ec)
+            for (b, B), shared_key in zip(keys, shared_keys):
+                z = mult(a, B, ec)[0].to_bytes(ec.p_size, byteorder="big")
+                assert shared_key == ansi_x9_63_kdf(z, size, sha256, shared_info)
+                assert shared_key == diffie_hellman(b, A, size, shared_info, ec)
+            assert diffie_hellman_batch(a, [], size, shared_info, ec) == []
+
+            # the opposite key has the same x-coordinate
+            B = ec.negate(QVs[0])
+            assert diffie_hellman(a, B, size, shared_info, ec) == shared_keys[0]
+
+            with pytest.raises(BTClibValueError, match="point not on curve"):
+                diffie_hellman_batch(a, [QVs[0], (QVs[1][0], 1)], size, None, ec)
+            with pytest.raises(BTClibRuntimeError, match="invalid \\(INF\\) key"):
+                diffie_hellman_batch(a, [QVs[0], INF], size, None, ec)
+            with pytest.raises(BTClibRuntimeError, match="invalid \\(INF\\) key"):
+                diffie_hellman(ec.n, QVs[0], size, None, ec)
+    finally:
+        if enabled:
+            libsecp256k1.enable()
+
+    ec = CURVES["secp256k1"]
+    a, _ = dsa.gen_keys()
+    b, B = dsa.gen_keys()
+    assert diffie_hellman_batch(a, [B], size) == [diffie_hellman(a, B, size)]
+    with pytest.raises(BTClibRuntimeError, match="invalid \\(INF\\) key"):
+        diffie_hellman_batch(ec.n, [B], size)
+
+
 def test_gec_2() -> None:
     """GEC 2: Test Vectors for SEC 1, section 4.1
 
@@ -245,3 +292,16 @@ def test_capv() -> None:
             None if shared_info is None else bytes.fromhex(shared_info),
         )
         assert result == bytes.fromhex(key_data)
+
+
+def test_kdf_stream() -> None:
+    z = secrets.token_bytes(32)
+    for hf in (sha1, sha256, sha512):
+        hf_size = hf().digest_size
+        digests = ansi_x9_63_kdf_stream(z, hf, b"deadbeef")
+        key = b"".join(next(digests) for _ in range(10))
+        assert key == ansi_x9_63_kdf(z, 10 * hf_size, hf, b"deadbeef")
+        assert key[:-1] == ansi_x9_63_kdf(z, 10 * hf_size - 1, hf, b"deadbeef")
+        assert (
+            next(digests) == ansi_x9_63_kdf(z, 11 * hf_size, hf, b"deadbeef")[-hf_size:]
+        )
@@ -12,6 +12,7 @@
 
 import secrets
 from hashlib import sha1
+from typing import Optional, Sequence
 
 import pytest
 from coincurve._libsecp256k1 import (  # type: ignore # pylint: disable=no-name-in-module
@@ -19,16 +20,21 @@ from coincurve._libsecp256k1 import (  # type: ignore # pylint: disable=no-name-
     lib,
 )
 
-from btclib.alias import INF
-from btclib.ecc import dsa
+from btclib.alias import INF, Point
+from btclib.ecc import dsa, libsecp256k1
 from btclib.ecc.curve import CURVES, Curve, double_mult, mult
 from btclib.ecc.curve_group import _mult
+from btclib.ecc.der import Sig
 from btclib.ecc.number_theory import mod_inv
 from btclib.ecc.sec_point import bytes_from_point, point_from_octets
 from btclib.exceptions import BTClibRuntimeError, BTClibValueError
 from btclib.hashes import reduce_to_hlen
+from btclib.utils import int_from_bits
 from tests.ecc.test_curve import low_card_curves
 
+# run with the libsecp256k1 backend both disabled and enabled
+pytestmark = pytest.mark.usefixtures("libsecp256k1_backend")
+
 GLOBAL_CTX = ffi.gc(
     lib.secp256k1_context_create(
         lib.SECP256K1_CONTEXT_SIGN | lib.SECP256K1_CONTEXT_VERIFY
@@ -174,10 +180,13 @@ def test_gec() -> None:
 
 
 @pytest.mark.first
-def test_low_cardinality() -> None:
+def test_low_cardinality(libsecp256k1_backend: bool) -> None:
     """test low-cardinality curves for all msg/key pairs."""
     # pylint: disable=protected-access
 
+    if libsecp256k1_backend:
+        pytest.skip("low cardinality curves never use libsecp256k1")
+
     # ec.n has to be prime to sign
     test_curves = [
         low_card_curves["ec13_11"],
@@ -313,3 +322,103 @@ def test_forge_hash_sig() -> None:
     s = ec.n - s if s > ec.n / 2 else s
     e = s * u1 % ec.n
     dsa._assert_as_valid_(e, (Q[0], Q[1], 1), r, s, lower_s=True, ec=ec)
+
+
+def _key_id(msg_hash: bytes, Q: Point, sig: Sig) -> int:
+    "Return the recovery hint of the signature."
+
+    ec = sig.ec
+    c = int_from_bits(msg_hash, ec.nlen) % ec.n
+    w = mod_inv(sig.s, ec.n)
+    K = double_mult(c * w % ec.n, ec.G, sig.r * w % ec.n, Q, ec)
+    return (K[1] & 1) | (K[0] != sig.r) << 1
+
+
+def test_batch_verify() -> None:
+
+    enabled = libsecp256k1.is_enabled()
+    libsecp256k1.disable()
+    try:
+        for ec in (CURVES["secp256k1"], CURVES["secp256r1"]):
+            m_hashes, Qs, sigs, key_ids = [], [], [], []
+            for _ in range(6):
+                q, Q = dsa.gen_keys(ec=ec)
+                msg_hash = secrets.token_bytes(32)
+                sig = dsa.sign_(msg_hash, q, ec=ec)
+                m_hashes.append(msg_hash)
+                Qs.append(Q)
+                sigs.append(sig)
+                key_ids.append(_key_id(msg_hash, Q, sig))
+            assert dsa.batch_verify_(m_hashes, Qs, sigs, key_ids)
+            # missing hints
+            assert dsa.batch_verify_(m_hashes, Qs, sigs)
+            hints: Optional[Sequence[Optional[int]]]
+            hints = [None, *key_ids[1:3], None, *key_ids[4:]]
+            assert dsa.batch_verify_(m_hashes, Qs, sigs, hints)
+            # wrong hints: wrong y_K parity and x_K = r + n > p
+            hints = [key_ids[0] ^ 1, key_ids[1] | 2, *key_ids[2:]]
+            assert dsa.batch_verify_(m_hashes, Qs, sigs, hints)
+            assert dsa.batch_verify_(m_hashes[:1], Qs[:1], sigs[:1], key_ids[:1])
+            if ec == CURVES["secp256k1"]:
+                # serialized signatures
+                ders = [sig.serialize() for sig in sigs]
+                assert dsa.batch_verify_(m_hashes, Qs, ders, key_ids)
+
+            for hints in (key_ids, None):
+                err_msg = "signature verification failed"
+                invalid_hashes = [*m_hashes[:-1], m_hashes[0]]
+                assert not dsa.batch_verify_(invalid_hashes, Qs, sigs, hints)
+                with pytest.raises(BTClibRuntimeError, match=err_msg):
+                    dsa.assert_batch_as_valid_(invalid_hashes, Qs, sigs, hints)
+                high_s = Sig(sigs[2].r, ec.n - sigs[2].s, ec)
+                invalid_sigs = [*sigs[:2], high_s, *sigs[3:]]
+                with pytest.raises(BTClibValueError, match="not a low s"):
+                    dsa.assert_batch_as_valid_(m_hashes, Qs, invalid_sigs, hints)
+                if hints is not None:
+                    hints = [*key_ids[:2], key_ids[2] ^ 1, *key_ids[3:]]
+                assert dsa.batch_verify_(m_hashes, Qs, invalid_sigs, hints, False)
+
+        ec = low_card_curves["ec23_19"]
+        m_hashes, Qs, sigs, key_ids = [], [], [], []
+        for q in range(1, ec.n):
+            Q = mult(q, ec.G, ec)
+            for k in range(1, ec.n):
+                msg_hash = secrets.token_bytes(32)
+                c = int_from_bits(msg_hash, ec.nlen) % ec.n
+                try:
+                    sig = dsa._sign_(c, q, k, True, ec)
+                except BTClibRuntimeError:
+                    continue
+                m_hashes.append(msg_hash)
+                Qs.append(Q)
+                sigs.append(sig)
+                key_ids.append(_key_id(msg_hash, Q, sig))
+        # some x_K = r + n
+        assert any(key_id & 2 for key_id in key_ids)
+        assert dsa.batch_verify_(m_hashes, Qs, sigs, key_ids)
+    finally:
+        if enabled:
+            libsecp256k1.enable()
+
+    msg = "Satoshi Nakamoto".encode()
+    q, Q = dsa.gen_keys()
+    sig = dsa.sign(msg, q)
+    assert dsa.batch_verify([msg, msg], [Q, Q], [sig, sig], [0, 1])
+    assert not dsa.batch_verify([msg, b"Craig Wright"], [Q, Q], [sig, sig])
+
+    err_msg = "no signatures provided"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        dsa.assert_batch_as_valid([], [], [])
+    err_msg = "mismatch between number of pub_keys "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        dsa.assert_batch_as_valid([msg], [Q, Q], [sig, sig])
+    with pytest.raises(BTClibValueError, match=err_msg):
+        dsa.assert_batch_as_valid([msg, msg], [Q, Q], [sig])
+    with pytest.raises(BTClibValueError, match=err_msg):
+        dsa.assert_batch_as_valid([msg, msg], [Q, Q], [sig, sig], [0])
+    ec = CURVES["secp256r1"]
+    q2, Q2 = dsa.gen_keys(ec=ec)
+    sig2 = dsa.sign(msg, q2, ec=ec)
+    err_msg = "not the same curve for all signatures"
+    with pytest.raises(BTClibValueError, match=err_msg):
+        dsa.assert_batch_as_valid([msg, msg], [Q, Q2], [sig, sig2])
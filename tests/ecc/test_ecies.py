@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.ecies` module."
+
+import secrets
+import tracemalloc
+from hashlib import sha512
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO
+
+import pytest
+
+from btclib.ecc import dsa
+from btclib.ecc.curve import CURVES
+from btclib.ecc.ecies import (
+    SPOOL_MAX_SIZE,
+    decrypt,
+    decrypt_stream,
+    encrypt,
+    encrypt_stream,
+)
+from btclib.exceptions import BTClibValueError
+
+
+def test_ecies() -> None:
+    q, Q = dsa.gen_keys()
+    for size in (0, 1, 31, 32, 33, 1000):
+        msg = secrets.token_bytes(size)
+        ciphertext = encrypt(Q, msg)
+        assert len(ciphertext) == 33 + size + 32
+        assert decrypt(q, ciphertext) == msg
+        assert decrypt(q, ciphertext.hex()) == msg
+
+    shared_info = b"deadbeef"
+    ciphertext = encrypt(Q, msg, shared_info)
+    assert decrypt(q, ciphertext, shared_info) == msg
+    with pytest.raises(BTClibValueError, match="invalid HMAC tag"):
+        decrypt(q, ciphertext)
+    with pytest.raises(BTClibValueError, match="invalid HMAC tag"):
+        decrypt(q, ciphertext, b"deadbeed")
+    with pytest.raises(BTClibValueError, match="invalid HMAC tag"):
+        decrypt(dsa.gen_keys()[0], ciphertext, shared_info)
+    tampered = bytearray(ciphertext)
+    tampered[40] ^= 1
+    with pytest.raises(BTClibValueError, match="invalid HMAC tag"):
+        decrypt(q, bytes(tampered), shared_info)
+    with pytest.raises(BTClibValueError, match="ciphertext too short"):
+        decrypt(q, ciphertext[: 33 + 31])
+
+    ec = CURVES["secp256r1"]
+    q, Q = dsa.gen_keys(ec=ec)
+    ciphertext = encrypt(Q, msg, None, ec, sha512)
+    assert len(ciphertext) == 33 + len(msg) + 64
+    assert decrypt(q, ciphertext, None, ec, sha512) == msg
+
+
+def test_ecies_stream() -> None:
+    q, Q = dsa.gen_keys()
+    msg = secrets.token_bytes(3000)
+    src, dst = BytesIO(msg), BytesIO()
+    # chunks not aligned to the digest and tag sizes
+    encrypt_stream(Q, src, dst, chunk_size=97)
+    ciphertext = dst.getvalue()
+    assert decrypt(q, ciphertext) == msg
+    for chunk_size in (1, 31, 97, 5000):
+        dst = BytesIO()
+        decrypt_stream(q, BytesIO(ciphertext), dst, chunk_size=chunk_size)
+        assert dst.getvalue() == msg
+
+
+class _Unseekable(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+
+def test_ecies_stream_unauthenticated() -> None:
+    q, Q = dsa.gen_keys()
+    msg = secrets.token_bytes(3000)
+    ciphertext = encrypt(Q, msg)
+    for stream in (BytesIO, _Unseekable):
+        for chunk_size in (1, 97, 5000):
+            dst = BytesIO()
+            decrypt_stream(q, stream(ciphertext), dst, chunk_size=chunk_size)
+            assert dst.getvalue() == msg
+
+            # nothing is written before the tag has been verified
+            tampered = bytearray(ciphertext)
+            tampered[40] ^= 1
+            dst = BytesIO()
+            with pytest.raises(BTClibValueError, match="invalid HMAC tag"):
+                decrypt_stream(q, stream(tampered), dst, chunk_size=chunk_size)
+            assert dst.getvalue() == b""
+
+            dst = BytesIO()
+            with pytest.raises(BTClibValueError, match="ciphertext too short"):
+                decrypt_stream(q, stream(ciphertext[: 33 + 31]), dst)
+            assert dst.getvalue() == b""
+
+
+class _UnseekableFile:
+    "Non-seekable stream reading from a file."
+
+    def __init__(self, file: BinaryIO) -> None:
+        self.read = file.read
+
+    @staticmethod
+    def seekable() -> bool:
+        return False
+
+
+class _Sink:
+    "Stream only counting the bytes written."
+
+    def __init__(self) -> None:
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        return len(data)
+
+
+def test_ecies_large_unseekable_stream(tmp_path: Path) -> None:
+    q, Q = dsa.gen_keys()
+    size = 8 * SPOOL_MAX_SIZE
+    filename = tmp_path / "ciphertext.bin"
+    with open(filename, "wb") as dst:
+        encrypt_stream(Q, BytesIO(bytes(size)), dst)
+
+    sink = _Sink()
+    tracemalloc.start()
+    try:
+        with open(filename, "rb") as src:
+            decrypt_stream(q, _UnseekableFile(src), sink)  # type: ignore
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert sink.size == size
+    # the encrypted message is not buffered in memory
+    assert peak < 2 * SPOOL_MAX_SIZE
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.libsecp256k1` module."
+
+import secrets
+from hashlib import sha1, sha256
+from typing import Any, Callable
+
+import pytest
+
+from btclib.alias import INF
+from btclib.bip32.bip32 import derive, rootxprv_from_seed, xpub_from_xprv
+from btclib.ecc import dsa, libsecp256k1, ssa
+from btclib.ecc.curve import CURVES, mult, secp256k1
+from btclib.exceptions import BTClibRuntimeError, BTClibValueError
+
+pytestmark = pytest.mark.skipif(
+    not libsecp256k1.is_available(), reason="libsecp256k1 backend not available"
+)
+
+
+def _both_paths(f: Callable[[], Any]) -> Any:
+    "Return f() after checking it is the same with and without the backend."
+
+    assert libsecp256k1.is_enabled()
+    result = f()
+    libsecp256k1.disable()
+    try:
+        assert not libsecp256k1.is_enabled()
+        assert result == f()
+    finally:
+        libsecp256k1.enable()
+    return result
+
+
+def test_switch() -> None:
+    assert libsecp256k1.is_available()
+    assert libsecp256k1.is_enabled()
+    libsecp256k1.disable()
+    assert not libsecp256k1.is_enabled()
+    libsecp256k1.enable()
+    assert libsecp256k1.is_enabled()
+
+
+def test_mult() -> None:
+    ec = secp256k1
+    Q = mult(1 + secrets.randbelow(ec.n - 1))
+    for m in (0, 1, 2, ec.n - 1, ec.n, ec.n + 1, secrets.randbelow(ec.n), -1):
+        _both_paths(lambda: mult(m))
+        _both_paths(lambda: mult(m, ec.G))
+        _both_paths(lambda: mult(m, Q))
+        assert _both_paths(lambda: mult(m, INF)) == INF
+
+    with pytest.raises(BTClibValueError, match="point not on curve"):
+        mult(1, (1, 1))
+
+    # other curves are not affected
+    ec = CURVES["secp256r1"]
+    assert mult(2, ec.G, ec) == ec.double_aff(ec.G)
+
+
+def test_dsa() -> None:
+    ec = secp256k1
+    msg_hash = sha256(b"Satoshi Nakamoto").digest()
+    q, Q = dsa.gen_keys()
+
+    sig = _both_paths(lambda: dsa.sign_(msg_hash, q))
+    assert _both_paths(lambda: dsa.verify_(msg_hash, Q, sig))
+    keys = dsa.recover_pub_keys_(msg_hash, sig)
+    assert Q in keys
+    for key_id in (0, 1):
+        try:
+            Q_rec = _both_paths(lambda: dsa.recover_pub_key_(key_id, msg_hash, sig))
+        except BTClibRuntimeError:
+            pass
+        else:
+            assert Q_rec in keys
+
+    # high-s signatures
+    malleated_sig = dsa.Sig(sig.r, ec.n - sig.s)
+    assert not _both_paths(lambda: dsa.verify_(msg_hash, Q, malleated_sig))
+    assert _both_paths(lambda: dsa.verify_(msg_hash, Q, malleated_sig, False))
+    with pytest.raises(BTClibValueError, match="not a low s"):
+        dsa.assert_as_valid_(msg_hash, Q, malleated_sig)
+    with pytest.raises(BTClibValueError, match="not a low s"):
+        dsa.recover_pub_key_(0, msg_hash, malleated_sig)
+    keys = dsa.recover_pub_keys_(msg_hash, malleated_sig, False)
+    assert Q in keys
+    for key_id in (0, 1):
+        try:
+            Q_rec = _both_paths(
+                lambda: dsa.recover_pub_key_(key_id, msg_hash, malleated_sig, False)
+            )
+        except BTClibRuntimeError:
+            pass
+        else:
+            assert Q_rec in keys
+
+    # the backend is not used for explicit nonce, other hash functions...
+    nonce = 1 + secrets.randbelow(ec.n - 1)
+    _both_paths(lambda: dsa.sign_(msg_hash, q, nonce))
+    _both_paths(lambda: dsa.sign_(msg_hash, q, lower_s=False))
+    sig1 = _both_paths(lambda: dsa.sign_(msg_hash[:20], q, hf=sha1))
+    assert dsa.verify_(msg_hash[:20], Q, sig1, hf=sha1)
+
+    # ...and wrong signatures are rejected by both paths
+    _, Q_fake = dsa.gen_keys()
+    assert not _both_paths(lambda: dsa.verify_(msg_hash, Q_fake, sig))
+    err_msg = "signature verification failed"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        dsa.assert_as_valid_(msg_hash, Q_fake, sig)
+
+
+def test_ssa() -> None:
+    msg_hash = sha256(b"Satoshi Nakamoto").digest()
+    q, x_Q = ssa.gen_keys()
+
+    sig = ssa.sign_(msg_hash, q)
+    assert _both_paths(lambda: ssa.verify_(msg_hash, x_Q, sig))
+    # BIP340 deterministic nonce
+    nonce = ssa.det_nonce_(msg_hash, q, aux=b"\x00" * 32)
+    _both_paths(lambda: ssa.sign_(msg_hash, q, nonce))
+
+    libsecp256k1.disable()
+    try:
+        sig = ssa.sign_(msg_hash, q)
+    finally:
+        libsecp256k1.enable()
+    assert ssa.verify_(msg_hash, x_Q, sig)
+
+    _, x_Q_fake = ssa.gen_keys()
+    assert not _both_paths(lambda: ssa.verify_(msg_hash, x_Q_fake, sig))
+    err_msg = "signature verification failed"
+    with pytest.raises(BTClibRuntimeError, match=err_msg):
+        ssa.assert_as_valid_(msg_hash, x_Q_fake, sig)
+
+
+def test_bip32() -> None:
+    rootxprv = rootxprv_from_seed(secrets.token_bytes(32))
+    rootxpub = xpub_from_xprv(rootxprv)
+    for der_path in ("m/0/1/2", "m/0h/1/2h/3", "m/1/2/3/4/5/6/7/8/9"):
+        xprv = _both_paths(lambda: derive(rootxprv, der_path))
+        xpub = xpub_from_xprv(xprv)
+        if "h" not in der_path:
+            assert _both_paths(lambda: derive(rootxpub, der_path)) == xpub
@@ -10,9 +10,11 @@
 
 "Tests for the `btclib.number_theory` module."
 
+from math import gcd
+
 import pytest
 
-from btclib.ecc.number_theory import mod_inv, mod_sqrt, tonelli
+from btclib.ecc.number_theory import batch_mod_inv, mod_inv, mod_sqrt, tonelli
 from btclib.exceptions import BTClibValueError
 
 primes = [
@@ -86,6 +88,27 @@ def test_mod_inv() -> None:
                     mod_inv(a, m)
 
 
+def test_batch_mod_inv() -> None:
+    assert batch_mod_inv([], 7) == []
+    for p in primes:
+        nums = list(range(1, min(p, 500)))
+        assert batch_mod_inv(nums, p) == [mod_inv(a, p) for a in nums]
+        nums = [a + p for a in nums[::-1]]
+        assert batch_mod_inv(nums, p) == [mod_inv(a, p) for a in nums]
+
+    for m in range(2, 100):
+        nums = list(range(1, m))
+        invertible = [a for a in nums if gcd(a, m) == 1]
+        assert batch_mod_inv(invertible, m) == [mod_inv(a, m) for a in invertible]
+        if len(invertible) < len(nums):
+            err_msg = "No inverse for "
+            with pytest.raises(BTClibValueError, match=err_msg):
+                batch_mod_inv(nums, m)
+
+    with pytest.raises(BTClibValueError, match="No inverse for 0 mod"):
+        batch_mod_inv([1, 2, 0, 3], 7)
+
+
 def test_mod_sqrt() -> None:
     for p in primes[:30]:  # exhaustable only for small p
         has_root = {0, 1}
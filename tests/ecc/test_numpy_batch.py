@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.numpy_batch` module."
+
+import secrets
+
+import pytest
+
+from btclib.alias import INF, INFJ
+from btclib.ecc import numpy_batch as nb
+from btclib.ecc.curve import (
+    CURVES,
+    _multi_mult_vartime,
+    mult,
+    mult_batch,
+    multi_mult,
+    secp256k1,
+)
+from btclib.ecc.curve_group import _mult, jac_from_aff
+from btclib.ecc.curve_group_2 import _multi_mult_pippenger
+
+pytestmark = pytest.mark.skipif(
+    not nb.is_available(), reason="numpy batch engine not available"
+)
+
+ec = secp256k1
+
+
+def test_switch() -> None:
+    assert not nb.is_enabled()
+    nb.enable()
+    assert nb.is_enabled()
+    nb.disable()
+    assert not nb.is_enabled()
+
+    assert nb.supports(secp256k1)
+    assert not nb.supports(CURVES["secp256r1"])
+
+
+def test_field() -> None:
+    p = nb.P
+    xs = [0, 1, 2, p - 1, p - 2, 2 ** 255, 2 ** 32 + 977]
+    xs += [secrets.randbelow(p) for _ in range(32)]
+    ys = xs[::-1]
+    a, b = nb.from_ints(xs), nb.from_ints(ys)
+    assert nb.to_ints(a) == xs
+
+    assert nb.to_ints(nb.add(a, b)) == [(x + y) % p for x, y in zip(xs, ys)]
+    assert nb.to_ints(nb.sub(a, b)) == [(x - y) % p for x, y in zip(xs, ys)]
+    assert nb.to_ints(nb.mul(a, b)) == [x * y % p for x, y in zip(xs, ys)]
+    assert nb.to_ints(nb.sqr(a)) == [x * x % p for x in xs]
+    assert nb.to_ints(nb.mul_small(a, 8)) == [8 * x % p for x in xs]
+    assert list(nb.is_zero(nb.sub(a, b))) == [x == y for x, y in zip(xs, ys)]
+
+    # worst case weakly normalized limbs: 2^27 - 1
+    c = a | (2 ** 27 - 1)
+    cs = nb.to_ints(c)
+    for r, exp in (
+        (nb.mul(c, c), [x * x % p for x in cs]),
+        (nb.sqr(c), [x * x % p for x in cs]),
+        (nb.sub(a, c), [(x - y) % p for x, y in zip(xs, cs)]),
+        (nb.add(c, c), [2 * x % p for x in cs]),
+    ):
+        assert r.max() < 2 ** 27
+        assert nb.to_ints(r) == exp
+
+
+def test_add_double_jac() -> None:
+    Qs = [_mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec) for _ in range(6)]
+    # INF, doubling, and opposite points
+    Ps = [INFJ, Qs[0], Qs[1], ec.negate_jac(Qs[2])] + Qs[3:]
+    Rs = [Qs[0], INFJ, Qs[1], Qs[2]] + Qs[3:]
+    S = nb.add_jac(nb.batch_from_jac(Ps), nb.batch_from_jac(Rs))
+    for P, R, SJ in zip(Ps, Rs, nb.jac_from_batch(S)):
+        assert ec.jac_equality(SJ, ec.add_jac(P, R))
+    assert nb.jac_from_batch(S)[3] == INFJ
+
+    D = nb.double_jac(nb.batch_from_jac(Ps))
+    for P, DJ in zip(Ps, nb.jac_from_batch(D)):
+        assert ec.jac_equality(DJ, ec.double_jac(P))
+
+
+def test_mult_batch() -> None:
+    ms = [0, 1, 2, ec.n - 1] + [secrets.randbelow(ec.n) for _ in range(12)]
+    RJs = nb.jac_from_batch(nb.mult_batch(ms, ec.GJ, ec, 5))
+    assert ec.aff_from_jac_batch(RJs) == [mult(m, ec.G, ec) for m in ms]
+
+
+def test_multi_mult() -> None:
+    ms = [secrets.randbelow(ec.n) for _ in range(40)]
+    points = [_mult(1 + secrets.randbelow(ec.n - 1), ec.GJ, ec) for _ in ms]
+    # INF point, zero scalar, and opposite points
+    points[0], ms[1] = INFJ, 0
+    points[3], ms[3] = ec.negate_jac(points[2]), ms[2]
+    R = nb.multi_mult(ms, points, ec)
+    assert ec.jac_equality(R, _multi_mult_pippenger(ms, points, ec))
+
+    assert nb.multi_mult([0, 0], points[:2], ec) == INFJ
+
+
+def test_dispatch(monkeypatch: pytest.MonkeyPatch) -> None:
+    size = nb.NUMPY_MIN_SIZE
+    ms = [secrets.randbelow(ec.n) for _ in range(size)]
+    points = [mult(m, ec.G, ec) for m in ms[:4]] * (size // 4)
+    jac_points = [jac_from_aff(Q) for Q in points]
+    Q = points[0]
+
+    exp_batch = mult_batch(ms, Q, ec)
+    exp_sum = _multi_mult_vartime(ms, jac_points, ec)
+    nb.enable()
+    try:
+        # mult_batch scalars are secret: never use the batch engine
+        with monkeypatch.context() as m:
+            m.setattr(nb, "mult_batch", None)
+            assert mult_batch(ms, Q, ec) == exp_batch
+        assert mult_batch(ms, None, ec) == mult_batch(ms, ec.G, ec)
+        R = _multi_mult_vartime(ms, jac_points, ec)
+        assert ec.jac_equality(R, exp_sum)
+        assert multi_mult(ms, points, ec) == ec.aff_from_jac(exp_sum)
+        assert multi_mult([ec.n] * size, points, ec) == INF
+    finally:
+        nb.disable()
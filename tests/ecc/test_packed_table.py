@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.packed_table` module."
+
+import secrets
+from pathlib import Path
+
+import pytest
+
+from btclib.alias import INF, INFJ
+from btclib.ecc.curve import FIXED_BASE_W, Curve, double_mult, mult, secp256k1
+from btclib.ecc.curve_group import cached_multiples_fixwind, jac_from_aff
+from btclib.ecc.packed_table import PackedTable, load_table, save_table
+from btclib.ecc.table_cache import nbytes
+from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
+
+
+def test_packed_table() -> None:
+    ec = low_card_curves["ec13_11"]
+    T = cached_multiples_fixwind.func(ec.GJ, ec, FIXED_BASE_W)
+    packed = PackedTable.from_table(T, ec, FIXED_BASE_W)
+    assert len(packed) == len(T)
+    for row, packed_row in zip(T, packed):
+        assert len(packed_row) == len(row) == 2 ** FIXED_BASE_W
+        for P, packed_P in zip(row, packed_row):
+            assert ec.jac_equality(P, packed_P)
+        assert packed_row[0] == INFJ
+        assert packed_row[-1] == packed_row[len(row) - 1]
+        assert packed_row[1:3] == [packed_row[1], packed_row[2]]
+        with pytest.raises(IndexError, match="invalid point index: "):
+            packed_row[len(row)]  # pylint: disable=pointless-statement
+    assert packed[1:2] == [packed[1]]
+
+    ec = secp256k1
+    T = cached_multiples_fixwind.func(ec.GJ, ec, FIXED_BASE_W)
+    packed = PackedTable.from_table(T, ec, FIXED_BASE_W)
+    assert len(packed.to_bytes()) == 2 * ec.p_size * sum(len(row) for row in T)
+    assert nbytes(packed) < nbytes(T) / 5
+
+    with pytest.raises(BTClibValueError, match="invalid packed table size: "):
+        PackedTable(packed.to_bytes()[:-1], ec, FIXED_BASE_W)
+
+
+def test_save_load(tmp_path: Path) -> None:
+    ec = secp256k1
+    q = 1 + secrets.randbelow(ec.n - 1)
+    Q = mult(q, ec.G, ec)
+    filename = str(tmp_path / "Q.tbl")
+    save_table(filename, Q, ec)
+    key = jac_from_aff(Q), ec, FIXED_BASE_W
+    try:
+        packed = load_table(filename, Q, ec)
+        assert cached_multiples_fixwind(*key) is packed
+        assert cached_multiples_fixwind.stats().pinned > 0
+        # registered key table: mult by additions only
+        u, v = secrets.randbelow(ec.n), secrets.randbelow(ec.n)
+        exp = ec.add_aff(mult(u * q, ec.G, ec), mult(v, ec.G, ec))
+        assert double_mult(u, Q, v, ec.G, ec) == exp
+        # the loaded table can be saved again
+        save_table(str(tmp_path / "Q2.tbl"), Q, ec)
+        assert (tmp_path / "Q2.tbl").read_bytes() == (tmp_path / "Q.tbl").read_bytes()
+    finally:
+        cached_multiples_fixwind.unpin(*key)
+        cached_multiples_fixwind.clear()
+
+    with pytest.raises(BTClibValueError, match="packed table of another point"):
+        load_table(filename, ec.G, ec)
+    with pytest.raises(BTClibValueError, match="packed table of another point"):
+        load_table(filename, Q, low_card_curves["ec13_11"])
+    content = (tmp_path / "Q.tbl").read_bytes()
+    row_size = 2 * ec.p_size * 2 ** FIXED_BASE_W
+    # truncated file, ending on a row boundary
+    (tmp_path / "bad.tbl").write_bytes(content[:-row_size])
+    with pytest.raises(BTClibValueError, match="invalid packed table size: "):
+        load_table(str(tmp_path / "bad.tbl"), Q, ec)
+    # tampered point coordinate
+    tampered = bytearray(content)
+    tampered[-1] ^= 1
+    (tmp_path / "bad.tbl").write_bytes(tampered)
+    with pytest.raises(BTClibValueError, match="corrupted packed table"):
+        load_table(str(tmp_path / "bad.tbl"), Q, ec)
+    assert not cached_multiples_fixwind.is_cached(*key)
+    (tmp_path / "bad.tbl").write_bytes(b"\x00" * 100)
+    with pytest.raises(BTClibValueError, match="not a packed table file: "):
+        load_table(str(tmp_path / "bad.tbl"), Q, ec)
+    with pytest.raises(BTClibValueError, match="INF point has no table"):
+        save_table(filename, INF, ec)
+    with pytest.raises(BTClibValueError, match="point not on curve"):
+        save_table(filename, (1, 1), ec)
+
+
+def test_generator_table(tmp_path: Path) -> None:
+    "Test a curve whose generator table includes INF points."
+
+    ec0 = low_card_curves["ec13_11"]
+    ec = Curve(ec0.p, ec0.a, ec0.b, ec0.G, ec0.n, ec0.cofactor, False)
+    filename = str(tmp_path / "G.tbl")
+    save_table(filename, None, ec)
+    load_table(filename, None, ec)
+    for m in range(ec.n):
+        assert mult(m, ec.G, ec) == mult(m, ec.G, ec0)
+    cached_multiples_fixwind.unpin(ec.GJ, ec, FIXED_BASE_W)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.parallel` module."
+
+import asyncio
+import multiprocessing
+import secrets
+import sys
+from typing import Any, List
+
+import pytest
+
+from btclib.ecc import bms, dsa, parallel, ssa
+from btclib.ecc.curve import CURVES
+from btclib.ecc.parallel import BatchVerifier, verify_chunk, verify_jobs
+from btclib.ecc.shared_tables import SharedTables, attach_tables
+from btclib.exceptions import BTClibValueError
+
+
+def test_verify_jobs() -> None:
+
+    ctx = multiprocessing.get_context("spawn")
+    q, Q = dsa.gen_keys()
+    x_q, x_Q = ssa.gen_keys()
+    wif, addr = bms.gen_keys()
+    invalid = {2, 5, 6, 11}
+    dsa_jobs: List[Any] = []
+    ssa_jobs: List[Any] = []
+    bms_jobs: List[Any] = []
+    for i in range(12):
+        msg = secrets.token_bytes(32)
+        other = msg if i not in invalid else secrets.token_bytes(32)
+        dsa_jobs.append((other, Q, dsa.sign_(msg, q)))
+        ssa_jobs.append((other, x_Q, ssa.sign_(msg, x_q)))
+        bms_jobs.append((other, addr, bms.sign(msg, wif)))
+    exp = [i not in invalid for i in range(12)]
+
+    assert list(verify_jobs("dsa", iter(dsa_jobs), 5, 2, mp_context=ctx)) == exp
+    assert list(verify_jobs("ssa", ssa_jobs, 5, 2, mp_context=ctx)) == exp
+    assert list(verify_jobs("bms", bms_jobs, 64, 1, mp_context=ctx)) == exp
+    assert list(verify_jobs("ssa", [], mp_context=ctx)) == []
+
+    for scheme, jobs in (("dsa", dsa_jobs), ("ssa", ssa_jobs), ("bms", bms_jobs)):
+        assert verify_chunk(scheme, jobs) == exp
+    # BIP340 signatures on different curves are verified one at a time
+    ec = CURVES["secp256r1"]
+    r1_q, r1_Q = ssa.gen_keys(ec=ec)
+    msg = secrets.token_bytes(32)
+    ssa_jobs[0] = msg, r1_Q, ssa.sign_(msg, r1_q, ec=ec)
+    assert verify_chunk("ssa", ssa_jobs) == [True] + exp[1:]
+    assert verify_chunk("ssa", []) == []
+
+    with pytest.raises(BTClibValueError, match="unknown signature scheme: "):
+        verify_jobs("rsa", dsa_jobs)
+    with pytest.raises(BTClibValueError, match="unknown signature scheme: "):
+        verify_chunk("rsa", dsa_jobs)
+    with pytest.raises(BTClibValueError, match="invalid chunk size: "):
+        verify_jobs("dsa", dsa_jobs, 0)
+    with pytest.raises(BTClibValueError, match="invalid number of workers: "):
+        verify_jobs("dsa", dsa_jobs, max_workers=0)
+
+
+@pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="shared memory requires Python 3.8"
+)
+def test_verify_jobs_shared_tables() -> None:
+
+    ctx = multiprocessing.get_context("spawn")
+    q, Q = dsa.gen_keys()
+    invalid = {2, 5}
+    jobs: List[Any] = []
+    for i in range(8):
+        msg = secrets.token_bytes(32)
+        other = msg if i not in invalid else secrets.token_bytes(32)
+        jobs.append((other, Q, dsa.sign_(msg, q)))
+    exp = [i not in invalid for i in range(8)]
+
+    with SharedTables([Q]) as tables:
+        results = verify_jobs(
+            "dsa",
+            iter(jobs),
+            chunk_size=5,
+            max_workers=2,
+            mp_context=ctx,
+            initializer=attach_tables,
+            initargs=tables.initargs,
+        )
+        assert list(results) == exp
+
+
+def test_batch_verifier(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    q, Q = ssa.gen_keys()
+    invalid = {1, 7}
+    jobs: List[Any] = []
+    for i in range(10):
+        msg = secrets.token_bytes(32)
+        other = msg if i not in invalid else secrets.token_bytes(32)
+        jobs.append((other, Q, ssa.sign_(msg, q)))
+    exp = [i not in invalid for i in range(10)]
+
+    batch_sizes: List[int] = []
+    verify = parallel.verify_chunk
+
+    def counting_verify_chunk(scheme: str, jobs: List[Any], **kwargs: Any) -> Any:
+        batch_sizes.append(len(jobs))
+        return verify(scheme, jobs, **kwargs)
+
+    def failing_verify_chunk(scheme: str, jobs: List[Any], **kwargs: Any) -> Any:
+        raise RuntimeError("executor error")
+
+    monkeypatch.setattr(parallel, "verify_chunk", counting_verify_chunk)
+
+    async def main() -> None:
+        # full batches are verified at once, the last one after max_wait
+        async with BatchVerifier("ssa", 4, 0.01) as verifier:
+            results = await asyncio.gather(*(verifier.verify(*job) for job in jobs))
+        assert results == exp
+        assert batch_sizes == [4, 4, 2]
+
+        # queued requests are verified when the verifier is closed
+        batch_sizes.clear()
+        verifier = BatchVerifier("dsa", max_wait=60)
+        dsa_q, dsa_Q = dsa.gen_keys()
+        msg = secrets.token_bytes(32)
+        task = asyncio.ensure_future(verifier.verify(msg, dsa_Q, dsa.sign_(msg, dsa_q)))
+        await asyncio.sleep(0)
+        assert not task.done()
+        await verifier.aclose()
+        assert await task
+        assert batch_sizes == [1]
+
+        # cancelled batches cancel their requests, started or not
+        for started in (False, True):
+            verifier = BatchVerifier("ssa", max_batch_size=2)
+            tasks = [asyncio.ensure_future(verifier.verify(*job)) for job in jobs[:2]]
+            await asyncio.sleep(0)
+            if started:
+                await asyncio.sleep(0)
+            for batch in list(verifier._batches):  # pylint: disable=protected-access
+                batch.cancel()
+            await asyncio.wait(tasks)
+            assert all(task.cancelled() for task in tasks)
+
+        # executor errors are raised to all the requests of the batch
+        monkeypatch.setattr(parallel, "verify_chunk", failing_verify_chunk)
+        verifier = BatchVerifier("ssa", max_batch_size=2)
+        tasks = [asyncio.ensure_future(verifier.verify(*job)) for job in jobs[:2]]
+        await asyncio.wait(tasks)
+        for task in tasks:
+            with pytest.raises(RuntimeError, match="executor error"):
+                task.result()
+
+    asyncio.run(main())
+
+    with pytest.raises(BTClibValueError, match="unknown signature scheme: "):
+        BatchVerifier("rsa")
+    with pytest.raises(BTClibValueError, match="invalid max batch size: "):
+        BatchVerifier("ssa", 0)
+    with pytest.raises(BTClibValueError, match="invalid max wait: "):
+        BatchVerifier("ssa", max_wait=-1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.shared_tables` module."
+
+import multiprocessing
+import sys
+from hashlib import sha256
+from typing import Tuple
+
+import pytest
+
+from btclib.ecc import dsa
+from btclib.ecc.curve import CURVES, FIXED_BASE_W, secp256k1
+from btclib.ecc.curve_group import cached_multiples_fixwind, jac_from_aff
+from btclib.ecc.packed_table import PackedTable
+from btclib.ecc.pedersen import second_generator
+from btclib.ecc.shared_tables import SharedTables
+
+pytestmark = pytest.mark.skipif(
+    sys.version_info < (3, 8), reason="shared memory requires Python 3.8"
+)
+
+
+def _worker(args: Tuple[bytes, int, int]) -> Tuple[bool, bool]:
+    "Return True if the G table is shared and the signature is valid."
+
+    msg, q, ec_index = args
+    ec = (secp256k1, CURVES["secp256r1"])[ec_index]
+    T = cached_multiples_fixwind(ec.GJ, ec, FIXED_BASE_W)
+    shared = isinstance(T, PackedTable)
+    Q = jac_from_aff(second_generator(ec))
+    shared = shared and isinstance(
+        cached_multiples_fixwind(Q, ec, FIXED_BASE_W), PackedTable
+    )
+    sig = dsa.sign(msg, q, ec=ec)
+    return shared, dsa.verify(msg, sig.ec.G, sig)
+
+
+def test_shared_tables() -> None:
+    with SharedTables([secp256k1.G, second_generator()]) as tables:
+        assert [Q for Q, _, _ in tables.index] == [secp256k1.G, second_generator()]
+        name, ec_name, index = tables.initargs
+        assert name == tables.name and ec_name == "secp256k1" and index == tables.index
+        size = sum(size for _, _, size in index)
+        assert (
+            size
+            == 2
+            * 64
+            * len(cached_multiples_fixwind(secp256k1.GJ, secp256k1, FIXED_BASE_W))
+            * 32
+        )
+
+    ec = CURVES["secp256r1"]
+    msg = sha256(b"shared").digest()
+    ctx = multiprocessing.get_context("spawn")
+    with SharedTables([second_generator(ec)], "secp256r1") as tables:
+        with tables.pool(2, ctx) as pool:
+            results = pool.map(_worker, [(msg, 1, 1)] * 4)
+    assert results == [(True, True)] * 4
+    # the parent process does not use the shared tables
+    assert not isinstance(
+        cached_multiples_fixwind(ec.GJ, ec, FIXED_BASE_W), PackedTable
+    )
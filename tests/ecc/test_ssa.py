@@ -14,7 +14,7 @@ import csv
 import secrets
 from hashlib import sha256 as hf
 from os import path
-from typing import List
+from typing import Any, Dict, List, Union
 
 import pytest
 
@@ -30,6 +30,9 @@ from btclib.hashes import reduce_to_hlen
 from btclib.utils import int_from_bits
 from tests.ecc.test_curve import low_card_curves
 
+# run with the libsecp256k1 backend both disabled and enabled
+pytestmark = pytest.mark.usefixtures("libsecp256k1_backend")
+
 
 def test_signature() -> None:
     msg = "Satoshi Nakamoto".encode()
@@ -170,10 +173,13 @@ def test_point_from_bip340pub_key() -> None:
     assert ssa.point_from_bip340pub_key(xpub.encode("ascii")) == Q
 
 
-def test_low_cardinality() -> None:
+def test_low_cardinality(libsecp256k1_backend: bool) -> None:
     "test low-cardinality curves for all msg/key pairs."
     # pylint: disable=protected-access
 
+    if libsecp256k1_backend:
+        pytest.skip("low cardinality curves never use libsecp256k1")
+
     # ec.n has to be prime to sign
     test_curves = [
         low_card_curves["ec13_11"],
@@ -320,6 +326,118 @@ def test_batch_validation() -> None:
     assert not ssa.batch_verify_(ms, Qs, sigs)
 
 
+def test_batch_invalid_indices(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    ms: List[bytes] = []
+    Qs: List[int] = []
+    sigs: List[ssa.Sig] = []
+    for _ in range(16):
+        q, Q = ssa.gen_keys()
+        ms.append(secrets.token_bytes(32))
+        Qs.append(Q)
+        sigs.append(ssa.sign_(ms[-1], q))
+    assert ssa.batch_invalid_indices_(ms, Qs, sigs) == []
+    assert ssa.batch_invalid_indices_([], [], []) == []
+
+    # count the batch checks
+    n_checks = 0
+    batch_residual = ssa._batch_residual_
+
+    def counting_batch_residual(terms: Any, rands: Any, ec: Any) -> Any:
+        nonlocal n_checks
+        n_checks += 1
+        return batch_residual(terms, rands, ec)
+
+    monkeypatch.setattr(ssa, "_batch_residual_", counting_batch_residual)
+    for invalid in ([3], [0, 15], [5, 6, 7], list(range(16))):
+        invalid_ms = [ms[i - 1] if i in invalid else m for i, m in enumerate(ms)]
+        n_checks = 0
+        assert ssa.batch_invalid_indices_(invalid_ms, Qs, sigs) == invalid
+        assert not ssa.batch_verify_(invalid_ms, Qs, sigs)
+    # a single invalid signature: one half-size check per bisection level
+    n_checks = 0
+    assert ssa.batch_invalid_indices_(ms[:-1] + ms[:1], Qs, sigs) == [15]
+    assert n_checks == 5
+    n_checks = 0
+    assert ssa.batch_invalid_indices_(ms[-1:] + ms[1:], Qs, sigs) == [0]
+    assert n_checks == 5
+    monkeypatch.undo()
+
+    # malformed signatures and public keys
+    malformed: List[Union[ssa.Sig, bytes]] = list(sigs)
+    malformed[2] = b"\x00" * 64  # r = 0 is not a valid x-coordinate
+    malformed[4] = ssa.Sig(sigs[4].r, CURVES["secp256k1"].n, check_validity=False)
+    malformed[9] = sigs[9].serialize()
+    invalid_Qs = list(Qs)
+    invalid_Qs[11] = 0
+    invalid = ssa.batch_invalid_indices_(ms, invalid_Qs, malformed)
+    assert invalid == [2, 4, 11]
+    assert ssa.batch_invalid_indices_(ms[:1], Qs[:1], [b"\x00" * 64]) == [0]
+
+    msg = b"Satoshi Nakamoto"
+    q, Q = ssa.gen_keys()
+    sig = ssa.sign(msg, q)
+    invalid = ssa.batch_invalid_indices([msg, msg, b"Craig"], [Q] * 3, [sig] * 3)
+    assert invalid == [2]
+
+    err_msg = "mismatch between number of pub_keys "
+    with pytest.raises(BTClibValueError, match=err_msg):
+        ssa.batch_invalid_indices_(ms[:-1], Qs, sigs)
+    with pytest.raises(BTClibValueError, match=err_msg):
+        ssa.batch_invalid_indices_(ms, Qs, sigs[:-1])
+    ec = CURVES["secp256r1"]
+    sig = ssa.sign_(ms[0], 1, ec=ec)
+    with pytest.raises(BTClibValueError, match="not the same curve for all sign"):
+        ssa.batch_invalid_indices_(ms, Qs, sigs[:-1] + [sig])
+
+
+def test_batch_repeated_keys(monkeypatch: pytest.MonkeyPatch) -> None:
+
+    keys = [ssa.gen_keys() for _ in range(3)]
+    ms: List[bytes] = []
+    Qs: List[bytes] = []
+    sigs: List[ssa.Sig] = []
+    for i in range(12):
+        q, Q = keys[i % 3]
+        ms.append(secrets.token_bytes(32))
+        Qs.append(Q.to_bytes(32, byteorder="big"))
+        sigs.append(ssa.sign_(ms[-1], q))
+
+    # each public key is lifted once per batch
+    n_lifts = 0
+    lift = ssa.point_from_bip340pub_key
+
+    def counting_lift(x_Q: Any, ec: Any) -> Any:
+        nonlocal n_lifts
+        n_lifts += 1
+        return lift(x_Q, ec)
+
+    monkeypatch.setattr(ssa, "point_from_bip340pub_key", counting_lift)
+    assert ssa.batch_verify_(ms, Qs, sigs)
+    assert n_lifts == 3
+    invalid_ms = list(ms)
+    invalid_ms[7] = ms[4]
+    assert not ssa.batch_verify_(invalid_ms, Qs, sigs)
+    assert ssa.batch_invalid_indices_(invalid_ms, Qs, sigs) == [7]
+    monkeypatch.undo()
+
+    # randomizers are deterministic, but depend on all the signatures
+    ec = CURVES["secp256k1"]
+    lifted: Dict[Any, Any] = {}
+    terms = [
+        ssa._batch_term_(m, Q, sig, ec, hf, lifted) for m, Q, sig in zip(ms, Qs, sigs)
+    ]
+    assert len(lifted) == 3
+    rands = ssa._batch_randomizers_(terms, ec, hf)
+    assert rands == ssa._batch_randomizers_(terms, ec, hf)
+    assert rands[0] == 1
+    assert all(0 < rand < ec.n for rand in rands)
+    assert len(set(rands)) == len(rands)
+    terms[5] = ssa._batch_term_(ms[4], Qs[5], sigs[5], ec, hf, lifted)
+    assert rands != ssa._batch_randomizers_(terms, ec, hf)
+    assert rands[:1] == ssa._batch_randomizers_(terms[:1], ec, hf)
+
+
 def test_musig() -> None:
     """testing 3-of-3 MuSig.
 
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.table_cache` module."
+
+import threading
+from typing import List
+
+import pytest
+
+from btclib.ecc.curve import CURVES, FIXED_BASE_W, mult
+from btclib.ecc.curve_group import cached_multiples, cached_multiples_fixwind
+from btclib.ecc.table_cache import (
+    TABLE_CACHES,
+    TableCache,
+    clear_table_caches,
+    nbytes,
+    table_cache,
+)
+from btclib.exceptions import BTClibValueError
+
+
+def test_table_cache() -> None:
+    calls: List[int] = []
+
+    def table(i: int) -> List[int]:
+        calls.append(i)
+        return [i] * 10
+
+    cache = TableCache(table, max_entries=3)
+    assert cache.__name__ == "table"
+    for i in range(5):
+        assert cache(i) == [i] * 10
+    assert cache(4) == [4] * 10
+    assert calls == list(range(5))
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 5, 2)
+    assert stats.entries == len(cache) == 3
+    assert stats.nbytes == 3 * nbytes([0] * 10)
+    assert (0,) not in cache and (4,) in cache
+
+    # pinned tables are never evicted
+    assert cache.pin(0) == [0] * 10
+    for i in range(10, 20):
+        cache(i)
+    assert (0,) in cache
+    assert cache.stats().pinned == 1
+    cache.clear()
+    assert len(cache) == 1 and (0,) in cache
+    assert cache.stats().hits == 0
+    cache.unpin(0)
+    assert (0,) in cache
+    cache.configure(max_entries=0)
+    assert len(cache) == 0
+
+    # externally provided tables
+    cache.configure(max_entries=2)
+    n_calls = len(calls)
+    cache.put([7], 0, pin=True)
+    cache.put([8], 0)
+    cache.put([9], 1)
+    cache.put([10], 2)
+    assert cache(0) == [8] and (1,) not in cache
+    assert len(calls) == n_calls
+    cache.unpin(0)
+    cache.configure(max_entries=0)
+
+    # byte budget
+    cache.configure(max_bytes=2 * nbytes([0] * 10))
+    for i in range(5):
+        cache(i)
+    assert len(cache) == 2 and (3,) in cache and (4,) in cache
+    # a table exceeding the byte budget alone is not cached
+    sized = TableCache(lambda size: [0] * size, max_bytes=nbytes([0] * 50))
+    sized(10)
+    sized(20)
+    assert sized(100) == [0] * 100
+    assert (10,) in sized and (20,) in sized and (100,) not in sized
+    sized.put([1] * 100, 20)
+    assert (10,) in sized and (20,) not in sized
+    assert sized.stats().evictions == 0
+    # unless it is pinned
+    sized.pin(100)
+    assert (100,) in sized and (10,) not in sized
+    cache.configure()
+    for i in range(100):
+        cache(i)
+    assert len(cache) == 100
+
+    with pytest.raises(BTClibValueError, match="negative max_entries: "):
+        cache.configure(max_entries=-1)
+    with pytest.raises(BTClibValueError, match="negative max_bytes: "):
+        TableCache(table, max_bytes=-1)
+
+
+def test_thread_safety() -> None:
+    @table_cache(max_entries=8)
+    def squares(i: int) -> List[int]:
+        return [i * i] * 100
+
+    assert TABLE_CACHES["squares"] is squares
+    errors: List[Exception] = []
+
+    def worker(seed: int) -> None:
+        try:
+            for i in range(500):
+                j = (seed * i) % 20
+                assert squares(j) == [j * j] * 100
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(s,)) for s in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    stats = squares.stats()
+    assert stats.entries <= 8
+    assert stats.hits + stats.misses == 8 * 500
+    del TABLE_CACHES["squares"]
+
+
+def test_curve_caches() -> None:
+    ec = CURVES["secp256r1"]
+    mult(3, ec.G, ec)
+    assert cached_multiples_fixwind.is_cached(ec.GJ, ec, FIXED_BASE_W)
+    assert cached_multiples_fixwind.stats().pinned > 0
+    assert TABLE_CACHES["cached_multiples"] is cached_multiples
+
+    # G tables survive clearing and tight budgets
+    clear_table_caches()
+    assert cached_multiples_fixwind.is_cached(ec.GJ, ec, FIXED_BASE_W)
+    max_bytes = cached_multiples_fixwind.max_bytes
+    cached_multiples_fixwind.configure(max_entries=0)
+    try:
+        assert cached_multiples_fixwind.is_cached(ec.GJ, ec, FIXED_BASE_W)
+        assert mult(3, ec.G, ec) == ec.add_aff(ec.G, ec.double_aff(ec.G))
+    finally:
+        cached_multiples_fixwind.configure(128, max_bytes)
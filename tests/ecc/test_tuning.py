@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+# Copyright (C) 2017-2021 The btclib developers
+#
+# This file is part of btclib. It is subject to the license terms in the
+# LICENSE file found in the top-level directory of this distribution.
+#
+# No part of btclib including this file, may be copied, modified, propagated,
+# or distributed except according to the terms contained in the LICENSE file.
+
+"Tests for the `btclib.ecc.tuning` module."
+
+import json
+import secrets
+from pathlib import Path
+
+import pytest
+
+from btclib.ecc import tuning
+from btclib.ecc.curve import (
+    CURVES,
+    VARIABLE_BASE_ALGORITHMS,
+    double_mult,
+    mult,
+    multi_mult,
+    run_candidate,
+    secp256k1,
+    tuning_candidates,
+)
+from btclib.ecc.curve_group import jac_from_aff
+from btclib.exceptions import BTClibValueError
+from tests.ecc.test_curve import low_card_curves
+
+
+def test_candidates() -> None:
+    "All the candidate algorithms must return the same results."
+
+    for ec in (secp256k1, low_card_curves["ec13_11"]):
+        m, u, v = (secrets.randbelow(ec.n) for _ in range(3))
+        Q = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+        QJ = jac_from_aff(Q)
+        exp = mult(m, ec.G, ec)
+        for choice in tuning_candidates("fixed-base", ec):
+            R = run_candidate("fixed-base", choice, [m], [], ec)
+            assert ec.aff_from_jac(R) == exp
+        exp = mult(m, Q, ec)
+        for choice in tuning_candidates("variable-base", ec):
+            R = run_candidate("variable-base", choice, [m], [QJ], ec)
+            assert ec.aff_from_jac(R) == exp
+        # variable-base candidates are constant time:
+        # no wNAF or variable time GLV
+        candidates = tuning_candidates("variable-base", ec)
+        algorithms = {choice.algorithm for choice in candidates}
+        if ec.endomorphism is None:
+            algorithms.add("glv_fixed_window")
+        assert algorithms == set(VARIABLE_BASE_ALGORITHMS)
+        assert not algorithms & {"sliding_window", "w_NAF", "endomorphism"}
+        exp = double_mult(u, ec.G, v, Q, ec)
+        for choice in tuning_candidates("double", ec):
+            R = run_candidate("double", choice, [u, v], [QJ], ec)
+            assert ec.aff_from_jac(R) == exp
+        exp = multi_mult([m, u, v], [Q, ec.G, Q], ec)
+        for choice in tuning_candidates("multi", ec):
+            R = run_candidate("multi", choice, [m, u, v], [QJ, ec.GJ, QJ], ec)
+            assert ec.aff_from_jac(R) == exp
+
+    with pytest.raises(BTClibValueError, match="unknown operation kind: "):
+        tuning_candidates("triple", ec)
+    with pytest.raises(BTClibValueError, match="unknown operation kind: "):
+        run_candidate("triple", tuning.Choice("strauss"), [m], [QJ], ec)
+
+
+def test_tune(tmp_path: Path) -> None:
+    ec = CURVES["secp112r1"]
+    filename = str(tmp_path / "profile.json")
+    m, u, v = (secrets.randbelow(ec.n) for _ in range(3))
+    Q = mult(1 + secrets.randbelow(ec.n - 1), ec.G, ec)
+    exp = mult(m, ec.G, ec), mult(m, Q, ec), double_mult(u, ec.G, v, Q, ec)
+    exp_multi = multi_mult([m] * 8, [Q] * 8, ec)
+    try:
+        profile = tuning.tune(ec, multi_sizes=(8,), repeat=1, filename=filename)
+        assert tuning.get_profile() is profile
+        assert ec.name is not None
+        choices = profile.choices[ec.name]
+        assert set(choices) == {"fixed-base", "variable-base", "double", "multi-8"}
+        assert profile.choice(ec.name, "multi", 2) == choices["multi-8"]
+        assert profile.choice(ec.name, "multi", 64) is None
+        assert profile.choice(secp256k1.name, "double") is None
+        # results do not depend on the tuned choices
+        assert exp == (
+            mult(m, ec.G, ec),
+            mult(m, Q, ec),
+            double_mult(u, ec.G, v, Q, ec),
+        )
+        assert multi_mult([m] * 8, [Q] * 8, ec) == exp_multi
+
+        tuning.set_profile()
+        assert tuning.get_profile().choices == {}
+        loaded = tuning.load_profile(filename)
+        assert tuning.get_profile() is loaded
+        assert loaded.to_dict() == profile.to_dict()
+
+        # each interpreter needs its own profile
+        dict_ = profile.to_dict()
+        dict_["interpreter"] = "pypy-3.7"
+        with open(filename, "w") as file_:
+            json.dump(dict_, file_)
+        with pytest.raises(BTClibValueError, match="another interpreter: pypy-3.7"):
+            tuning.load_profile(filename)
+        assert tuning.get_profile() is loaded
+    finally:
+        tuning.set_profile()
+
+    # variable-time choices (e.g. from older profiles) are ignored
+    try:
+        profile = tuning.TuningProfile()
+        profile.set_choice("secp112r1", "variable-base", tuning.Choice("w_NAF", 4))
+        tuning.set_profile(profile)
+        assert mult(m, Q, ec) == exp[1]
+    finally:
+        tuning.set_profile()
+
+    with pytest.raises(BTClibValueError, match="unknown operation kind: "):
+        tuning.tune(ec, kinds=("triple",))
+    with pytest.raises(BTClibValueError, match="not a multi size class: "):
+        tuning.tune(ec, multi_sizes=(9,))
+    with pytest.raises(BTClibValueError, match="unnamed curves cannot be tuned"):
+        tuning.tune(low_card_curves["ec13_11"])
+    assert tuning.get_profile().choices == {}